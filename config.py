@@ -25,6 +25,7 @@ PLAYER_ATTACK_COOLDOWN = 0.5
 SHOCKWAVE_DAMAGE = 15
 SHOCKWAVE_KNOCKBACK = 400
 SHOCKWAVE_COOLDOWN = 1.0  # Seconds between shockwaves
+SHOCKWAVE_FRAME_STEP = 2  # Radius step (pixels) between cached shockwave frames
 
 # Enemy settings
 ZOMBIE_SPEED = 120       # Slower than before
@@ -45,15 +46,68 @@ HOSTILE_NPC_CHANCE = 0.4    # Lower chance to be hostile
 NPC_FOLLOW_DISTANCE = 100  # Distance friendly NPCs try to maintain from player
 NPC_ATTACK_RANGE = 100     # Range at which friendly NPCs attack enemies
 NPC_FRIENDLY_DAMAGE = 10   # Damage dealt by friendly NPCs
+HOSTILE_GRID_CELL_SIZE = 100  # Cell size of the per-frame hostile index
+FLOW_CELL_SIZE = 32  # World pixels per flow field cell
+FLOW_FIELD_RADIUS = 512  # Reach of the zombie flow field around the player
+USE_SEPARATION = True  # Hostile mobs steer apart instead of piling onto one spot
+SEPARATION_RADIUS = 50  # Mobs whose centers are closer than this push each other apart
+SEPARATION_MAX_NEIGHBORS = 8  # Neighbors each mob looks at per frame, however dense the crowd
+SEPARATION_WEIGHT = 0.75  # Strength of the push as a share of the mob's speed
+
+# Rendering settings
+ENTITY_GRID_CELL_SIZE = 128  # Cell size of the index used to cull off-screen entities
+CULL_MARGIN = 64  # Extra world pixels around the viewport that still count as visible
+TEXT_CACHE_BYTES = 4 * 1024 * 1024  # Pixel memory cap for cached text surfaces
+HEALTH_BAR_LEVELS = 20  # Distinct fill levels pre-rendered per health bar width
+HEALTH_BAR_HEIGHT = 5
+BACKGROUND_TILE_SIZE = 256  # World pixels per pre-composited background tile
+BACKGROUND_MAX_TILES = 64  # Background tiles kept in memory
+DIRTY_RECTS = False  # Only push changed screen regions while the camera holds still
+HUD_RECT = (0, 0, 260, 100)  # Screen area redrawn every frame for the HUD
 
 # Building settings
 BUILDING_MIN_SIZE = 100
 BUILDING_MAX_SIZE = 300
-NUM_BUILDINGS = 5  # Number of buildings to spawn
+NUM_BUILDINGS = 5  # Number of buildings to spawn per world chunk
+BUILDING_GRID_CELL_SIZE = 128  # Cell size of the building collision grid
 
 # Collision settings
 COLLISION_DAMAGE = 5
 KNOCKBACK_FORCE = 300
+KNOCKBACK_DAMPING = 10  # Rate (1/s) at which pending knockback is paid out (entity store only)
+
+# World settings
+CHUNK_SIZE = 1024  # World pixels per side of a streamed chunk
+CHUNK_LOAD_RADIUS = 1  # Chunks around the player's chunk that are kept loaded
+CHUNK_UNLOAD_RADIUS = 2  # Chunks further away than this are unloaded
+FROZEN_CHUNK_LIMIT = 256  # Unloaded chunks whose mobs are remembered
+ZOMBIES_PER_CHUNK = 3
+NPCS_PER_CHUNK = 2
+OCCUPANCY_CELL_SIZE = 8  # World pixels per cell of the spawn occupancy map
+OCCUPANCY_TILE_CELLS = 64  # Cells per side of each occupancy map tile
+SPAWN_CLEARANCE = 25  # Distance a spawn point keeps from every building
+
+# Simulation settings
+USE_ENTITY_STORE = False  # Run mob movement through the batched NumPy entity store
+USE_AI_LOD = True  # Update distant mobs less often (per-sprite path only)
+LOD_ACTIVE_RADIUS = 400  # Mobs this close to the player update every frame
+LOD_LOW_RADIUS = 1200  # Mobs this close update every LOD_LOW_INTERVAL frames; further ones idle
+LOD_LOW_INTERVAL = 4
+LOD_MAX_DT = 0.25  # Cap on the accumulated dt a waking mob is updated with
+
+# Asset settings
+ASSET_MANIFEST = 'manifest.json'  # Per-state asset lists, relative to assets/
+ASSET_ARCHIVE = 'assets.pak'  # Packed archive read instead of loose files when present, relative to assets/
+PRELOAD_WORKERS = 4  # Threads that read and decode assets in the background
+PRELOAD_BATCH = 8  # Assets finished on the main thread per frame
+
+# Worker settings
+WORKER_SNAPSHOT_CAPACITY = 8192  # Records per shared-memory snapshot (buildings + visible sprites)
+
+# Profiler settings
+PROFILER_FRAMES = 300  # Frames kept in the profiler ring buffer
+PROFILER_GRAPH_MS = 33  # Frame time at the top of the on-screen graph
+STARTUP_BUDGET_MS = 200  # Target time from creating the Game to its first frame
 
 # Game states
 STATE_MENU = 'menu'
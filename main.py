@@ -1,12 +1,30 @@
-import pygame
+import os
 import sys
-from utils.asset_loader import AssetLoader
-from utils.input_handler import InputHandler
-from states.game_state import MenuState, PlayState, PauseState
+import time
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from utils.asset_loader import AssetLoader, AssetPreloader
+from utils.input_handler import InputHandler, ScriptedInputHandler, wander_script
+from utils.profiler import FrameProfiler
+from utils.sprite_utils import set_shared_assets, release_shared_assets
+from utils.text_cache import TextCache
+from states.game_state import MenuState, PlayState, RemotePlayState, PauseState, StateRegistry
 import config
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, script=None, profile=False, trace_path=None, worker=False):
+        self.started = time.perf_counter_ns()
+        self.first_frame = False
+        self.headless = headless
+        self.trace_path = trace_path
+        self.worker = worker
+        if headless:
+            # Dummy drivers let the game run on machines without a display or sound card
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+        
         pygame.init()
         pygame.mixer.init()
         
@@ -16,49 +34,222 @@ class Game:
         self.clock = pygame.time.Clock()
         
         # Initialize systems
+        self.profiler = FrameProfiler(enabled=profile or trace_path is not None)
         self.assets = AssetLoader()
-        self.input_handler = InputHandler()
+        set_shared_assets(self.assets)
+        self.preloader = AssetPreloader(self.assets)
+        self.text_cache = TextCache(self.assets)
+        if script is not None:
+            self.input_handler = ScriptedInputHandler(script)
+        else:
+            self.input_handler = InputHandler()
         
-        # Set up game states
-        self.states = {
-            'menu': MenuState(self),
-            'play': PlayState(self),
-            'pause': PauseState(self)
-        }
-        self.current_state = self.states['menu']
+        # Set up game states; each is built the first time it is needed
+        self.states = StateRegistry({
+            'menu': lambda: MenuState(self),
+            'play': self.new_play_state,
+            'pause': lambda: PauseState(self)
+        })
+        self.world_builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix='worldgen')
+        self.next_play = None
+        self.change_state('menu')
+        
+        # Load every state's assets in the background, the menu's first
+        for state_name in ['menu'] + [name for name in self.states.factories if name != 'menu']:
+            self.preloader.preload(state_name)
         
+    def build_play_state(self, seed=None):
+        """Create a fresh game, simulated in a worker process if enabled"""
+        if self.worker:
+            return RemotePlayState(self, seed)
+        return PlayState(self, seed)
+    
+    def prepare_play_state(self):
+        """Start building the next game on a background thread, if one is not already underway.
+
+        The build runs while the main thread keeps drawing the menu, so it may
+        only touch the new PlayState and what its seed generates. The one
+        shared state it uses is the module-level surface caches in
+        utils.render_cache (entity_images, health_bars), which only ever gain
+        finished surfaces; a race with the main thread at worst renders the
+        same surface twice. It must not draw from the global random module,
+        convert surfaces for the display, or use the Game's asset or text
+        caches.
+        """
+        if self.next_play is None:
+            # Drawn here so the world does not depend on thread timing
+            seed = random.randrange(2 ** 32)
+            self.next_play = self.world_builder.submit(self.build_play_state, seed)
+        return self.next_play
+    
+    def new_play_state(self):
+        """Replace the play state with the prepared game, waiting for it if it is not finished"""
+        old_state = self.states.get('play')
+        if old_state is not None:
+            old_state.close()
+        state = self.prepare_play_state().result()
+        self.next_play = None
+        self.states['play'] = state
+        return state
+    
     def change_state(self, state_name):
         """Change the current game state"""
         if state_name in self.states:
             self.current_state = self.states[state_name]
+            self.current_state.enter()
     
-    def run(self):
-        """Main game loop"""
+    def step(self, dt, draw=True):
+        """Run one frame. Returns False once the window has been closed."""
         running = True
-        while running:
-            # Calculate delta time
-            dt = self.clock.tick(config.FPS) / 1000.0  # Convert to seconds
-            
-            # Update input handler
+        profiler = self.profiler
+        profiler.begin_frame()
+        
+        # Update input handler
+        with profiler.section('input'):
             self.input_handler.update()
-            
-            # Event handling
+        
+        # Finish a few background-loaded assets on the main thread
+        with profiler.section('assets'):
+            self.preloader.pump()
+        
+        # Event handling
+        with profiler.section('events'):
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and profiler.enabled:
+                    profiler.show_graph = not profiler.show_graph
+                    # The graph's pixels are not dirty-tracked, so repaint the whole screen once
+                    dirty = getattr(self.current_state, 'dirty', None)
+                    if dirty is not None:
+                        dirty.invalidate()
                 self.current_state.handle_event(event)
-            
-            # Update current state
+        
+        # Update current state
+        with profiler.section('update'):
             self.current_state.update(dt)
-            
-            # Drawing
-            self.screen.fill(config.BLACK)
-            self.current_state.draw(self.screen)
-            pygame.display.flip()
         
-        pygame.quit()
+        # Drawing
+        if draw:
+            state = self.current_state
+            with profiler.section('draw'):
+                if not state.clears_screen:
+                    self.screen.fill(config.BLACK)
+                state.draw(self.screen)
+                if profiler.show_graph:
+                    profiler.draw_graph(self.screen)
+            with profiler.section('flip'):
+                # States that track dirty rects only push the regions that changed
+                dirty_rects = getattr(state, 'dirty_rects', None)
+                if dirty_rects is None or profiler.show_graph:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(dirty_rects)
+        
+        profiler.end_frame()
+        if not self.first_frame:
+            self.first_frame = True
+            profiler.record_startup(self.started)
+        return running
+    
+    def run(self):
+        """Main game loop"""
+        running = True
+        while running:
+            # Calculate delta time
+            dt = self.clock.tick(config.FPS) / 1000.0  # Convert to seconds
+            running = self.step(dt)
+        
+        self.close()
         sys.exit()
+    
+    def close(self):
+        """Write the profiler trace, if one was requested, and shut pygame down"""
+        if self.trace_path:
+            self.profiler.dump_chrome_trace(self.trace_path)
+        self.preloader.shutdown()
+        if self.next_play is not None:
+            self.next_play.result().close()
+            self.next_play = None
+        self.world_builder.shutdown()
+        release_shared_assets(self.assets)
+        self.assets.close()
+        for state in self.states.values():
+            state.close()
+        pygame.quit()
+    
+    def run_headless(self, frames, dt=None, draw=True):
+        """Run PlayState for a fixed number of frames as fast as possible.
+
+        Args:
+            frames: Number of frames to simulate
+            dt: Fixed timestep in seconds, or None to use the real (uncapped) frame time
+            draw: Whether to render each frame
+
+        Returns:
+            Dict with the frame count, wall time, throughput and game restarts
+        """
+        self.change_state('play')
+        restarts = 0
+        self.clock.tick()
+        start = time.perf_counter()
+        
+        for _ in range(frames):
+            frame_dt = dt if dt is not None else self.clock.tick() / 1000.0
+            self.step(frame_dt, draw)
+            
+            # Keep simulating if the player died and the game fell back to the menu
+            if not isinstance(self.current_state, (PlayState, RemotePlayState, PauseState)):
+                self.new_play_state()
+                self.change_state('play')
+                restarts += 1
+        
+        elapsed = time.perf_counter() - start
+        return {
+            'frames': frames,
+            'seconds': elapsed,
+            'fps': frames / elapsed if elapsed > 0 else float('inf'),
+            'restarts': restarts
+        }
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Run the game, or a headless simulation benchmark.')
+    parser.add_argument('--headless', action='store_true',
+                        help='run PlayState with dummy video/audio drivers and scripted input')
+    parser.add_argument('--frames', type=int, default=600,
+                        help='number of frames to simulate in headless mode')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='seed for world generation and scripted input')
+    parser.add_argument('--dt', type=float, default=1.0 / config.FPS,
+                        help='fixed timestep in seconds for headless mode (0 for real frame time)')
+    parser.add_argument('--no-draw', action='store_true',
+                        help='skip rendering in headless mode')
+    parser.add_argument('--profile', action='store_true',
+                        help='time each frame phase (F3 toggles the frame-time graph)')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='write the last profiled frames to PATH as a Chrome trace (implies --profile)')
+    parser.add_argument('--worker', action='store_true',
+                        help='run the simulation in a separate process and only draw in this one')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+    
+    if not args.headless:
+        game = Game(profile=args.profile, trace_path=args.trace, worker=args.worker)
+        game.run()
+        return
+    
+    game = Game(headless=True, script=wander_script(args.seed),
+                profile=args.profile, trace_path=args.trace, worker=args.worker)
+    stats = game.run_headless(args.frames, args.dt or None, draw=not args.no_draw)
+    game.close()
+    print(f"{stats['frames']} frames in {stats['seconds']:.3f}s "
+          f"({stats['fps']:.1f} frames/s, {stats['restarts']} restarts)")
+    print(game.profiler.startup_report())
 
 if __name__ == '__main__':
-    game = Game()
-    game.run()
\ No newline at end of file
+    main()
@@ -1,15 +1,68 @@
 import pygame
 import sys
 import random
-import math
+import numpy as np
 from abc import ABC, abstractmethod
 from utils.entities import Player, Zombie, NPC, Camera, Building, Shockwave
+from utils.spatial import SpatialGrid, SpatialHash
+from utils.combat import resolve_shockwaves
+from utils.entity_store import EntityStore
+from utils.sprite_utils import blit_batch
+from utils.render_layers import BackgroundLayer, DirtyRectTracker
+from utils.world import ChunkedWorld
+from utils.pathfinding import FlowField
+from utils.scheduler import UpdateScheduler
+from utils.occupancy import OccupancyMap
+from utils.steering import separation
+from utils.render_cache import entity_images, health_bars, shockwave_frames
+from utils import sim_worker
 import config
 
+def draw_hud(screen, text_cache, health, max_health, shockwave_cooldown, followers):
+    """Draw the player health bar, shockwave cooldown and follower count"""
+    # Draw player health bar
+    bar_width = 200
+    bar_height = 20
+    x = 10
+    y = 10
+    
+    # Background (red)
+    pygame.draw.rect(screen, config.RED, (x, y, bar_width, bar_height))
+    
+    # Foreground (green)
+    health_width = (health / max_health) * bar_width
+    pygame.draw.rect(screen, config.GREEN, (x, y, health_width, bar_height))
+    
+    # Draw HUD text; each string is only rendered when its value changes
+    health_text = f"Health: {int(health)}/{int(max_health)}"
+    screen.blit(text_cache.render(None, 24, health_text, config.WHITE), (x + 10, y + 25))
+    
+    # Draw shockwave cooldown
+    if shockwave_cooldown > 0:
+        cooldown_text = f"Shockwave: {shockwave_cooldown:.1f}s"
+    else:
+        cooldown_text = "Shockwave: Ready!"
+    screen.blit(text_cache.render(None, 24, cooldown_text, config.WHITE), (x + 10, y + 45))
+    
+    # Draw follower count
+    follower_text = f"Followers: {followers}"
+    screen.blit(text_cache.render(None, 24, follower_text, config.WHITE), (x + 10, y + 65))
+
 class GameState(ABC):
+    # States that paint every pixel themselves skip the Game's screen clear
+    clears_screen = False
+    
     def __init__(self, game):
         self.game = game
     
+    def enter(self):
+        """Called when the state becomes the current state"""
+        pass
+    
+    def close(self):
+        """Release anything the state holds outside the process, e.g. a worker"""
+        pass
+    
     @abstractmethod
     def update(self, dt):
         """Update game state"""
@@ -25,12 +78,35 @@ class GameState(ABC):
         """Handle pygame events"""
         pass
 
+class StateRegistry(dict):
+    """Game states by name, each built by its factory the first time it is looked up"""
+    
+    def __init__(self, factories):
+        super().__init__()
+        self.factories = dict(factories)
+    
+    def __missing__(self, name):
+        factory = self.factories.get(name)
+        if factory is None:
+            raise KeyError(name)
+        state = self[name] = factory()
+        return state
+    
+    def __contains__(self, name):
+        return name in self.factories or super().__contains__(name)
+
 class MenuState(GameState):
+    clears_screen = True
+    
     def __init__(self, game):
         super().__init__(game)
         self.selected_option = 0
         self.options = ['Start Game', 'Options', 'Quit']
     
+    def enter(self):
+        # Build the next game in the background while the player looks at the menu
+        self.game.prepare_play_state()
+    
     def update(self, dt):
         pass
     
@@ -39,10 +115,10 @@ class MenuState(GameState):
         screen.fill(config.BLACK)
         
         # Draw menu options
-        font = pygame.font.Font(None, 36)
+        text_cache = self.game.text_cache
         for i, option in enumerate(self.options):
             color = (255, 255, 0) if i == self.selected_option else (255, 255, 255)
-            text = font.render(option, True, color)
+            text = text_cache.render(None, 36, option, color)
             rect = text.get_rect(center=(screen.get_width() // 2, 200 + i * 50))
             screen.blit(text, rect)
     
@@ -54,15 +130,17 @@ class MenuState(GameState):
                 self.selected_option = (self.selected_option + 1) % len(self.options)
             elif event.key == pygame.K_RETURN:
                 if self.options[self.selected_option] == 'Start Game':
-                    # Create a fresh PlayState instead of reusing the old one
-                    self.game.states['play'] = PlayState(self.game)
+                    # Swap in the fresh PlayState prepared while the menu was shown
+                    self.game.new_play_state()
                     self.game.change_state('play')
                 elif self.options[self.selected_option] == 'Quit':
-                    pygame.quit()
+                    self.game.close()
                     sys.exit()
 
 class PlayState(GameState):
-    def __init__(self, game):
+    clears_screen = True
+    
+    def __init__(self, game, seed=None):
         super().__init__(game)
         
         # Initialize sprite groups
@@ -75,223 +153,390 @@ class PlayState(GameState):
         # Initialize camera
         self.camera = Camera(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
         
-        # Create buildings first
-        self.spawn_buildings()
+        # Hostiles are re-indexed every frame for follower targeting
+        self.hostile_index = SpatialHash(config.HOSTILE_GRID_CELL_SIZE)
+        
+        # Zombies share one field of directions toward the player
+        self.flow_field = FlowField()
+        
+        # Zombies and NPCs keep this index current as they move, for draw culling
+        self.entity_index = SpatialHash(config.ENTITY_GRID_CELL_SIZE)
+        
+        # Distant mobs are updated less often, or not at all
+        self.scheduler = UpdateScheduler(self.entity_index) if config.USE_AI_LOD else None
+        
+        # Optional array-backed storage that runs mob movement in one batch
+        self.entity_store = EntityStore() if config.USE_ENTITY_STORE else None
+        
+        # Buildings are pre-composited into background tiles instead of drawn one by one
+        self.background = BackgroundLayer()
+        self.dirty = DirtyRectTracker()
+        self.dirty_rects = None
+        
+        # Buildings never move, so index them once for collision broadphase
+        self.building_grid = SpatialGrid(config.BUILDING_GRID_CELL_SIZE)
+        
+        # Free space for spawn checks, rasterized as buildings come and go
+        self.occupancy = OccupancyMap()
         
         # Create player in center
         self.player = Player(config.WINDOW_WIDTH // 2, config.WINDOW_HEIGHT // 2)
         self.all_sprites.add(self.player)
         
-        # Add entities
+        # Buildings and mobs stream in chunk by chunk around the player
         self.entities = self.all_sprites
-        self.spawn_test_entities()
-    
-    def spawn_buildings(self):
-        """Spawn random buildings around the map"""
-        for _ in range(config.NUM_BUILDINGS):
-            # Generate random size
-            width = random.randint(config.BUILDING_MIN_SIZE, config.BUILDING_MAX_SIZE)
-            height = random.randint(config.BUILDING_MIN_SIZE, config.BUILDING_MAX_SIZE)
-            
-            # Try to find a valid position (not overlapping other buildings)
-            max_attempts = 50
-            for _ in range(max_attempts):
-                x = random.randint(50, config.WINDOW_WIDTH - width - 50)
-                y = random.randint(50, config.WINDOW_HEIGHT - height - 50)
-                
-                # Create temporary rect to check overlap
-                test_rect = pygame.Rect(x, y, width, height)
-                padding = 50  # Space between buildings
-                
-                # Check if too close to center (player spawn)
-                center_dist = math.sqrt(
-                    (x + width/2 - config.WINDOW_WIDTH/2)**2 +
-                    (y + height/2 - config.WINDOW_HEIGHT/2)**2
-                )
-                if center_dist < 200:  # Keep buildings away from spawn
-                    continue
-                
-                # Check overlap with other buildings
-                overlap = False
-                for building in self.buildings:
-                    expanded_rect = building.rect.inflate(padding, padding)
-                    if expanded_rect.colliderect(test_rect):
-                        overlap = True
-                        break
-                
-                if not overlap:
-                    building = Building(x, y, width, height)
-                    self.buildings.add(building)
-                    self.all_sprites.add(building)
-                    break
+        self.world = ChunkedWorld(self, seed)
+        self.spawn_rng = np.random.default_rng(self.world.seed)
+        self.world.update(self.player)
+    
+    def add_building(self, building):
+        """Add a building to the sprite groups, the collision grid and the background"""
+        self.buildings.add(building)
+        self.all_sprites.add(building)
+        self.building_grid.insert(building)
+        self.occupancy.add(building.rect)
+        self.background.add(building)
+        self.flow_field.invalidate()
+    
+    def remove_building(self, building):
+        """Remove a building from the sprite groups, the collision grid and the background"""
+        building.kill()
+        self.building_grid.remove(building)
+        self.occupancy.remove(building.rect)
+        self.background.remove(building)
+        self.flow_field.invalidate()
+    
+    def get_spawn_positions(self, count, min_distance=300, max_distance=500):
+        """Return up to count (x, y) points between min and max distance from the player, clear of buildings"""
+        return self.occupancy.sample_annulus(self.player.rect.center, min_distance, max_distance,
+                                             count, self.spawn_rng)
     
     def get_random_spawn_position(self, min_distance=300, max_distance=500):
-        """Get a random position that's between min and max distance from player"""
-        for _ in range(50):  # Maximum attempts
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(min_distance, max_distance)
-            
-            x = self.player.rect.centerx + distance * math.cos(angle)
-            y = self.player.rect.centery + distance * math.sin(angle)
-            
-            # Create test rect
-            test_rect = pygame.Rect(x - 25, y - 25, 50, 50)
-            
-            # Check if position is valid (not inside buildings)
-            valid = True
-            for building in self.buildings:
-                if building.rect.colliderect(test_rect):
-                    valid = False
-                    break
-            
-            if valid and 0 <= x <= config.WINDOW_WIDTH and 0 <= y <= config.WINDOW_HEIGHT:
-                return x, y
-        
-        # If no valid position found, return a position near the edge
-        return random.randint(50, config.WINDOW_WIDTH-50), random.randint(50, config.WINDOW_HEIGHT-50)
-    
-    def spawn_test_entities(self):
-        # Spawn zombies at random positions
-        for _ in range(5):
-            x, y = self.get_random_spawn_position()
-            zombie = Zombie(x, y)
-            self.all_sprites.add(zombie)
-            self.enemies.add(zombie)
-        
-        # Spawn NPCs at random positions
-        for _ in range(3):
-            x, y = self.get_random_spawn_position()
-            npc = NPC(x, y)
-            self.all_sprites.add(npc)
-            self.npcs.add(npc)
-            if npc.is_hostile:
-                self.enemies.add(npc)
+        """Get a random position that's between min and max distance from player, or None if there is no room"""
+        points = self.get_spawn_positions(1, min_distance, max_distance)
+        if len(points) == 0:
+            return None
+        x, y = points[0].tolist()
+        return x, y
+    
+    def spawn_zombies(self, count, min_distance=300, max_distance=500):
+        """Spawn a wave of up to count zombies around the player and return them"""
+        zombies = [Zombie(int(x), int(y))
+                   for x, y in self.get_spawn_positions(count, min_distance, max_distance).tolist()]
+        for zombie in zombies:
+            self.add_entity(zombie)
+        return zombies
+    
+    def add_entity(self, entity):
+        """Add a zombie or NPC to the sprite groups and the entity store, if enabled"""
+        self.all_sprites.add(entity)
+        self.entity_index.insert(entity)
+        entity.spatial_index = self.entity_index
+        if isinstance(entity, NPC):
+            self.npcs.add(entity)
+        if entity.is_hostile:
+            self.enemies.add(entity)
+        if self.entity_store is not None:
+            self.entity_store.add(entity)
+    
+    def remove_entity(self, entity):
+        """Remove a zombie or NPC from the sprite groups, the index and the entity store"""
+        entity.kill()
+        self.entity_index.remove(entity)
+        entity.spatial_index = None
+        if entity.store is not None:
+            self.entity_store.remove(entity)
     
     def update(self, dt):
+        profiler = self.game.profiler
+        
         # Update player and check for shockwave creation
-        shockwave = self.player.update(dt, self.all_sprites)
-        if shockwave:
-            self.shockwaves.add(shockwave)
-            self.all_sprites.add(shockwave)
+        with profiler.section('player'):
+            keys = self.game.input_handler.get_pressed()
+            shockwave = self.player.update(dt, self.all_sprites, self.building_grid, keys)
+            if shockwave:
+                self.shockwaves.add(shockwave)
+                self.all_sprites.add(shockwave)
         
-        # Update shockwaves and check for collisions
-        for shockwave in list(self.shockwaves):
-            if shockwave.update(dt):
-                shockwave.kill()
+        with profiler.section('shockwaves'):
+            # Update shockwaves, dropping any that have finished expanding
+            live_shockwaves = []
+            for shockwave in list(self.shockwaves):
+                if shockwave.update(dt):
+                    shockwave.kill()
+                else:
+                    live_shockwaves.append(shockwave)
+            
+            # Resolve hits for all live shockwaves against all hostiles in one batch
+            if live_shockwaves:
+                if self.entity_store is not None:
+                    targets, centers = self.entity_store.hostile_targets()
+                    resolve_shockwaves(live_shockwaves, targets, dt, centers)
+                else:
+                    targets = [enemy for enemy in self.enemies if not enemy.is_dead]
+                    resolve_shockwaves(live_shockwaves, targets, dt)
+        
+        with profiler.section('ai'):
+            # Re-index living hostiles so followers can find targets cheaply
+            self.hostile_index.rebuild(enemy for enemy in self.enemies if not enemy.is_dead)
+            
+            # Re-route zombies only when the player has changed flow field cell
+            with profiler.section('flow_field'):
+                self.flow_field.update(self.player, self.building_grid)
+            
+            # Update enemies and NPCs
+            if self.entity_store is not None:
+                self.update_entity_store(dt)
+            elif self.scheduler is not None:
+                self.update_scheduled(dt)
             else:
-                # Check for entities in shockwave radius
+                mobs = []
                 for sprite in self.all_sprites:
-                    if isinstance(sprite, (Zombie, NPC)) and sprite.is_hostile:
-                        dx = sprite.rect.centerx - shockwave.center_x
-                        dy = sprite.rect.centery - shockwave.center_y
-                        distance = math.sqrt(dx * dx + dy * dy)
-                        
-                        if distance <= shockwave.radius:
-                            # Calculate knockback direction
-                            if distance > 0:
-                                knockback_x = (dx / distance) * shockwave.knockback * dt
-                                knockback_y = (dy / distance) * shockwave.knockback * dt
-                                sprite.take_damage(shockwave.damage, knockback_x, knockback_y)
-        
-        # Update enemies and NPCs
-        for sprite in self.all_sprites:
-            if isinstance(sprite, (Zombie, NPC)) and sprite != self.player:
-                sprite.update(dt, self.player, self.all_sprites)
+                    start = sprite.rect.center
+                    if isinstance(sprite, NPC):
+                        sprite.update(dt, self.player, self.all_sprites, self.building_grid, self.hostile_index)
+                    elif isinstance(sprite, Zombie):
+                        sprite.update(dt, self.player, self.all_sprites, self.building_grid, self.flow_field)
+                    else:
+                        continue
+                    mobs.append((sprite, dt, start))
+                self.separate_crowd(mobs)
         
         # Update camera to follow player
-        self.camera.follow(self.player)
+        with profiler.section('camera'):
+            self.camera.follow(self.player)
+        
+        # Stream world chunks in and out around the player
+        if self.world is not None:
+            with profiler.section('world'):
+                self.world.update(self.player)
         
         # Check player death
         if self.player.health <= 0:
             self.game.change_state('menu')
     
+    def update_scheduled(self, dt):
+        """Update the mobs the scheduler says are due, each with its own dt"""
+        x, y = self.player.rect.center
+        # Followers and revealed hostile NPCs chase the player from any distance
+        pinned = [npc for npc in self.npcs if npc.revealed and (npc.is_hostile or npc.following_player)]
+        due = self.scheduler.schedule(dt, x, y, pinned)
+        mobs = []
+        for sprite, sprite_dt in due:
+            start = sprite.rect.center
+            if isinstance(sprite, NPC):
+                sprite.update(sprite_dt, self.player, self.all_sprites, self.building_grid, self.hostile_index)
+            else:
+                sprite.update(sprite_dt, self.player, self.all_sprites, self.building_grid, self.flow_field)
+            mobs.append((sprite, sprite_dt, start))
+        self.separate_crowd(mobs)
+    
+    def separate_crowd(self, mobs):
+        """Push apart the hostile mobs among the (sprite, dt, start) triples just updated, in one batch.
+
+        As in EntityStore.step, the push is added to each mob's own step this
+        frame and the sum is clamped to the mob's speed.
+        """
+        if not config.USE_SEPARATION:
+            return
+        crowd = [(sprite, sprite_dt, start) for sprite, sprite_dt, start in mobs
+                 if sprite.is_hostile and not sprite.is_dead]
+        if len(crowd) < 2:
+            return
+        with self.game.profiler.section('separation'):
+            pos = np.array([sprite.rect.center for sprite, _, _ in crowd], dtype=np.float64)
+            moved = pos - np.array([start for _, _, start in crowd], dtype=np.float64)
+            steps = np.array([sprite.speed * sprite_dt for sprite, sprite_dt, _ in crowd])
+            step = moved + separation(pos) * (steps * config.SEPARATION_WEIGHT)[:, np.newaxis]
+            length = np.hypot(step[:, 0], step[:, 1])
+            step *= np.minimum(1, steps / np.maximum(length, 1e-9))[:, np.newaxis]
+            push = step - moved
+            # Rects round to whole pixels, so smaller pushes would not move anything
+            for index in np.nonzero(np.abs(push).max(axis=1) >= 0.5)[0].tolist():
+                px, py = push[index].tolist()
+                crowd[index][0].move(px, py, self.all_sprites, self.building_grid)
+    
+    def update_entity_store(self, dt):
+        """Move every mob through the batched store kernel"""
+        store = self.entity_store
+        store.update(dt, self.all_sprites, self.building_grid, self.player, self.flow_field)
+        
+        # Reveals and follower attacks are per-NPC decisions made on the kernel's distances
+        for npc in self.npcs:
+            if npc.is_dead:
+                continue
+            if not npc.revealed:
+                if store.distance[npc.store_index] <= config.NPC_DETECTION_RADIUS:
+                    npc.reveal(self.player)
+                    store.refresh(npc)
+            elif npc.following_player:
+                npc.attack_nearest(self.all_sprites, self.hostile_index)
+    
+    def visible_entities(self, viewport):
+        """Return the zombies and NPCs whose rects intersect the viewport"""
+        candidates = self.entity_index.query_rect(viewport, config.CULL_MARGIN)
+        return [entity for entity in candidates if viewport.colliderect(entity.rect)]
+    
+    def enter(self):
+        # Whatever the previous state left on screen has to be painted over
+        self.dirty.invalidate()
+        self.dirty_rects = None
+    
     def draw(self, screen):
-        # Clear screen
-        screen.fill(config.BLACK)
+        # Only sprites that intersect the camera viewport are drawn
+        viewport = self.camera.viewport()
+        offset_x = self.camera.offset_x
+        offset_y = self.camera.offset_y
+        offset = (offset_x, offset_y)
+        entities = [self.player] + self.visible_entities(viewport)
         
-        # Draw all sprites with camera offset
-        for sprite in self.all_sprites:
-            screen_pos = self.camera.apply(sprite)
-            screen.blit(sprite.image, screen_pos)
-            
-            # Draw health bars for entities
-            if isinstance(sprite, (Player, Zombie, NPC)):
-                health_pct = sprite.health / sprite.max_health
-                bar_width = sprite.rect.width
-                bar_height = 5
-                
-                # Background (red)
-                bar_pos = pygame.Rect(
-                    screen_pos.x,
-                    screen_pos.y - 10,
-                    bar_width,
-                    bar_height
-                )
-                pygame.draw.rect(screen, config.RED, bar_pos)
-                
-                # Foreground (green)
-                bar_pos.width *= health_pct
-                pygame.draw.rect(screen, config.GREEN, bar_pos)
+        # The background covers the whole screen, so it doubles as the clear.
+        # With dirty rects on and a still camera only last frame's sprites are erased.
+        restored = self.dirty.regions_to_restore(offset) if config.DIRTY_RECTS else None
+        if restored is None:
+            self.background.draw(screen, offset_x, offset_y)
+        else:
+            for rect in restored:
+                self.background.draw(screen, offset_x, offset_y, rect)
+        
+        # Entities, then shockwaves on top, in a single blit call
+        batch = [(entity.image, (entity.rect.x - offset_x, entity.rect.y - offset_y))
+                 for entity in entities]
+        batch.extend((shockwave.image, (shockwave.rect.x - offset_x, shockwave.rect.y - offset_y))
+                     for shockwave in self.shockwaves if viewport.colliderect(shockwave.rect))
+        
+        # Health bars are cached surfaces, so they go in the same batch
+        batch.extend((entity.health_bar, (entity.rect.x - offset_x, entity.rect.y - offset_y - 10))
+                     for entity in entities)
+        blit_batch(screen, batch)
         
         # Draw UI
         self.draw_ui(screen)
+        
+        if config.DIRTY_RECTS:
+            rects = [pygame.Rect(position, image.get_size()) for image, position in batch]
+            rects.append(pygame.Rect(config.HUD_RECT))
+            self.dirty_rects = self.dirty.finish_frame(offset, rects, restored)
     
     def draw_ui(self, screen):
-        # Draw player health bar
-        bar_width = 200
-        bar_height = 20
-        x = 10
-        y = 10
-        
-        # Background (red)
-        pygame.draw.rect(screen, config.RED, (x, y, bar_width, bar_height))
-        
-        # Foreground (green)
-        health_width = (self.player.health / self.player.max_health) * bar_width
-        pygame.draw.rect(screen, config.GREEN, (x, y, health_width, bar_height))
+        player = self.player
+        draw_hud(screen, self.game.text_cache, player.health, player.max_health,
+                 player.shockwave_cooldown, len(player.followers))
+    
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.game.change_state('pause')
+
+class RemotePlayState(GameState):
+    """Play state whose simulation runs in a worker process.
+
+    The worker steps a regular PlayState and publishes what the camera can
+    see into shared memory (see utils/sim_worker.py). This state forwards
+    the held keys, picks up the latest snapshot each frame and draws it
+    with the same shared images, so input and drawing never wait on the
+    simulation.
+    """
+    clears_screen = True
+    
+    def __init__(self, game, seed=None):
+        super().__init__(game)
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.client = sim_worker.SimulationClient(seed)
+        self.background = BackgroundLayer()
+        self.generation = None
+        self.snapshot = None
+    
+    def enter(self):
+        self.client.set_paused(False)
+    
+    def close(self):
+        self.client.close()
+    
+    def update(self, dt):
+        keys = self.game.input_handler.get_pressed()
+        self.client.send_keys(tuple(key for key in sim_worker.SIMULATION_KEYS if keys[key]))
+        snapshot = self.client.latest()
+        if snapshot is None:
+            return
+        self.snapshot = snapshot
         
-        # Draw health text
-        font = pygame.font.Font(None, 24)
-        health_text = f"Health: {int(self.player.health)}/{self.player.max_health}"
-        text_surface = font.render(health_text, True, config.WHITE)
-        screen.blit(text_surface, (x + 10, y + 25))
+        # Check player death
+        if snapshot[0][sim_worker.GAME_OVER]:
+            self.game.change_state('menu')
+    
+    def sync_buildings(self, header, records):
+        """Rebuild the background when the worker's set of loaded buildings changes"""
+        generation = header[sim_worker.GENERATION]
+        if generation == self.generation:
+            return
+        self.generation = generation
+        self.background.clear()
+        for _, x, y, width, height, door_x, door_y, _ in records[:int(header[sim_worker.BUILDINGS])].tolist():
+            building = Building(int(x), int(y), int(width), int(height))
+            building.door_pos = (int(door_x), int(door_y))
+            building.draw_building()
+            self.background.add(building)
+    
+    def draw(self, screen):
+        if self.snapshot is None:
+            screen.fill(config.BLACK)
+            return
+        header, records = self.snapshot
+        self.sync_buildings(header, records)
+        offset_x = int(header[sim_worker.OFFSET_X])
+        offset_y = int(header[sim_worker.OFFSET_Y])
+        self.background.draw(screen, offset_x, offset_y)
         
-        # Draw shockwave cooldown
-        if self.player.shockwave_cooldown > 0:
-            cooldown_text = f"Shockwave: {self.player.shockwave_cooldown:.1f}s"
-        else:
-            cooldown_text = "Shockwave: Ready!"
-        cooldown_surface = font.render(cooldown_text, True, config.WHITE)
-        screen.blit(cooldown_surface, (x + 10, y + 45))
+        # Entities, then shockwaves on top, then health bars, in a single blit call
+        colors = {sim_worker.KIND_PLAYER: config.BLUE, sim_worker.KIND_ZOMBIE: config.RED,
+                  sim_worker.KIND_NPC: config.WHITE}
+        batch = []
+        bars = []
+        for kind, x, y, radius, health, max_health, look, _ in \
+                records[int(header[sim_worker.BUILDINGS]):].tolist():
+            if kind == sim_worker.KIND_SHOCKWAVE:
+                image = shockwave_frames.get(radius)
+                batch.append((image, (int(x) - image.get_width() // 2 - offset_x,
+                                      int(y) - image.get_height() // 2 - offset_y)))
+                continue
+            radius = int(radius)
+            position = (int(x) - offset_x, int(y) - offset_y)
+            batch.append((entity_images.get(radius, colors[kind], sim_worker.IMAGE_STATES[int(look)]),
+                          position))
+            bars.append((health_bars.bar_for(radius * 2, health, max_health),
+                         (position[0], position[1] - 10)))
+        blit_batch(screen, batch + bars)
         
-        # Draw follower count
-        follower_text = f"Followers: {len(self.player.followers)}"
-        follower_surface = font.render(follower_text, True, config.WHITE)
-        screen.blit(follower_surface, (x + 10, y + 65))
+        draw_hud(screen, self.game.text_cache, header[sim_worker.HEALTH], header[sim_worker.MAX_HEALTH],
+                 header[sim_worker.SHOCKWAVE_COOLDOWN], int(header[sim_worker.FOLLOWERS]))
     
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.client.set_paused(True)
             self.game.change_state('pause')
 
 class PauseState(GameState):
     def __init__(self, game):
         super().__init__(game)
         self.options = ['Resume', 'Restart', 'Quit to Menu']
+        self.overlay = None
     
     def update(self, dt):
         pass
     
     def draw(self, screen):
-        # Draw semi-transparent overlay
-        overlay = pygame.Surface((screen.get_width(), screen.get_height()))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(128)
-        screen.blit(overlay, (0, 0))
+        # Draw semi-transparent overlay, built once per screen size
+        if self.overlay is None or self.overlay.get_size() != screen.get_size():
+            self.overlay = pygame.Surface(screen.get_size())
+            self.overlay.fill((0, 0, 0))
+            self.overlay.set_alpha(128)
+        screen.blit(self.overlay, (0, 0))
         
         # Draw pause menu options
-        font = pygame.font.Font(None, 36)
+        text_cache = self.game.text_cache
         for i, option in enumerate(self.options):
-            text = font.render(option, True, (255, 255, 255))
+            text = text_cache.render(None, 36, option, (255, 255, 255))
             rect = text.get_rect(center=(screen.get_width() // 2, 200 + i * 50))
             screen.blit(text, rect)
     
@@ -0,0 +1,62 @@
+"""Benchmark Entity.move with and without the building grid.
+
+Run from the project root:
+
+    python tests/benchmarks/bench_collisions.py
+
+Buildings are laid out at a constant density, so the world grows with the
+building count. With the grid the per-move cost should stay roughly flat;
+the full scan grows linearly with the number of buildings.
+"""
+import os
+import sys
+import random
+import timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import pygame
+import config
+from utils.entities import Building, Zombie
+from utils.spatial import SpatialGrid
+
+BUILDING_COUNTS = (10, 100, 1000, 5000)
+MOVES = 2000
+
+def build_world(count):
+    """Create a sprite group and grid holding count buildings on a lattice"""
+    sprites = pygame.sprite.Group()
+    grid = SpatialGrid(config.BUILDING_GRID_CELL_SIZE)
+    columns = int(count ** 0.5) + 1
+    for i in range(count):
+        building = Building((i % columns) * 400, (i // columns) * 400, 200, 200)
+        sprites.add(building)
+        grid.insert(building)
+    return sprites, grid, columns * 400
+
+def time_moves(sprites, grid, extent):
+    """Return microseconds per move for a zombie jittering around the world"""
+    rng = random.Random(0)
+    zombie = Zombie(0, 0)
+    positions = [(rng.uniform(0, extent), rng.uniform(0, extent)) for _ in range(MOVES)]
+    
+    def run():
+        for x, y in positions:
+            zombie.rect.center = (x, y)
+            zombie.move(2, 2, sprites, grid)
+    
+    return min(timeit.repeat(run, number=1, repeat=3)) / MOVES * 1e6
+
+def main():
+    pygame.init()
+    print(f"{'buildings':>10} {'full scan (us)':>15} {'grid (us)':>10}")
+    for count in BUILDING_COUNTS:
+        sprites, grid, extent = build_world(count)
+        scan = time_moves(sprites, None, extent)
+        indexed = time_moves(sprites, grid, extent)
+        print(f"{count:>10} {scan:>15.2f} {indexed:>10.2f}")
+    pygame.quit()
+
+if __name__ == '__main__':
+    main()
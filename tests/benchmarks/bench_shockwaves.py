@@ -0,0 +1,56 @@
+"""Benchmark batched shockwave resolution against the per-sprite loop.
+
+Run from the project root:
+
+    python tests/benchmarks/bench_shockwaves.py
+"""
+import os
+import sys
+import math
+import random
+import timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import pygame
+from utils.combat import resolve_shockwaves
+from utils.entities import Shockwave, Zombie
+
+TARGET_COUNTS = (100, 1000, 5000, 10000)
+SHOCKWAVES = 5
+DT = 1 / 60
+
+def scalar_resolve(shockwaves, targets, dt):
+    """The original per-sprite loop from PlayState.update"""
+    for shockwave in shockwaves:
+        for target in targets:
+            dx = target.rect.centerx - shockwave.center_x
+            dy = target.rect.centery - shockwave.center_y
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance <= shockwave.radius and distance > 0:
+                target.take_damage(shockwave.damage,
+                                   (dx / distance) * shockwave.knockback * dt,
+                                   (dy / distance) * shockwave.knockback * dt)
+
+def main():
+    pygame.init()
+    rng = random.Random(0)
+    print(f"{'targets':>8} {'loop (ms)':>10} {'batched (ms)':>13} {'speedup':>8}")
+    for count in TARGET_COUNTS:
+        extent = int(math.sqrt(count) * 60)
+        targets = [Zombie(rng.uniform(0, extent), rng.uniform(0, extent)) for _ in range(count)]
+        for target in targets:
+            # Keep targets alive so every run does the same work
+            target.max_health = target.health = float('inf')
+        waves = [Shockwave(rng.uniform(0, extent), rng.uniform(0, extent)) for _ in range(SHOCKWAVES)]
+        for wave in waves:
+            wave.radius = 80
+        
+        loop = min(timeit.repeat(lambda: scalar_resolve(waves, targets, DT), number=1, repeat=5))
+        batched = min(timeit.repeat(lambda: resolve_shockwaves(waves, targets, DT), number=1, repeat=5))
+        print(f"{count:>8} {loop * 1000:>10.2f} {batched * 1000:>13.2f} {loop / batched:>7.1f}x")
+    pygame.quit()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""Scaling benchmark for PlayState.update and PlayState.draw.
+
+Builds PlayState scenarios with a given number of zombies, NPCs, buildings
+and live shockwaves, runs them headless and reports per-frame update and
+draw times (mean and percentiles) as JSON. Results can be compared against
+a stored baseline; any scenario slower than baseline * tolerance fails the
+run with a non-zero exit code.
+
+Run from the project root:
+
+    # Default scenarios (10 to 10k zombies), compared to baseline.json
+    python tests/benchmarks/bench_simulation.py
+
+    # One custom scenario
+    python tests/benchmarks/bench_simulation.py --zombies 5000 --npcs 500 --buildings 200 --shockwaves 20
+
+    # Refresh the stored baseline on the reference machine
+    python tests/benchmarks/bench_simulation.py --update-baseline
+
+Baselines are machine specific; regenerate them when the CI hardware changes.
+"""
+import os
+import sys
+import json
+import math
+import random
+import argparse
+import platform
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import pygame
+import config
+from main import Game
+from states.game_state import PlayState
+from utils.entities import Building, Zombie, NPC, Shockwave
+from utils.input_handler import wander_script
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# name -> (zombies, npcs, buildings, shockwaves)
+SCENARIOS = {
+    'tiny': (10, 2, 5, 1),
+    'small': (100, 10, 20, 2),
+    'medium': (1000, 100, 100, 5),
+    'large': (10000, 1000, 400, 20),
+}
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples using linear interpolation"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * pct / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+def summarize(samples):
+    """Return mean and percentile frame times in milliseconds"""
+    millis = [sample * 1000 for sample in samples]
+    return {
+        'mean': sum(millis) / len(millis),
+        'p50': percentile(millis, 50),
+        'p95': percentile(millis, 95),
+        'p99': percentile(millis, 99),
+        'max': max(millis),
+    }
+
+def build_scenario(game, zombies, npcs, buildings, shockwaves, seed=0):
+    """Create a PlayState populated with the requested entity counts.
+
+    The world grows with the entity count so density stays roughly
+    constant: buildings sit on a lattice and mobs are scattered uniformly
+    around the player. The player is made effectively immortal so every
+    frame does the same kind of work.
+    """
+    random.seed(seed)
+    state = PlayState(game)
+
+    # Throw away the default world and build the scenario instead
+    for sprite in list(state.all_sprites):
+        if sprite is not state.player:
+            sprite.kill()
+    state.building_grid.clear()
+    state.background.clear()
+    state.occupancy.clear()
+    state.world = None
+    state.entity_index.clear()
+    if state.scheduler is not None:
+        state.scheduler.clear()
+    state.player.followers.clear()
+    if state.entity_store is not None:
+        for sprite in list(state.entity_store.sprites):
+            if sprite is not None:
+                state.entity_store.remove(sprite)
+
+    extent = max(config.WINDOW_WIDTH, int(math.sqrt(zombies + npcs) * 80))
+    state.player.rect.center = (extent // 2, extent // 2)
+    state.player.max_health = state.player.health = 10 ** 9
+
+    columns = max(1, math.ceil(math.sqrt(buildings)))
+    spacing = extent // columns
+    for i in range(buildings):
+        x = (i % columns) * spacing + spacing // 4
+        y = (i // columns) * spacing + spacing // 4
+        state.add_building(Building(x, y, spacing // 2, spacing // 2))
+
+    for _ in range(zombies):
+        state.add_entity(Zombie(random.uniform(0, extent), random.uniform(0, extent)))
+    for _ in range(npcs):
+        state.add_entity(NPC(random.uniform(0, extent), random.uniform(0, extent)))
+
+    state.shockwave_target = shockwaves
+    top_up_shockwaves(state, extent)
+    state.camera.follow(state.player)
+    return state, extent
+
+def top_up_shockwaves(state, extent):
+    """Keep the requested number of shockwaves alive, at staggered sizes"""
+    while len(state.shockwaves) < state.shockwave_target:
+        shockwave = Shockwave(int(random.uniform(0, extent)), int(random.uniform(0, extent)))
+        shockwave.radius = random.uniform(10, shockwave.max_radius)
+        state.shockwaves.add(shockwave)
+        state.all_sprites.add(shockwave)
+
+def run_scenario(game, counts, frames=120, warmup=10, seed=0):
+    """Run one scenario and return its timing summary"""
+    zombies, npcs, buildings, shockwaves = counts
+    state, extent = build_scenario(game, zombies, npcs, buildings, shockwaves, seed)
+    game.states['play'] = state
+    game.change_state('play')
+
+    dt = 1.0 / config.FPS
+    update_times = []
+    draw_times = []
+    for frame in range(warmup + frames):
+        game.input_handler.update()
+        start = time.perf_counter()
+        state.update(dt)
+        middle = time.perf_counter()
+        state.draw(game.screen)
+        end = time.perf_counter()
+        top_up_shockwaves(state, extent)
+        if frame >= warmup:
+            update_times.append(middle - start)
+            draw_times.append(end - middle)
+
+    return {
+        'counts': {'zombies': zombies, 'npcs': npcs, 'buildings': buildings, 'shockwaves': shockwaves},
+        'frames': frames,
+        'update_ms': summarize(update_times),
+        'draw_ms': summarize(draw_times),
+    }
+
+def compare(results, baseline, tolerance, metric='p50'):
+    """Return a list of regression messages for results slower than the baseline"""
+    failures = []
+    for name, result in results.items():
+        reference = baseline.get('scenarios', {}).get(name)
+        if reference is None or reference['counts'] != result['counts']:
+            continue
+        for phase in ('update_ms', 'draw_ms'):
+            allowed = reference[phase][metric] * tolerance
+            measured = result[phase][metric]
+            # Ignore sub-millisecond noise on the tiny scenarios
+            if measured > allowed and measured - reference[phase][metric] > 0.5:
+                failures.append(f"{name} {phase} {metric}: {measured:.2f}ms > "
+                                f"{allowed:.2f}ms ({tolerance}x baseline {reference[phase][metric]:.2f}ms)")
+    return failures
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='scenario(s) to run (default: all)')
+    parser.add_argument('--zombies', type=int, help='run a single custom scenario with this many zombies')
+    parser.add_argument('--npcs', type=int, default=0)
+    parser.add_argument('--buildings', type=int, default=0)
+    parser.add_argument('--shockwaves', type=int, default=0)
+    parser.add_argument('--frames', type=int, default=120, help='measured frames per scenario')
+    parser.add_argument('--warmup', type=int, default=10, help='unmeasured frames per scenario')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report to this file instead of stdout')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=2.0,
+                        help='fail if a p50 frame time exceeds baseline * tolerance')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='write the results to the baseline file instead of comparing')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.zombies is not None:
+        scenarios = {'custom': (args.zombies, args.npcs, args.buildings, args.shockwaves)}
+    else:
+        scenarios = {name: SCENARIOS[name] for name in (args.scenario or SCENARIOS)}
+
+    game = Game(headless=True, script=wander_script(args.seed))
+    results = {}
+    for name, counts in scenarios.items():
+        results[name] = run_scenario(game, counts, args.frames, args.warmup, args.seed)
+        print(f"{name}: update p50 {results[name]['update_ms']['p50']:.2f}ms, "
+              f"draw p50 {results[name]['draw_ms']['p50']:.2f}ms", file=sys.stderr)
+    pygame.quit()
+
+    report = {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'machine': platform.machine(),
+        'scenarios': results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            f.write(text + '\n')
+        return 0
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    failures = compare(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
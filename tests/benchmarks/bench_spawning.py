@@ -0,0 +1,44 @@
+"""Benchmark spawn-wave sampling with OccupancyMap.sample_annulus.
+
+Run from the project root:
+
+    python tests/benchmarks/bench_spawning.py
+
+Buildings sit on a lattice around the player, roughly as dense as a loaded
+chunk. A wave of a thousand should come back in one call within a frame; the
+cost grows with the wave size, not with the number of buildings.
+"""
+import os
+import sys
+import timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+import pygame
+from utils.occupancy import OccupancyMap
+
+WAVE_SIZES = (10, 100, 1000, 10000)
+LATTICE = 5  # Buildings per side of the player, on a 150 px lattice
+
+def build_map():
+    """Return an occupancy map with a lattice of buildings around the origin"""
+    occupancy = OccupancyMap()
+    for i in range(-LATTICE, LATTICE + 1):
+        for j in range(-LATTICE, LATTICE + 1):
+            if i or j:
+                occupancy.add(pygame.Rect(i * 150, j * 150, 80, 80))
+    return occupancy
+
+def main():
+    occupancy = build_map()
+    rng = np.random.default_rng(0)
+    print(f"{'wave':>6} {'sample (ms)':>12}")
+    for count in WAVE_SIZES:
+        seconds = min(timeit.repeat(lambda: occupancy.sample_annulus((0, 0), 300, 500, count, rng),
+                                    number=1, repeat=5))
+        print(f"{count:>6} {seconds * 1000:>12.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""Benchmark crowd separation steering.
+
+Run from the project root:
+
+    python tests/benchmarks/bench_steering.py
+
+Each mob count is run twice: spread out at the usual horde density, and
+piled onto one spot. Because every mob looks at no more than
+SEPARATION_MAX_NEIGHBORS candidates, the piled-up crowd should cost about
+the same as the spread-out one, and both should grow linearly.
+"""
+import os
+import sys
+import math
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+from utils.steering import separation
+
+MOB_COUNTS = (100, 1000, 10000, 20000)
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'mobs':>6} {'spread (ms)':>12} {'piled (ms)':>11}")
+    for count in MOB_COUNTS:
+        extent = math.sqrt(count) * 80
+        spread = rng.uniform(0, extent, (count, 2))
+        piled = rng.uniform(0, 5, (count, 2))
+        spread_time = min(timeit.repeat(lambda: separation(spread), number=1, repeat=5))
+        piled_time = min(timeit.repeat(lambda: separation(piled), number=1, repeat=5))
+        print(f"{count:>6} {spread_time * 1000:>12.2f} {piled_time * 1000:>11.2f}")
+
+if __name__ == '__main__':
+    main()
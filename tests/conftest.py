@@ -15,7 +15,8 @@ def game():
     pygame.init()
     game = Game()
     yield game
-    pygame.quit()
+    # Stops the world-builder and preloader threads, then shuts pygame down
+    game.close()
 
 @pytest.fixture
 def mock_screen():
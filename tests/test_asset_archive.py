@@ -0,0 +1,109 @@
+import os
+import wave
+import pygame
+from utils.asset_archive import AssetArchive, build_archive
+from utils.asset_loader import AssetLoader, AssetPreloader
+
+def make_assets(tmp_path):
+    """Write one image, sound and font under tmp_path and pack them into assets.pak"""
+    for folder in ('images', 'sounds', 'fonts'):
+        os.makedirs(tmp_path / folder)
+    surface = pygame.Surface((6, 4), pygame.SRCALPHA)
+    surface.fill((10, 20, 30, 200))
+    surface.set_at((5, 3), (255, 0, 0, 255))
+    pygame.image.save(surface, str(tmp_path / 'images' / 'tile.png'))
+
+    frequency, size, channels = pygame.mixer.get_init()
+    with wave.open(str(tmp_path / 'sounds' / 'beep.wav'), 'wb') as f:
+        f.setnchannels(channels)
+        f.setsampwidth(abs(size) // 8)
+        f.setframerate(frequency)
+        f.writeframes(bytes(range(64)) * 16)
+
+    font_path = os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+    with open(font_path, 'rb') as src, open(tmp_path / 'fonts' / 'hud.ttf', 'wb') as dst:
+        dst.write(src.read())
+    (tmp_path / 'images' / 'README.md').write_text('not an asset')
+
+    index = build_archive(str(tmp_path), str(tmp_path / 'assets.pak'))
+    return index
+
+def test_archive_round_trip(tmp_path, game):
+    """Test that packed images, sounds and fonts come back intact and hashes verify"""
+    index = make_assets(tmp_path)
+    assert set(index['images']) == {'tile.png'}
+    archive = AssetArchive(str(tmp_path / 'assets.pak'))
+    assert archive.verify() == {}
+    for entry in (e for entries in archive.index.values() for e in entries.values()):
+        assert entry['offset'] % 16 == 0
+
+    image = archive.image('tile.png')
+    assert image.get_size() == (6, 4)
+    assert image.get_at((0, 0)) == (10, 20, 30, 200)
+    assert image.get_at((5, 3)) == (255, 0, 0, 255)
+    # Same pixel layout convert_alpha() would give, so blits need no conversion
+    assert image.get_masks() == image.convert_alpha().get_masks()
+
+    expected = pygame.mixer.Sound(str(tmp_path / 'sounds' / 'beep.wav')).get_raw()
+    assert archive.sound('beep.wav').get_raw() == expected
+    assert archive.font('hud.ttf', 20).size('DotZ')[1] > 0
+    assert archive.image('missing.png') is None
+    archive.close()
+
+def test_verify_reports_corrupt_entries(tmp_path, game):
+    """Test that a flipped byte in a blob shows up in verify()"""
+    index = make_assets(tmp_path)
+    offset = index['images']['tile.png']['offset']
+    with open(tmp_path / 'assets.pak', 'r+b') as f:
+        f.seek(offset)
+        byte = f.read(1)
+        f.seek(offset)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    archive = AssetArchive(str(tmp_path / 'assets.pak'))
+    assert archive.verify() == {'images/tile.png': 'hash mismatch'}
+    archive.close()
+
+def test_loader_reads_from_archive(tmp_path, game):
+    """Test that AssetLoader and the preloader use the archive instead of the loose files"""
+    make_assets(tmp_path)
+    for folder in ('images', 'sounds', 'fonts'):
+        for filename in os.listdir(tmp_path / folder):
+            os.remove(tmp_path / folder / filename)
+
+    loader = AssetLoader(archive=None)
+    loader.base_path = str(tmp_path)
+    loader.archive = loader.open_archive('assets.pak')
+    assert loader.load_image('tile', 'tile.png').get_size() == (6, 4)
+    assert loader.load_sound('beep', 'beep.wav') is not None
+    assert loader.load_font('hud', 'hud.ttf', 18) is not None
+
+    manifest = {'play': {'images': {'tile2': 'tile.png'}, 'fonts': {'hud2': ['hud.ttf', 12]}}}
+    preloader = AssetPreloader(loader, manifest)
+    job = preloader.preload('play')
+    # Nothing left for the thread pool
+    assert job.done and job.total == 0
+    assert 'tile2' in loader.images and 'hud2' in loader.fonts
+    preloader.shutdown()
+    loader.close()
+
+def test_missing_archive_falls_back_to_files(tmp_path):
+    """Test that a loader without an archive file still works"""
+    loader = AssetLoader(archive=None)
+    loader.base_path = str(tmp_path)
+    assert loader.open_archive('assets.pak') is None
+    assert not loader.packed('images', 'tile.png')
+
+def test_packed_images_can_be_drawn_into(tmp_path, game):
+    """Test that drawing into a packed image works and leaves the archive file alone"""
+    make_assets(tmp_path)
+    path = tmp_path / 'assets.pak'
+    before = path.read_bytes()
+    archive = AssetArchive(str(path))
+    image = archive.image('tile.png')
+    image.fill((1, 2, 3, 255))
+    image.set_at((0, 0), (255, 255, 255, 255))
+    image.blit(pygame.Surface((2, 2)), (4, 2))
+    assert image.get_at((0, 0)) == (255, 255, 255, 255)
+    assert image.get_at((1, 1)) == (1, 2, 3, 255)
+    archive.close()
+    assert path.read_bytes() == before
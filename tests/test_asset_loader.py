@@ -0,0 +1,135 @@
+import os
+import pygame
+import config
+from utils.asset_loader import AssetLoader, AssetPreloader
+from utils.sprite_utils import GameSprite, load_spritesheet, set_shared_assets, release_shared_assets, shared_assets
+
+def make_assets(tmp_path, count):
+    """Return an AssetLoader rooted in tmp_path with count small PNGs"""
+    os.makedirs(tmp_path / 'images')
+    for i in range(count):
+        surface = pygame.Surface((8, 8), pygame.SRCALPHA)
+        surface.fill((i, 0, 0, 255))
+        pygame.image.save(surface, str(tmp_path / 'images' / f'tile{i}.png'))
+    loader = AssetLoader()
+    loader.base_path = str(tmp_path)
+    return loader
+
+def test_load_image_is_cached(tmp_path, mock_screen):
+    """Test that a second load_image returns the cached surface without reading the file"""
+    loader = make_assets(tmp_path, 1)
+    image = loader.load_image('tile', 'tile0.png')
+    assert image is not None
+    os.remove(tmp_path / 'images' / 'tile0.png')
+    assert loader.load_image('tile', 'tile0.png') is image
+
+def test_load_font_is_cached(tmp_path, mock_screen):
+    """Test that load_font returns a preloaded or previously loaded font without reading the file"""
+    loader = make_assets(tmp_path, 0)
+    os.makedirs(tmp_path / 'fonts')
+    font_path = os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+    with open(font_path, 'rb') as src, open(tmp_path / 'fonts' / 'hud.ttf', 'wb') as dst:
+        dst.write(src.read())
+    font = loader.load_font('hud', 'hud.ttf', 18)
+    os.remove(tmp_path / 'fonts' / 'hud.ttf')
+    assert loader.load_font('hud', 'hud.ttf', 18) is font
+    
+    # get_font shares the same name-keyed cache
+    assert loader.get_font(None, 18) is loader.fonts['<default>:18']
+    assert all(isinstance(name, str) for name in loader.fonts)
+
+def test_preloader_loads_in_background(tmp_path, mock_screen):
+    """Test that preloading decodes off-thread and pump finishes a bounded batch per call"""
+    loader = make_assets(tmp_path, 5)
+    manifest = {'play': {'images': {f'tile{i}': f'tile{i}.png' for i in range(5)}
+                         | {'missing': 'missing.png'}}}
+    preloader = AssetPreloader(loader, manifest, batch=2)
+    job = preloader.preload('play')
+    assert preloader.preload('play') is job
+    assert job.total == 6
+    
+    # Nothing reaches the loader until the main thread pumps
+    for future in job.futures:
+        future.result()
+    assert job.progress == 0 and not loader.images
+    assert preloader.pump() == 2
+    assert job.progress == 2 / 6
+    
+    preloader.wait('play')
+    assert job.done and job.progress == 1.0
+    assert len(loader.images) == 5
+    assert loader.images['tile3'].get_at((0, 0)) == (3, 0, 0, 255)
+    
+    # Images went through convert_alpha, so they match the display format
+    assert loader.images['tile3'].get_flags() & pygame.SRCALPHA
+    assert loader.load_image('tile3', 'tile3.png') is loader.images['tile3']
+    preloader.shutdown()
+
+def test_preloader_with_unknown_state(mock_screen):
+    """Test that states without manifest entries count as loaded"""
+    preloader = AssetPreloader(AssetLoader(), {})
+    job = preloader.preload('menu')
+    assert job.done and job.progress == 1.0
+    preloader.shutdown()
+
+def test_game_preloads_manifest(game):
+    """Test that the game starts preloading every state from the shipped manifest"""
+    assert set(game.preloader.jobs) >= {'menu', 'play', 'pause'}
+    game.step(1 / config.FPS)
+
+def test_spritesheet_frames_are_shared_views(tmp_path, mock_screen):
+    """Test that a sheet is sliced once into subsurfaces of the cached, converted sheet"""
+    loader = make_assets(tmp_path, 0)
+    sheet = pygame.Surface((32, 16), pygame.SRCALPHA)
+    sheet.fill((0, 0, 255, 255), (0, 0, 16, 16))
+    sheet.fill((0, 255, 0, 255), (20, 4, 6, 8))
+    pygame.image.save(sheet, str(tmp_path / 'images' / 'walk.png'))
+
+    first = loader.load_spritesheet('walk', 'walk.png', (16, 16))
+    assert len(first.frames) == 2
+    assert all(frame.get_parent() is loader.images['walk'] for frame in first.frames)
+    assert first.frames[1].get_at((4, 4)) == (0, 255, 0, 255)
+    # A second sprite asking for the same sheet gets the same frames
+    assert loader.load_spritesheet('walk', 'walk.png', (16, 16)) is first
+
+    trimmed = loader.load_spritesheet('walk', 'walk.png', (16, 16), trim=True)
+    assert trimmed.rects[0] == pygame.Rect(0, 0, 16, 16)
+    assert trimmed.rects[1] == pygame.Rect(4, 4, 6, 8)
+    assert trimmed.frames[1].get_size() == (6, 8)
+    assert loader.load_spritesheet('run', 'missing.png', (16, 16)) is None
+    
+    # Int colorkeys, as set_colorkey accepts them, are cached like tuples
+    keyed = loader.load_spritesheet('walk', 'walk.png', (16, 16), colorkey=0xFF0000)
+    assert keyed.frames[0].get_colorkey() is not None
+    assert loader.load_spritesheet('walk', 'walk.png', (16, 16), colorkey=0xFF0000) is keyed
+    assert loader.load_spritesheet('walk', 'walk.png', (16, 16), colorkey=(255, 0, 0)) is not keyed
+
+def test_game_sprite_paths_share_one_image(tmp_path, mock_screen):
+    """Test that GameSprites built from the same path share the loader's surface"""
+    loader = make_assets(tmp_path, 1)
+    first = GameSprite('tile0.png', (0, 0), assets=loader)
+    second = GameSprite('tile0.png', (10, 10), assets=loader)
+    assert first.image is second.image is loader.images['tile0.png']
+    
+    # Without a loader, file paths under the images folder go through the shared one
+    set_shared_assets(loader)
+    try:
+        path = str(tmp_path / 'images' / 'tile0.png')
+        assert GameSprite(path, (0, 0)).image is first.image
+        frames = load_spritesheet(path, (4, 4))
+        assert len(frames) == 4 and frames[0].get_parent() is first.image
+        assert load_spritesheet(path, (4, 4)) == frames
+        
+        # Files anywhere else are loaded as they are, every time
+        other = str(tmp_path / 'other.png')
+        pygame.image.save(first.image, other)
+        third = GameSprite(other, (0, 0))
+        assert third.image is not GameSprite(other, (0, 0)).image
+        assert third.image.get_size() == (8, 8)
+        assert len(load_spritesheet(other, (4, 4))) == 4
+    finally:
+        release_shared_assets(loader)
+
+def test_game_shares_its_loader(game):
+    """Test that path-only sprite loads use the game's AssetLoader while the game is open"""
+    assert shared_assets() is game.assets
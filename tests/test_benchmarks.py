@@ -0,0 +1,40 @@
+import os
+import sys
+import pytest
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'benchmarks'))
+import bench_simulation
+
+def test_percentile():
+    """Test percentile interpolation used in benchmark reports"""
+    samples = [1, 2, 3, 4, 5]
+    assert bench_simulation.percentile(samples, 0) == 1
+    assert bench_simulation.percentile(samples, 50) == 3
+    assert bench_simulation.percentile(samples, 100) == 5
+    assert bench_simulation.percentile([1, 2], 50) == 1.5
+
+def test_run_scenario_report(game):
+    """Test that a small scenario runs and reports update and draw timings"""
+    result = bench_simulation.run_scenario(game, (20, 5, 4, 2), frames=5, warmup=1)
+    play_state = game.states['play']
+    
+    assert result['counts'] == {'zombies': 20, 'npcs': 5, 'buildings': 4, 'shockwaves': 2}
+    assert len(play_state.buildings) == 4
+    assert len(play_state.shockwaves) == 2
+    for phase in ('update_ms', 'draw_ms'):
+        summary = result[phase]
+        assert 0 <= summary['p50'] <= summary['p95'] <= summary['p99'] <= summary['max']
+
+def test_compare_flags_regressions():
+    """Test that results slower than baseline * tolerance are reported"""
+    counts = {'zombies': 10, 'npcs': 0, 'buildings': 0, 'shockwaves': 0}
+    baseline = {'scenarios': {'s': {'counts': counts,
+                                    'update_ms': {'p50': 2.0}, 'draw_ms': {'p50': 2.0}}}}
+    fast = {'s': {'counts': counts, 'update_ms': {'p50': 2.5}, 'draw_ms': {'p50': 1.0}}}
+    slow = {'s': {'counts': counts, 'update_ms': {'p50': 9.0}, 'draw_ms': {'p50': 1.0}}}
+    
+    assert bench_simulation.compare(fast, baseline, tolerance=2.0) == []
+    failures = bench_simulation.compare(slow, baseline, tolerance=2.0)
+    assert len(failures) == 1
+    assert 'update_ms' in failures[0]
@@ -0,0 +1,51 @@
+import math
+import random
+import pytest
+import pygame
+from utils.combat import resolve_shockwaves
+from utils.entities import Shockwave, Zombie
+
+def reference_resolve(shockwaves, targets, dt):
+    """Scalar version of the original per-sprite shockwave loop"""
+    for shockwave in shockwaves:
+        for target in targets:
+            dx = target.rect.centerx - shockwave.center_x
+            dy = target.rect.centery - shockwave.center_y
+            distance = math.sqrt(dx * dx + dy * dy)
+            if 0 < distance <= shockwave.radius:
+                target.take_damage(shockwave.damage,
+                                   (dx / distance) * shockwave.knockback * dt,
+                                   (dy / distance) * shockwave.knockback * dt)
+
+def test_resolve_shockwaves_matches_reference():
+    """Test that the batched resolution gives the same damage and knockback as the scalar loop"""
+    pygame.init()
+    rng = random.Random(3)
+    positions = [(rng.randint(0, 400), rng.randint(0, 400)) for _ in range(60)]
+    waves = [Shockwave(100, 100), Shockwave(250, 300), Shockwave(200, 200)]
+    for wave, radius in zip(waves, (60, 90, 40)):
+        wave.radius = radius
+    
+    batched = [Zombie(x, y) for x, y in positions]
+    expected = [Zombie(x, y) for x, y in positions]
+    hits = resolve_shockwaves(waves, batched, 0.016)
+    reference_resolve(waves, expected, 0.016)
+    
+    assert hits > 0
+    for got, want in zip(batched, expected):
+        assert got.health == want.health
+        assert got.knockback_dx == pytest.approx(want.knockback_dx)
+        assert got.knockback_dy == pytest.approx(want.knockback_dy)
+    
+    pygame.quit()
+
+def test_resolve_shockwaves_edge_cases():
+    """Test empty inputs and targets sitting exactly on the shockwave center"""
+    pygame.init()
+    wave = Shockwave(100, 100)
+    centered = Zombie(100, 100)
+    assert resolve_shockwaves([], [centered], 0.016) == 0
+    assert resolve_shockwaves([wave], [], 0.016) == 0
+    assert resolve_shockwaves([wave], [centered], 0.016) == 0
+    assert centered.health == centered.max_health
+    pygame.quit()
@@ -0,0 +1,127 @@
+import math
+import pytest
+import pygame
+import config
+from utils.entity_store import EntityStore
+from utils.pathfinding import FlowField
+from utils.spatial import SpatialGrid
+from utils.entities import Zombie, NPC, Player, Building
+from states.game_state import PlayState
+
+def test_store_fields_write_through():
+    """Test that attached entities read and write their state through the store arrays"""
+    pygame.init()
+    zombie = Zombie(100, 100)
+    zombie.take_damage(10, 3, 4)
+    store = EntityStore(capacity=1)
+    index = store.add(zombie)
+    
+    assert zombie.store is store
+    assert store.health[index] == zombie.max_health - 10
+    assert tuple(store.knockback[index]) == (3, 4)
+    
+    zombie.take_damage(5)
+    assert store.health[index] == zombie.max_health - 15
+    
+    # Growing past capacity keeps existing rows
+    other = Zombie(0, 0)
+    store.add(other)
+    assert store.capacity >= 2
+    assert zombie.health == zombie.max_health - 15
+    
+    store.remove(zombie)
+    assert zombie.store is None
+    assert zombie.health == zombie.max_health - 15
+    assert zombie.knockback_dx == 3
+    assert len(store) == 1
+    pygame.quit()
+
+def test_store_kernel_seeks_and_decays():
+    """Test that the kernel moves mobs toward the player and decays cooldowns"""
+    pygame.init()
+    player = Player(300, 100)
+    near = Zombie(100, 100)
+    far = Zombie(300, 100 + config.ZOMBIE_DETECTION_RADIUS + 50)
+    near.attack_cooldown = 0.95
+    sprites = pygame.sprite.Group(player, near, far)
+    store = EntityStore()
+    store.add(near)
+    store.add(far)
+    
+    for _ in range(10):
+        store.update(0.1, sprites, None, player)
+    
+    # In range: closed 120 px/s for 1s, out of range: untouched
+    assert near.rect.centerx == pytest.approx(100 + config.ZOMBIE_SPEED * 1.0, abs=1)
+    assert far.rect.center == (300, 100 + config.ZOMBIE_DETECTION_RADIUS + 50)
+    assert near.attack_cooldown == 0
+    pygame.quit()
+
+def test_store_integrates_knockback():
+    """Test that accumulated knockback is paid out as displacement"""
+    pygame.init()
+    player = Player(0, 0)
+    zombie = Zombie(1000, 1000)  # Outside detection range, so only knockback moves it
+    store = EntityStore()
+    store.add(zombie)
+    zombie.take_damage(1, 40, 0)
+    
+    for _ in range(60):
+        store.update(1 / 60, pygame.sprite.Group(), None, player)
+    
+    assert zombie.rect.centerx == pytest.approx(1040, abs=1)
+    assert abs(zombie.knockback_dx) < 1
+    pygame.quit()
+
+def test_store_respects_buildings():
+    """Test that store movement is blocked by buildings like Entity.move"""
+    pygame.init()
+    building = Building(200, 0, 100, 400)
+    player = Player(400, 100)
+    zombie = Zombie(150, 100)
+    sprites = pygame.sprite.Group(building, player, zombie)
+    store = EntityStore()
+    store.add(zombie)
+    
+    for _ in range(60):
+        store.update(1 / 60, sprites, None, player)
+    
+    assert zombie.rect.right <= building.rect.left + 2
+    
+    # A mob chasing diagonally into the wall slides along it, and the store follows
+    player.rect.center = (330, 250)
+    for _ in range(30):
+        store.update(1 / 60, sprites, None, player)
+    assert zombie.rect.centery > 110
+    assert tuple(store.pos[zombie.store_index]) == zombie.rect.center
+    pygame.quit()
+
+def test_play_state_with_entity_store(game, monkeypatch):
+    """Test that PlayState runs its mobs through the store when enabled"""
+    monkeypatch.setattr(config, 'USE_ENTITY_STORE', True)
+    play_state = PlayState(game)
+    assert play_state.entity_store is not None
+    assert len(play_state.entity_store) == len(play_state.npcs) + sum(
+        isinstance(sprite, Zombie) for sprite in play_state.all_sprites)
+    
+    for _ in range(30):
+        play_state.update(1 / 60)
+    play_state.draw(game.screen)
+
+def test_store_kernel_follows_flow_field():
+    """Test that zombies in the store steer along the flow field and NPCs do not"""
+    pygame.init()
+    grid = SpatialGrid(config.BUILDING_GRID_CELL_SIZE)
+    grid.insert(Building(350, 220, 60, 160))
+    player = Player(480, 300)
+    zombie = Zombie(280, 300)
+    store = EntityStore()
+    store.add(zombie)
+    field = FlowField()
+    field.update(player, grid)
+    
+    store.step(0.1, *player.rect.center, flow_field=field)
+    expected = field.direction(*zombie.rect.center)
+    assert expected is not None and expected != (1.0, 0.0)
+    assert tuple(store.vel[zombie.store_index] / config.ZOMBIE_SPEED) == pytest.approx(expected)
+    pygame.quit()
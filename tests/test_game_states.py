@@ -52,4 +52,21 @@ def test_state_event_handling(game, mock_event):
     
     # Test pause state event handling
     pause_state = game.states['pause']
-    pause_state.handle_event(mock_event) 
\ No newline at end of file
+    pause_state.handle_event(mock_event)
+
+
+def test_states_are_built_lazily(game):
+    """Test that only the menu exists at startup and the next game is prepared in the background"""
+    assert set(dict(game.states)) == {'menu'}
+    assert 'play' in game.states and 'pause' in game.states
+    prepared = game.next_play.result()
+    
+    # Looking up the play state hands over the prepared game instead of building one
+    assert game.states['play'] is prepared
+    assert game.next_play is None
+    
+    # Returning to the menu starts preparing the next one
+    game.change_state('menu')
+    assert game.next_play is not None
+    game.new_play_state()
+    assert game.states['play'] is not prepared
@@ -0,0 +1,46 @@
+import pytest
+import pygame
+from main import Game, parse_args
+from states.game_state import PlayState
+from utils.input_handler import ScriptedInputHandler, ScriptedKeys, wander_script
+
+def test_scripted_keys():
+    """Test that scripted key state behaves like pygame.key.get_pressed()"""
+    keys = ScriptedKeys([pygame.K_d, pygame.K_SPACE])
+    assert keys[pygame.K_d] == 1
+    assert keys[pygame.K_SPACE] == 1
+    assert keys[pygame.K_a] == 0
+    assert keys[pygame.K_UP] == 0
+
+def test_wander_script_is_deterministic():
+    """Test that the same seed replays the same inputs"""
+    first = wander_script(seed=7)
+    second = wander_script(seed=7)
+    assert [first(frame) for frame in range(300)] == [second(frame) for frame in range(300)]
+    assert pygame.K_SPACE in first(0)
+
+def test_headless_run_moves_player():
+    """Test that a headless run simulates PlayState with scripted input and no drawing"""
+    game = Game(headless=True, script=lambda frame: (pygame.K_d,))
+    try:
+        assert isinstance(game.input_handler, ScriptedInputHandler)
+        start_x = game.states['play'].player.rect.centerx
+        
+        stats = game.run_headless(10, dt=1 / 60, draw=False)
+        
+        assert stats['frames'] == 10
+        assert stats['fps'] > 0
+        assert isinstance(game.current_state, PlayState)
+        assert game.current_state.player.rect.centerx > start_x
+    finally:
+        # Shuts down the world-builder and preloader threads and the asset archive
+        game.close()
+
+def test_headless_cli_options():
+    """Test parsing of the headless command line"""
+    args = parse_args(['--headless', '--frames', '120', '--seed', '3', '--no-draw'])
+    assert args.headless
+    assert args.frames == 120
+    assert args.seed == 3
+    assert args.no_draw
+    assert parse_args([]).headless is False
@@ -0,0 +1,61 @@
+import numpy as np
+import pygame
+from utils.occupancy import OccupancyMap
+
+def test_occupancy_tracks_added_and_removed_rects():
+    """Test that cells around a rect are blocked until it is removed"""
+    occupancy = OccupancyMap(cell_size=8, tile_cells=16, clearance=25)
+    first = pygame.Rect(100, 100, 200, 150)
+    # Spans several tiles, including negative ones
+    second = pygame.Rect(-300, -50, 400, 120)
+    occupancy.add(first)
+    occupancy.add(second)
+    
+    points = np.array([[200, 175], [80, 90], [300 + 24, 175], [300 + 33, 175], [-100, 0], [0, 500]])
+    assert occupancy.free(points).tolist() == [False, False, False, True, False, True]
+    
+    occupancy.remove(second)
+    assert occupancy.is_free(-100, 0)
+    assert not occupancy.is_free(200, 175)
+    occupancy.remove(first)
+    assert occupancy.tiles == {}
+
+def test_free_points_are_clear_of_rects():
+    """Test that every point reported free keeps the clearance from every rect"""
+    occupancy = OccupancyMap(clearance=25)
+    rng = np.random.default_rng(0)
+    rects = [pygame.Rect(int(x), int(y), 120, 90) for x, y in rng.uniform(-1000, 1000, (40, 2))]
+    for rect in rects:
+        occupancy.add(rect)
+    points = rng.uniform(-1200, 1200, (5000, 2))
+    for x, y in points[occupancy.free(points)].tolist():
+        spot = pygame.Rect(0, 0, 50, 50)
+        spot.center = (round(x), round(y))
+        assert spot.collidelist(rects) == -1
+
+def test_sample_annulus_returns_a_full_wave():
+    """Test that a thousand spawn points come back in one call, all free and in the annulus"""
+    occupancy = OccupancyMap()
+    for i in range(-5, 6):
+        for j in range(-5, 6):
+            if i or j:
+                occupancy.add(pygame.Rect(i * 150, j * 150, 80, 80))
+    points = occupancy.sample_annulus((0, 0), 300, 500, 1000, np.random.default_rng(1))
+    assert points.shape == (1000, 2)
+    assert occupancy.free(points).all()
+    distances = np.hypot(points[:, 0], points[:, 1])
+    assert (distances >= 300).all() and (distances <= 500).all()
+
+def test_spawn_positions_avoid_buildings(game):
+    """Test that PlayState spawns waves clear of the loaded buildings"""
+    from states.game_state import PlayState
+    state = PlayState(game, seed=4)
+    zombies = state.spawn_zombies(200)
+    assert len(zombies) == 200
+    center = pygame.math.Vector2(state.player.rect.center)
+    for zombie in zombies:
+        assert 299 <= center.distance_to(zombie.rect.center) <= 501
+        spot = pygame.Rect(0, 0, 50, 50)
+        spot.center = zombie.rect.center
+        assert all(not building.rect.colliderect(spot) for building in state.building_grid.query(spot))
+    assert state.get_random_spawn_position() is not None
@@ -0,0 +1,93 @@
+import math
+import random
+import numpy as np
+import pygame
+import config
+from utils.pathfinding import FlowField
+from utils.spatial import SpatialGrid
+from utils.entities import Building, Player, Zombie
+
+def make_wall():
+    """Return a grid holding one wall between x=350 and x=410"""
+    random.seed(0)
+    grid = SpatialGrid(config.BUILDING_GRID_CELL_SIZE)
+    wall = Building(350, 220, 60, 160)
+    grid.insert(wall)
+    return grid, wall
+
+def chase(zombie, player, grid, flow_field, frames=300):
+    """Run a zombie toward the player and return the final distance"""
+    sprites = pygame.sprite.Group()
+    for _ in range(frames):
+        if flow_field is not None:
+            flow_field.update(player, grid)
+        zombie.update(1 / 60, player, sprites, grid, flow_field)
+    return zombie.get_distance_to(player)
+
+def test_flow_field_points_at_target_in_open_space():
+    """Test that with no obstacles every direction heads toward the target"""
+    pygame.init()
+    player = Player(500, 500)
+    field = FlowField()
+    field.update(player, SpatialGrid())
+    for x, y in [(100, 500), (500, 150), (800, 800), (300, 700)]:
+        fx, fy = field.direction(x, y)
+        assert math.isclose(math.hypot(fx, fy), 1.0)
+        assert fx * (500 - x) + fy * (500 - y) > 0
+    
+    # Next to the target there is no field direction, mobs steer straight in
+    assert field.direction(510, 510) is None
+    pygame.quit()
+
+def test_flow_field_routes_around_buildings():
+    """Test that a zombie behind a wall reaches the player only with the flow field"""
+    pygame.init()
+    grid, wall = make_wall()
+    player = Player(480, 300)
+    
+    stuck = Zombie(280, 300)
+    assert chase(stuck, player, grid, None) > 150
+    
+    field = FlowField()
+    pathing = Zombie(280, 300)
+    assert chase(pathing, player, grid, field) < 60
+    
+    # No point on the way was inside the wall
+    assert not wall.rect.colliderect(pathing.rect)
+    pygame.quit()
+
+def test_flow_field_rebuilds_only_on_cell_change():
+    """Test that the BFS only reruns when the target enters a new cell"""
+    pygame.init()
+    grid, _ = make_wall()
+    player = Player(480, 300)
+    field = FlowField()
+    assert field.update(player, grid)
+    assert not field.update(player, grid)
+    
+    player.rect.x += 1
+    field.update(player, grid)
+    player.rect.x += config.FLOW_CELL_SIZE
+    field.update(player, grid)
+    assert field.rebuilds == 2
+    
+    field.invalidate()
+    assert field.update(player, grid)
+    pygame.quit()
+
+def test_flow_field_batch_lookup_matches_single_lookup():
+    """Test that lookup() gives the same directions as direction() for each point"""
+    pygame.init()
+    grid, _ = make_wall()
+    player = Player(480, 300)
+    field = FlowField()
+    field.update(player, grid)
+    
+    points = np.array([(280, 300), (300, 100), (490, 310), (5000, 5000), (380, 300)], dtype=np.float64)
+    directions, valid = field.lookup(points)
+    for (x, y), direction, ok in zip(points, directions, valid):
+        expected = field.direction(x, y)
+        assert ok == (expected is not None)
+        if ok:
+            assert tuple(direction) == expected
+    pygame.quit()
@@ -0,0 +1,35 @@
+import math
+import random
+import pygame
+from utils.placement import place_buildings
+
+def test_placement_is_deterministic():
+    """Test that the same seed places the same buildings"""
+    area = pygame.Rect(0, 0, 4000, 4000)
+    first = place_buildings(random.Random(5), area, 40)
+    second = place_buildings(random.Random(5), area, 40)
+    assert first == second
+    assert first != place_buildings(random.Random(6), area, 40)
+
+def test_placement_honors_padding_and_keep_out():
+    """Test that buildings stay inside the padded area, apart, and clear of the keep-out circle"""
+    area = pygame.Rect(-3000, 1000, 6000, 6000)
+    spawn = (0, 4000)
+    rects = place_buildings(random.Random(1), area, 300, padding=50, keep_out=(spawn, 400))
+    inner = area.inflate(-100, -100)
+    for i, rect in enumerate(rects):
+        assert inner.contains(rect)
+        assert math.hypot(rect.centerx - spawn[0], rect.centery - spawn[1]) >= 400
+        others = [other.inflate(50, 50) for other in rects[i + 1:]]
+        assert rect.collidelist(others) == -1
+
+def test_placement_scales_to_thousands():
+    """Test that a large map gets every building it asks for"""
+    rects = place_buildings(random.Random(2), pygame.Rect(0, 0, 30000, 30000), 3000)
+    assert len(rects) == 3000
+
+def test_full_area_returns_fewer():
+    """Test that an area too small for the count returns what fits instead of overlapping"""
+    rects = place_buildings(random.Random(3), pygame.Rect(0, 0, 500, 500), 50)
+    assert 0 < len(rects) < 50
+    assert place_buildings(random.Random(3), pygame.Rect(0, 0, 150, 150), 5) == []
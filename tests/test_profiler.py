@@ -0,0 +1,67 @@
+import json
+import pytest
+import pygame
+from utils.profiler import FrameProfiler
+
+def test_disabled_profiler_records_nothing():
+    """Test that a disabled profiler hands out a no-op section and keeps no frames"""
+    profiler = FrameProfiler(enabled=False)
+    profiler.begin_frame()
+    with profiler.section('update'):
+        pass
+    profiler.end_frame()
+    assert len(profiler.frames) == 0
+    assert profiler.section('a') is profiler.section('b')
+
+def test_profiler_ring_buffer_and_nesting():
+    """Test that frames are kept in a bounded ring buffer with nested sections"""
+    profiler = FrameProfiler(enabled=True, capacity=3)
+    for _ in range(5):
+        profiler.begin_frame()
+        with profiler.section('update'):
+            with profiler.section('ai'):
+                pass
+        profiler.end_frame()
+    
+    assert len(profiler.frames) == 3
+    _, _, events = profiler.frames[-1]
+    assert [(name, depth) for name, _, _, depth in events] == [('ai', 1), ('update', 0)]
+    assert set(profiler.phase_averages()) == {'update', 'ai'}
+    assert all(millis >= 0 for millis in profiler.frame_times())
+
+def test_chrome_trace_export(tmp_path):
+    """Test that the Chrome trace has a complete event per frame and per section"""
+    profiler = FrameProfiler(enabled=True)
+    profiler.begin_frame()
+    with profiler.section('draw'):
+        pass
+    profiler.end_frame()
+    
+    path = tmp_path / 'trace.json'
+    profiler.dump_chrome_trace(str(path))
+    trace = json.loads(path.read_text())
+    names = [event['name'] for event in trace['traceEvents']]
+    assert names == ['frame', 'draw']
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in trace['traceEvents'])
+
+def test_game_profiles_play_state_phases(game):
+    """Test that enabling the profiler times game phases and PlayState subsystems"""
+    game.profiler.enabled = True
+    game.profiler.show_graph = True
+    game.change_state('play')
+    for _ in range(3):
+        game.step(1 / 60)
+    
+    phases = game.profiler.phase_averages()
+    for name in ('input', 'events', 'update', 'draw', 'flip', 'player', 'shockwaves', 'ai', 'camera'):
+        assert name in phases
+
+def test_startup_time_is_reported(game):
+    """Test that the first frame records the time to first frame, even with profiling off"""
+    assert game.profiler.startup_ms is None
+    game.step(1 / 60)
+    assert game.profiler.startup_ms > 0
+    assert 'first frame after' in game.profiler.startup_report()
+    assert 'OVER' in game.profiler.startup_report(budget=0)
+    names = [event['name'] for event in game.profiler.to_chrome_trace()['traceEvents']]
+    assert names[0] == 'startup'
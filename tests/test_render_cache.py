@@ -0,0 +1,88 @@
+import pytest
+import pygame
+import config
+from utils.render_cache import (HealthBarAtlas, ShockwaveFrames, EntityImages, health_bars,
+                                shockwave_frames, entity_images)
+from utils.entities import Zombie, Player, NPC, Shockwave
+
+def test_health_bar_levels():
+    """Test health quantization keeps living entities visible and dead ones empty"""
+    atlas = HealthBarAtlas(levels=10)
+    assert atlas.level_for(100, 100) == 10
+    assert atlas.level_for(50, 100) == 5
+    assert atlas.level_for(1, 100) == 1
+    assert atlas.level_for(0, 100) == 0
+    assert atlas.level_for(-5, 100) == 0
+
+def test_health_bar_atlas_shares_surfaces():
+    """Test that bars are built once per width and are views into one atlas"""
+    pygame.init()
+    atlas = HealthBarAtlas(levels=4, height=5)
+    full = atlas.get(40, 4)
+    assert atlas.get(40, 4) is full
+    assert full.get_size() == (40, 5)
+    assert full.get_parent() is atlas.atlases[40]
+    
+    # Full bar is all green, empty bar is all red
+    assert full.get_at((39, 2))[:3] == config.GREEN
+    assert atlas.get(40, 0).get_at((0, 2))[:3] == config.RED
+    half = atlas.get(40, 2)
+    assert half.get_at((10, 2))[:3] == config.GREEN
+    assert half.get_at((30, 2))[:3] == config.RED
+    pygame.quit()
+
+def test_entity_bar_updates_on_damage():
+    """Test that take_damage swaps the entity's bar to the matching level"""
+    pygame.init()
+    zombie = Zombie(100, 100)
+    width = zombie.rect.width
+    assert zombie.health_bar is health_bars.get(width, health_bars.levels)
+    
+    zombie.take_damage(zombie.max_health // 2)
+    assert zombie.health_bar is health_bars.bar_for(width, zombie.health, zombie.max_health)
+    
+    zombie.take_damage(zombie.max_health)
+    assert zombie.health_bar is health_bars.get(width, 0)
+    pygame.quit()
+
+def test_shockwave_frames_are_shared():
+    """Test that shockwaves reuse cached frames instead of drawing their own"""
+    pygame.init()
+    frames = ShockwaveFrames(min_radius=10, max_radius=100, step=5)
+    assert frames.quantize(3) == 10
+    assert frames.quantize(12) == 10
+    assert frames.quantize(13) == 15
+    assert frames.quantize(500) == 100
+    assert frames.get(50) is frames.get(51)
+    assert frames.get(50).get_size() == (100, 100)
+    
+    first = Shockwave(200, 200)
+    second = Shockwave(400, 400)
+    assert first.image is second.image
+    first.update(0.1)
+    second.update(0.1)
+    assert first.image is second.image
+    assert first.image is shockwave_frames.get(first.radius)
+    assert first.rect.center == (200, 200)
+    assert first.rect.size == first.image.get_size()
+    pygame.quit()
+
+def test_entities_share_images():
+    """Test that identical entities share one surface and state changes swap it"""
+    pygame.init()
+    first = Zombie(0, 0)
+    second = Zombie(100, 100)
+    assert first.image is second.image
+    assert first.rect.size == first.image.get_size()
+    
+    first.take_damage(first.max_health)
+    assert first.image is entity_images.get(first.radius, first.color, EntityImages.DEAD)
+    assert second.image is entity_images.get(second.radius, second.color, EntityImages.ALIVE)
+    
+    npc = NPC(0, 0)
+    npc.is_hostile = True
+    npc.reveal(Player(0, 0))
+    revealed = entity_images.get(npc.radius, npc.color, EntityImages.REVEALED_HOSTILE)
+    assert npc.image is revealed
+    assert revealed.get_at((npc.radius, npc.radius))[:3] == config.YELLOW
+    pygame.quit()
@@ -0,0 +1,115 @@
+import pygame
+import config
+from utils.render_layers import BackgroundLayer, DirtyRectTracker
+from utils.entities import Building
+from states.game_state import PlayState
+
+def test_background_matches_direct_blits(mock_screen):
+    """Test that drawing the tiles produces the same pixels as blitting each building"""
+    layer = BackgroundLayer(tile_size=64)
+    buildings = [Building(30, 40, 120, 90), Building(300, 200, 80, 150)]
+    for building in buildings:
+        layer.add(building)
+    
+    expected = pygame.Surface(mock_screen.get_size())
+    expected.fill(config.BLACK)
+    for building in buildings:
+        expected.blit(building.image, (building.rect.x - 10, building.rect.y - 20))
+    
+    layer.draw(mock_screen, 10, 20)
+    for point in [(25, 25), (100, 60), (5, 5), (300, 250), (380, 300), (600, 400)]:
+        assert mock_screen.get_at(point) == expected.get_at(point)
+
+class PairsOnlySurface(pygame.Surface):
+    """Screen whose fblits, like pygame-ce's, only takes (source, dest) pairs"""
+    
+    def fblits(self, batch):
+        for item in batch:
+            assert len(item) == 2
+            self.blit(*item)
+
+def test_background_partial_tiles_draw_with_fblits(mock_screen):
+    """Test that tiles cut by the draw area still draw when the screen has a pairs-only fblits"""
+    layer = BackgroundLayer(tile_size=64)
+    layer.add(Building(30, 40, 120, 90))
+    screen = PairsOnlySurface(mock_screen.get_size())
+    layer.draw(screen, 10, 20, pygame.Rect(5, 5, 100, 100))
+    assert screen.get_at((50, 50))[:3] == config.BROWN
+
+def test_background_tiles_are_cached_and_invalidated(mock_screen):
+    """Test that tiles are built once, empty tiles cost nothing and adds rebuild tiles"""
+    layer = BackgroundLayer(tile_size=128, max_tiles=1000)
+    layer.add(Building(10, 10, 100, 100))
+    layer.draw(mock_screen, 0, 0)
+    assert layer.tiles_built == 1
+    assert sum(tile is not None for tile in layer.tiles.values()) == 1
+    
+    layer.draw(mock_screen, 0, 0)
+    assert layer.tiles_built == 1
+    
+    # A new building only rebuilds the tile it lands on
+    building = Building(300, 10, 100, 100)
+    layer.add(building)
+    layer.draw(mock_screen, 0, 0)
+    assert layer.tiles_built == 3
+    
+    layer.remove(building)
+    layer.draw(mock_screen, 0, 0)
+    assert mock_screen.get_at((350, 50))[:3] == config.BLACK
+
+def test_background_evicts_least_recently_used(mock_screen):
+    """Test that the tile cache never grows past max_tiles"""
+    layer = BackgroundLayer(tile_size=64, max_tiles=8)
+    layer.draw(mock_screen, 0, 0)
+    assert len(layer.tiles) == 8
+
+def test_dirty_rect_tracker():
+    """Test that a still camera restores last frame's rects and a moving one redraws everything"""
+    tracker = DirtyRectTracker()
+    first = [pygame.Rect(0, 0, 10, 10)]
+    assert tracker.regions_to_restore((0, 0)) is None
+    assert tracker.finish_frame((0, 0), first, None) is None
+    
+    restored = tracker.regions_to_restore((0, 0))
+    assert restored == first
+    second = [pygame.Rect(5, 5, 10, 10)]
+    assert tracker.finish_frame((0, 0), second, restored) == first + second
+    
+    assert tracker.regions_to_restore((1, 0)) is None
+    tracker.invalidate()
+    assert tracker.regions_to_restore((0, 0)) is None
+
+def test_play_state_dirty_rects(game, monkeypatch):
+    """Test that PlayState only reports dirty rects while the camera holds still"""
+    monkeypatch.setattr(config, 'DIRTY_RECTS', True)
+    game.change_state('play')
+    state = game.current_state
+    game.step(1 / config.FPS)
+    assert state.dirty_rects is None
+    
+    # Nothing moves between these frames, so only sprite and HUD regions are pushed
+    game.step(1 / config.FPS)
+    assert state.dirty_rects is not None
+    assert pygame.Rect(config.HUD_RECT) in state.dirty_rects
+    
+    game.change_state('pause')
+    game.change_state('play')
+    assert state.dirty_rects is None
+
+def test_hiding_profiler_graph_repaints_screen(game, monkeypatch):
+    """Test that toggling the profiler graph off forces a full redraw instead of leaving it frozen"""
+    monkeypatch.setattr(config, 'DIRTY_RECTS', True)
+    game.profiler.enabled = True
+    game.profiler.show_graph = True
+    game.change_state('play')
+    state = game.current_state
+    for _ in range(2):
+        game.step(1 / config.FPS)
+    
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3))
+    game.step(1 / config.FPS)
+    assert not game.profiler.show_graph
+    assert state.dirty_rects is None
+    
+    game.step(1 / config.FPS)
+    assert state.dirty_rects is not None
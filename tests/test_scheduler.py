@@ -0,0 +1,93 @@
+import pytest
+import pygame
+import config
+from utils.scheduler import UpdateScheduler
+from utils.spatial import SpatialHash
+from utils.entities import Zombie, NPC
+
+def make_scheduler(*positions, interval=4):
+    """Return a scheduler over zombies at the given positions, and the zombies"""
+    index = SpatialHash(config.ENTITY_GRID_CELL_SIZE)
+    zombies = [Zombie(x, y) for x, y in positions]
+    for zombie in zombies:
+        index.insert(zombie)
+    scheduler = UpdateScheduler(index, active_radius=300, low_radius=1000, low_interval=interval)
+    return scheduler, zombies
+
+def test_scheduler_buckets_by_distance():
+    """Test that near mobs are active, mid-range mobs low rate and far or dead mobs idle"""
+    pygame.init()
+    scheduler, (near, mid, far, dead) = make_scheduler((100, 0), (800, 0), (5000, 0), (50, 0))
+    dead.take_damage(dead.max_health)
+    
+    due = dict(scheduler.schedule(0.01, 0, 0))
+    assert near in due and far not in due and dead not in due
+    assert scheduler.counts == {'active': 1, 'low': 1, 'idle': 2}
+    pygame.quit()
+
+def test_low_bucket_is_staggered_with_accumulated_dt():
+    """Test that low-rate mobs update once every interval with the elapsed time"""
+    pygame.init()
+    scheduler, zombies = make_scheduler(*[(500 + i, 0) for i in range(8)], interval=4)
+    seen = {}
+    for frame in range(8):
+        for zombie, dt in scheduler.schedule(0.01, 0, 0):
+            seen.setdefault(zombie, []).append((frame, dt))
+    
+    # Every mob ran twice, four frames apart, and each frame ran two mobs
+    assert set(seen) == set(zombies)
+    for runs in seen.values():
+        assert len(runs) == 2
+        assert runs[1][0] - runs[0][0] == 4
+        assert runs[1][1] == pytest.approx(0.04)
+    frames = [frame for runs in seen.values() for frame, _ in runs]
+    assert all(frames.count(frame) == 2 for frame in range(8))
+    pygame.quit()
+
+def test_mobs_wake_when_player_approaches():
+    """Test that an idle mob becomes active as soon as the player is in range, with capped dt"""
+    pygame.init()
+    scheduler, (zombie,) = make_scheduler((5000, 0))
+    for _ in range(100):
+        assert scheduler.schedule(0.01, 0, 0) == []
+    
+    due = scheduler.schedule(0.01, 4900, 0)
+    assert [entity for entity, _ in due] == [zombie]
+    assert due[0][1] <= scheduler.max_dt
+    pygame.quit()
+
+def test_play_state_uses_scheduler(game):
+    """Test that PlayState only updates mobs near the player"""
+    game.change_state('play')
+    state = game.current_state
+    far = Zombie(state.player.rect.centerx + 3000, state.player.rect.centery)
+    state.add_entity(far)
+    state.world = None
+    state.update(1 / 60)
+    assert state.scheduler.counts['idle'] >= 1
+    assert state.scheduler.counts['active'] + state.scheduler.counts['low'] + \
+        state.scheduler.counts['idle'] == len(state.entity_index)
+
+def test_followers_keep_up_after_player_teleports(game):
+    """Test that followers and revealed hostile NPCs keep updating however far away the player is"""
+    game.change_state('play')
+    state = game.current_state
+    state.world = None
+    state.building_grid.clear()
+    x, y = state.player.rect.center
+    follower = NPC(x + 50, y)
+    follower.is_hostile = False
+    chaser = NPC(x - 50, y)
+    chaser.is_hostile = True
+    for npc in (follower, chaser):
+        state.add_entity(npc)
+        npc.reveal(state.player)
+    
+    state.player.rect.center = (x + 1500, y + 1500)
+    start = [npc.rect.center for npc in (follower, chaser)]
+    for _ in range(10):
+        state.update(1 / 60)
+    for npc, (sx, sy) in zip((follower, chaser), start):
+        assert state.player.get_distance_to(npc) < ((state.player.rect.centerx - sx) ** 2 +
+                                                     (state.player.rect.centery - sy) ** 2) ** 0.5
+    assert state.scheduler.counts['active'] >= 2
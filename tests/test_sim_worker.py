@@ -0,0 +1,75 @@
+import time
+import numpy as np
+import pygame
+import config
+from main import Game
+from states.game_state import PlayState, RemotePlayState
+from utils import sim_worker
+from utils.sim_worker import SnapshotBuffer, take_snapshot
+
+def test_snapshot_buffer_round_trip():
+    """Test that a snapshot published through one handle is read back through another"""
+    writer = SnapshotBuffer(capacity=8)
+    reader = SnapshotBuffer(capacity=8, name=writer.name)
+    assert reader.read() is None
+    
+    header = np.zeros(sim_worker.HEADER_FIELDS)
+    header[sim_worker.FRAME] = 7
+    records = np.arange(3 * sim_worker.RECORD_FIELDS, dtype=np.float64).reshape(3, -1)
+    writer.publish(header, records)
+    
+    read_header, read_records = reader.read()
+    assert read_header[sim_worker.FRAME] == 7
+    assert read_header[sim_worker.COUNT] == 3
+    assert np.array_equal(read_records, records)
+    
+    # The next frame goes to the other buffer, and a half-written snapshot is never returned
+    writer.publish(header, records[:1])
+    assert len(reader.read()[1]) == 1
+    published = int(writer.control[sim_worker.PUBLISHED])
+    writer.headers[published][sim_worker.SEQUENCE] += 1
+    assert reader.read() is None
+    
+    reader.close()
+    writer.close()
+
+def test_take_snapshot(game):
+    """Test that snapshots hold every loaded building, then the player and visible sprites"""
+    state = PlayState(game, seed=11)
+    state.camera.follow(state.player)
+    header, records = take_snapshot(state, frame=3, generation=2)
+    buildings = int(header[sim_worker.BUILDINGS])
+    assert buildings == len(state.buildings)
+    assert (records[:buildings, 0] == sim_worker.KIND_BUILDING).all()
+    
+    player = records[buildings]
+    assert player[0] == sim_worker.KIND_PLAYER
+    assert tuple(player[1:3]) == state.player.rect.topleft
+    assert header[sim_worker.HEALTH] == state.player.health
+    assert header[sim_worker.GENERATION] == 2
+
+def test_remote_play_state_runs_worker():
+    """Test that the worker simulates the game and the main process draws its snapshots"""
+    game = Game(headless=True, script=lambda frame: (pygame.K_d,), worker=True)
+    try:
+        game.change_state('play')
+        state = game.current_state
+        assert isinstance(state, RemotePlayState)
+        
+        deadline = time.time() + 30
+        while state.snapshot is None and time.time() < deadline:
+            game.step(1 / config.FPS)
+            time.sleep(0.01)
+        assert state.snapshot is not None
+        start = state.snapshot[0][sim_worker.OFFSET_X]
+        
+        deadline = time.time() + 10
+        while state.snapshot[0][sim_worker.OFFSET_X] <= start and time.time() < deadline:
+            game.step(1 / config.FPS)
+            time.sleep(0.01)
+        assert state.snapshot[0][sim_worker.OFFSET_X] > start
+        
+        process = state.client.process
+    finally:
+        game.close()
+    assert not process.is_alive()
@@ -0,0 +1,186 @@
+import pytest
+import pygame
+import config
+from utils.spatial import SpatialGrid, SpatialHash
+from utils.entities import Building, Entity, Zombie, NPC, Player
+
+def test_spatial_grid_query():
+    """Test that grid queries only return items in overlapping cells"""
+    grid = SpatialGrid(cell_size=100)
+    near = Building(0, 0, 150, 150)
+    far = Building(1000, 1000, 150, 150)
+    grid.insert(near)
+    grid.insert(far)
+    assert len(grid) == 2
+    
+    # A rect near the origin only sees the near building
+    assert grid.query(pygame.Rect(120, 120, 50, 50)) == [near]
+    
+    # A rect spanning several cells returns each building once
+    result = grid.query(pygame.Rect(0, 0, 1200, 1200))
+    assert sorted(result, key=id) == sorted([near, far], key=id)
+    
+    # Empty space returns nothing
+    assert grid.query(pygame.Rect(500, 500, 10, 10)) == []
+    
+    grid.clear()
+    assert len(grid) == 0
+    assert grid.query(pygame.Rect(0, 0, 1200, 1200)) == []
+
+def test_move_with_grid_matches_full_scan():
+    """Test that grid-backed movement gives the same result as a full scan"""
+    pygame.init()
+    building = Building(200, 200, 200, 200)
+    sprites = pygame.sprite.Group(building)
+    grid = SpatialGrid(cell_size=64)
+    grid.insert(building)
+    
+    for dx, dy in [(5, 0), (60, 60), (-5, 0)]:
+        scan = Zombie(160, 160)
+        indexed = Zombie(160, 160)
+        sprites.add(scan, indexed)
+        assert scan.move(dx, dy, sprites) == indexed.move(dx, dy, sprites, grid)
+        assert scan.rect.topleft == indexed.rect.topleft
+        sprites.remove(scan, indexed)
+    
+    pygame.quit()
+
+def test_grid_candidates_stay_flat():
+    """Test that the number of buildings checked per move does not grow with building count"""
+    pygame.init()
+    probe = pygame.Rect(0, 0, 50, 50)
+    candidate_counts = []
+    for count in (10, 100, 1000):
+        grid = SpatialGrid(cell_size=128)
+        # Lay buildings out on a lattice so density is constant as the world grows
+        columns = int(count ** 0.5) + 1
+        for i in range(count):
+            grid.insert(Building((i % columns) * 400, (i // columns) * 400, 150, 150))
+        probe.center = (200, 200)
+        candidate_counts.append(len(grid.query(probe)))
+    
+    assert max(candidate_counts) == min(candidate_counts)
+    pygame.quit()
+
+def test_spatial_hash_nearest():
+    """Test nearest and radius queries on the dynamic hash"""
+    index = SpatialHash(cell_size=100)
+    index.insert('a', 10, 10)
+    index.insert('b', 60, 10)
+    index.insert('c', 500, 500)
+    assert len(index) == 3
+    
+    assert index.nearest(50, 10, 100) == 'b'
+    assert index.nearest(50, 10, 100, exclude='b') == 'a'
+    assert index.nearest(300, 300, 100) is None
+    assert sorted(index.query_radius(0, 0, 100)) == ['a', 'b']
+    
+    index.clear()
+    assert index.nearest(50, 10, 100) is None
+
+def test_follower_attacks_nearest_hostile():
+    """Test that a following NPC attacks the closest living hostile through the index"""
+    pygame.init()
+    follower = NPC(0, 0)
+    follower.is_hostile = False
+    follower.revealed = True
+    follower.following_player = True
+    player = Player(50, 0)
+    near = Zombie(60, 0)
+    far = Zombie(90, 0)
+    dead = Zombie(10, 0)
+    dead.is_dead = True
+    sprites = pygame.sprite.Group(follower, player, near, far, dead)
+    
+    index = SpatialHash(config.HOSTILE_GRID_CELL_SIZE)
+    index.rebuild(z for z in (near, far, dead) if not z.is_dead)
+    assert follower.find_target(sprites, index) is near
+    assert follower.find_target(sprites) is near
+    
+    follower.update(0.016, player, sprites, None, index)
+    assert near.health < near.max_health
+    assert far.health == far.max_health
+    assert follower.attack_cooldown > 0
+    
+    pygame.quit()
+
+def test_spatial_hash_incremental_move():
+    """Test that moving items re-buckets them and rect queries see the new position"""
+    index = SpatialHash(cell_size=100)
+    index.insert('a', 10, 10)
+    index.insert('b', 150, 10)
+    assert index.query_rect(pygame.Rect(0, 0, 50, 50)) == ['a']
+    
+    index.move('a', 450, 450)
+    assert index.query_rect(pygame.Rect(0, 0, 50, 50)) == []
+    assert index.query_rect(pygame.Rect(400, 400, 100, 100)) == ['a']
+    assert index.query_rect(pygame.Rect(0, 0, 50, 50), margin=110) == ['b']
+    
+    index.remove('a')
+    index.remove('a')  # Removing twice is harmless
+    assert len(index) == 1
+
+def test_moving_entity_updates_its_index():
+    """Test that Entity.move keeps an attached spatial index current"""
+    pygame.init()
+    index = SpatialHash(cell_size=64)
+    zombie = Zombie(30, 30)
+    index.insert(zombie)
+    zombie.spatial_index = index
+    
+    zombie.move(200, 0, pygame.sprite.Group())
+    assert index.query_rect(pygame.Rect(0, 0, 60, 60)) == []
+    assert index.query_rect(zombie.rect) == [zombie]
+    pygame.quit()
+
+def test_play_state_draws_only_visible_entities(game):
+    """Test that off-screen entities are culled from the draw list"""
+    play_state = game.states['play']
+    far = Zombie(100000, 100000)
+    play_state.add_entity(far)
+    play_state.camera.follow(play_state.player)
+    
+    visible = play_state.visible_entities(play_state.camera.viewport())
+    assert far not in visible
+    
+    far.move(play_state.player.rect.centerx - far.rect.centerx,
+             play_state.player.rect.centery - far.rect.centery, pygame.sprite.Group())
+    assert far in play_state.visible_entities(play_state.camera.viewport())
+    play_state.draw(game.screen)
+
+def test_move_catches_thin_overlaps_and_slides():
+    """Test that a building poking into an entity's side blocks it, and blocked moves slide"""
+    pygame.init()
+    building = Building(150, 200, 60, 60)
+    # Wall the door up so where it lands cannot open a gap
+    building.mask = pygame.mask.Mask(building.rect.size, fill=True)
+    sprites = pygame.sprite.Group(building)
+    
+    # Every corner of the entity's rect stays outside the building
+    entity = Entity(180, 150, 50, config.RED, 100)
+    assert entity.move(0, 20, sprites)
+    assert entity.rect.center == (180, 150)
+    
+    # Moving diagonally into the wall keeps the sideways part of the move
+    entity.rect.topleft = (170, 100)
+    assert entity.move(10, 10, sprites)
+    assert entity.rect.topleft == (180, 100)
+    pygame.quit()
+
+def test_move_passes_through_doors():
+    """Test that the door cut-out in a building's mask is open floor"""
+    pygame.init()
+    building = Building(0, 0, 200, 200)
+    sprites = pygame.sprite.Group(building)
+    door = pygame.Rect(building.door_pos, (building.door_width, building.door_height))
+    
+    entity = Entity(0, 0, 10, config.RED, 100)
+    entity.rect.center = (door.centerx - 1, door.centery - 1)
+    assert not entity.move(1, 1, sprites)
+    assert entity.rect.center == door.center
+    
+    # Anywhere else inside is wall
+    entity.rect.center = (100, 100)
+    assert entity.move(1, 0, sprites)
+    assert entity.rect.center == (100, 100)
+    pygame.quit()
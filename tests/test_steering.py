@@ -0,0 +1,109 @@
+import pytest
+import numpy as np
+import pygame
+import config
+from utils.steering import separation
+from utils.entities import Zombie
+from utils.entity_store import EntityStore
+
+def brute_force(positions, radius):
+    """Reference O(n^2) separation without a neighbor cap"""
+    push = np.zeros_like(positions)
+    for i, p in enumerate(positions):
+        for j, q in enumerate(positions):
+            distance = np.hypot(*(p - q))
+            if i != j and 0 < distance < radius:
+                push[i] += (p - q) / distance * (1 - distance / radius)
+    length = np.hypot(push[:, 0], push[:, 1])
+    return push / np.maximum(length, 1)[:, np.newaxis]
+
+def test_separation_matches_brute_force_when_uncapped():
+    """Test that the cell list finds the same neighbors as checking every pair"""
+    positions = np.random.default_rng(0).uniform(-300, 300, (200, 2))
+    result = separation(positions, radius=50, max_neighbors=200)
+    assert np.allclose(result, brute_force(positions, 50))
+    
+    # Only the candidates are steered
+    subset = separation(positions, radius=50, max_neighbors=200, candidates=[3, 7])
+    assert np.allclose(subset[[3, 7]], result[[3, 7]])
+    assert not subset[np.r_[0:3, 4:7, 8:200]].any()
+
+def test_separation_pushes_pairs_apart():
+    """Test that close pairs push in opposite directions, stacked ones split, far ones stay"""
+    positions = np.array([[0.0, 0.0], [10.0, 0.0], [500.0, 500.0], [900.0, 900.0], [900.0, 900.0]])
+    push = separation(positions, radius=50)
+    assert push[0, 0] < 0 < push[1, 0]
+    assert np.allclose(push[0], -push[1])
+    assert not push[2].any()
+    assert push[3].any() and np.allclose(push[3], -push[4])
+    assert (np.hypot(push[:, 0], push[:, 1]) <= 1 + 1e-9).all()
+
+def test_neighbor_cap_is_respected():
+    """Test that each agent counts no more than max_neighbors candidates, however dense the crowd"""
+    # Five neighbors in the agent's own cell, each pushing it +x with weight 1 - 43 / 50
+    positions = np.array([[45.0, 25.0]] + [[2.0, 25.0]] * 5)
+    weight = 1 - 43 / 50
+    assert separation(positions, radius=50, max_neighbors=10)[0, 0] == pytest.approx(5 * weight)
+    capped = separation(positions, radius=50, max_neighbors=3)[0]
+    assert 0 < capped[0] <= 3 * weight + 1e-9 and capped[1] == 0
+    
+    # A horde piled onto one spot still gets a finite, non-zero push for everyone
+    positions = np.random.default_rng(1).uniform(0, 5, (20000, 2))
+    push = separation(positions, radius=50, max_neighbors=8)
+    assert np.isfinite(push).all()
+    assert (np.hypot(push[:, 0], push[:, 1]) > 0).all()
+
+def test_store_horde_spreads_out(monkeypatch):
+    """Test that a stacked horde spreads out through the entity store kernel"""
+    pygame.init()
+    monkeypatch.setattr(config, 'USE_SEPARATION', True)
+    store = EntityStore()
+    zombies = [Zombie(1000 + i % 3, 1000 + i // 3) for i in range(30)]
+    sprites = pygame.sprite.Group(*zombies)
+    for zombie in zombies:
+        store.add(zombie)
+    
+    def spread():
+        centers = np.array([zombie.rect.center for zombie in zombies], dtype=np.float64)
+        return np.hypot(*(centers - centers.mean(axis=0)).T).mean()
+    
+    before = spread()
+    far_player = Zombie(100000, 100000)
+    for _ in range(60):
+        store.update(1 / 60, sprites, None, far_player)
+    assert spread() > before + 20
+    pygame.quit()
+
+def test_play_state_horde_does_not_stack(game):
+    """Test that zombies chasing the player through PlayState do not collapse into one blob"""
+    game.profiler.enabled = True
+    game.change_state('play')
+    state = game.states['play']
+    state.player.max_health = state.player.health = 10 ** 6
+    x, y = state.get_random_spawn_position(150, 200)
+    horde = [Zombie(int(x), int(y)) for _ in range(20)]
+    for zombie in horde:
+        state.add_entity(zombie)
+    for _ in range(30):
+        game.step(1 / 60)
+    assert len({zombie.rect.center for zombie in horde}) > 10
+    assert 'separation' in game.profiler.phase_averages()
+
+def test_play_state_separation_keeps_mob_speed(game):
+    """Test that the separation push never makes a per-sprite mob outrun its own speed"""
+    game.change_state('play')
+    state = game.states['play']
+    state.player.max_health = state.player.health = 10 ** 6
+    # Wall slides drop the blocked axis, so keep the horde in the open
+    state.building_grid.clear()
+    x, y = state.get_random_spawn_position(150, 200)
+    horde = [Zombie(int(x) + i % 2, int(y)) for i in range(20)]
+    for zombie in horde:
+        state.add_entity(zombie)
+    dt = 0.1
+    for _ in range(10):
+        before = [zombie.rect.center for zombie in horde]
+        state.update(dt)
+        for zombie, (bx, by) in zip(horde, before):
+            # Rects round each move to whole pixels
+            assert np.hypot(zombie.rect.centerx - bx, zombie.rect.centery - by) <= config.ZOMBIE_SPEED * dt + 1.5
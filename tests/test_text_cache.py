@@ -0,0 +1,59 @@
+import pytest
+import pygame
+from utils.asset_loader import AssetLoader
+from utils.text_cache import TextCache
+
+def test_asset_loader_creates_fonts_once():
+    """Test that get_font returns the same font object for the same file and size"""
+    pygame.init()
+    loader = AssetLoader()
+    assert loader.get_font(None, 24) is loader.get_font(None, 24)
+    assert loader.get_font(None, 24) is not loader.get_font(None, 36)
+    assert loader.get_font('nonexistent.ttf', 24) is not None  # Falls back to default font
+    pygame.quit()
+
+def test_text_cache_hits_and_misses():
+    """Test that identical text is rendered once and reused"""
+    pygame.init()
+    cache = TextCache(AssetLoader())
+    first = cache.render(None, 24, 'Health: 100/100', (255, 255, 255))
+    second = cache.render(None, 24, 'Health: 100/100', (255, 255, 255))
+    assert first is second
+    assert (cache.hits, cache.misses) == (1, 1)
+    
+    # Any part of the key changing is a new render
+    cache.render(None, 24, 'Health: 99/100', (255, 255, 255))
+    cache.render(None, 24, 'Health: 100/100', (255, 0, 0))
+    cache.render(None, 24, 'Health: 100/100', (255, 255, 255), antialias=False)
+    assert cache.misses == 4
+    assert len(cache) == 4
+    pygame.quit()
+
+def test_text_cache_lru_eviction():
+    """Test that the least recently used surfaces are evicted past the memory cap"""
+    pygame.init()
+    cache = TextCache(AssetLoader(), max_bytes=1)
+    cache.render(None, 24, 'first', (255, 255, 255))
+    cache.render(None, 24, 'second', (255, 255, 255))
+    assert len(cache) == 1
+    assert ('first' not in [key[2] for key in cache.entries])
+    
+    cache = TextCache(AssetLoader())
+    a = cache.render(None, 24, 'a', (255, 255, 255))
+    cache.render(None, 24, 'b', (255, 255, 255))
+    cache.render(None, 24, 'a', (255, 255, 255))  # 'a' is now most recent
+    cache.max_bytes = cache.bytes - 1
+    cache.render(None, 24, 'c', (255, 255, 255))
+    remaining = [key[2] for key in cache.entries]
+    assert 'b' not in remaining
+    assert cache.bytes <= cache.max_bytes or len(cache) == 1
+    pygame.quit()
+
+def test_hud_reuses_cached_text(game):
+    """Test that redrawing an unchanged HUD renders no new text"""
+    game.change_state('play')
+    play_state = game.states['play']
+    play_state.draw(game.screen)
+    misses = game.text_cache.misses
+    play_state.draw(game.screen)
+    assert game.text_cache.misses == misses
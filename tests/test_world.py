@@ -0,0 +1,134 @@
+import random
+import pygame
+import config
+from states.game_state import PlayState
+from utils.entities import Zombie, NPC
+
+def move_player(state, x, y):
+    """Teleport the player and stream the world around it"""
+    state.player.rect.center = (x, y)
+    state.world.update(state.player)
+
+def test_world_generation_is_deterministic(game):
+    """Test that the same seed generates the same chunks and different seeds differ"""
+    first = PlayState(game, seed=42)
+    second = PlayState(game, seed=42)
+    other = PlayState(game, seed=43)
+    for key in [(0, 0), (5, -3), (-100, 7)]:
+        assert first.world.generate(key) == second.world.generate(key)
+    assert first.world.generate((1, 1)) != other.world.generate((1, 1))
+    assert sorted((b.rect.topleft, b.door_pos) for b in first.buildings) == \
+        sorted((b.rect.topleft, b.door_pos) for b in second.buildings)
+    
+    # A reloaded chunk gets the same doors back
+    key = next(iter(first.world.loaded))
+    doors = [building.door_pos for building in first.world.loaded[key]]
+    first.world.unload(key)
+    first.world.load(key)
+    assert [building.door_pos for building in first.world.loaded[key]] == doors
+
+def test_buildings_stay_inside_their_chunk(game):
+    """Test that generated buildings never straddle a chunk boundary"""
+    state = PlayState(game, seed=1)
+    for key in [(0, 0), (3, 4), (-2, -9)]:
+        area = state.world.chunk_rect(key)
+        for rect in state.world.generate(key)[0]:
+            assert area.contains(rect)
+
+def test_world_streams_around_player(game):
+    """Test that chunks load ahead of the player and the loaded set stays bounded"""
+    state = PlayState(game, seed=7)
+    world = state.world
+    side = 2 * config.CHUNK_LOAD_RADIUS + 1
+    assert len(world.loaded) == side * side
+    assert world.chunk_key(*state.player.rect.center) in world.loaded
+    
+    max_loaded = 0
+    for step in range(1, 30):
+        move_player(state, 640 + step * config.CHUNK_SIZE, 360)
+        max_loaded = max(max_loaded, len(world.loaded))
+        
+        # Every live sprite belongs to a loaded chunk
+        for building in state.buildings:
+            assert world.chunk_key(*building.rect.center) in world.loaded
+        for entity in state.entity_index.keys:
+            assert world.chunk_key(*entity.rect.center) in world.loaded
+    
+    side = 2 * config.CHUNK_UNLOAD_RADIUS + 1
+    assert max_loaded <= side * side
+    assert len(state.building_grid) == sum(len(b) for b in world.loaded.values())
+
+def test_unloaded_mobs_are_frozen_and_restored(game):
+    """Test that a damaged zombie keeps its health across an unload and reload"""
+    state = PlayState(game, seed=3)
+    zombie = Zombie(2000, 2000)
+    state.add_entity(zombie)
+    zombie.take_damage(20)
+    friend = NPC(700, 360)
+    friend.is_hostile = False
+    state.add_entity(friend)
+    friend.reveal(state.player)
+    
+    # Walk far enough away that the zombie's chunk unloads
+    move_player(state, 640 + 10 * config.CHUNK_SIZE, 360)
+    assert zombie not in state.all_sprites
+    assert zombie not in state.entity_index.keys
+    key = state.world.chunk_key(2000, 2000)
+    assert ('zombie', 2000, 2000, config.ZOMBIE_MAX_HEALTH - 20, True, False) in state.world.frozen[key]
+    
+    # Followers travel with the player instead of freezing
+    assert friend in state.all_sprites
+    
+    move_player(state, 2000, 2000)
+    restored = [e for e in state.entity_index.keys if e.rect.center == (2000, 2000)]
+    assert len(restored) == 1
+    assert restored[0].health == config.ZOMBIE_MAX_HEALTH - 20
+    assert key not in state.world.frozen
+
+def test_frozen_chunks_are_bounded(game):
+    """Test that only frozen_limit unloaded chunks are remembered"""
+    state = PlayState(game, seed=5)
+    state.world.frozen_limit = 4
+    for step in range(1, 20):
+        move_player(state, 640, 360 + step * config.CHUNK_SIZE)
+    assert len(state.world.frozen) <= 4
+
+def test_cleared_chunks_stay_cleared(game):
+    """Test that a chunk whose mobs were all killed does not restock when it reloads"""
+    state = PlayState(game, seed=11)
+    world = state.world
+    key = world.chunk_key(*state.player.rect.center)
+    for entity in list(state.entity_index.keys):
+        if world.chunk_key(*entity.rect.center) == key and entity not in state.player.followers:
+            entity.take_damage(entity.max_health)
+    
+    move_player(state, 640 + 10 * config.CHUNK_SIZE, 360)
+    assert world.frozen[key] == []
+    move_player(state, 640, 360)
+    assert not [e for e in state.entity_index.keys
+                if world.chunk_key(*e.rect.center) == key and not e.is_dead]
+
+def test_strays_join_a_new_chunks_own_mobs(game):
+    """Test that mobs frozen into a never-loaded chunk are added to its generated mobs"""
+    state = PlayState(game, seed=12)
+    world = state.world
+    key = (5, 0)
+    stray = Zombie(key[0] * config.CHUNK_SIZE + 500, 500)
+    state.add_entity(stray)
+    world.freeze_strays()
+    assert key in world.strays and key not in world.frozen
+    
+    _, generated = world.generate(key)
+    move_player(state, key[0] * config.CHUNK_SIZE + 500, 500)
+    centers = {e.rect.center for e in state.entity_index.keys if world.chunk_key(*e.rect.center) == key}
+    assert (stray.rect.centerx, stray.rect.centery) in centers
+    assert {(x, y) for _, x, y, *_ in generated} <= centers
+    assert key not in world.strays
+
+def test_building_a_world_leaves_global_random_alone(game):
+    """Test that a PlayState built from a seed, as on the world-builder thread, does not draw from random"""
+    random.seed(1)
+    expected = random.random()
+    random.seed(1)
+    PlayState(game, seed=5)
+    assert random.random() == expected
@@ -0,0 +1,175 @@
+"""Packed asset archive.
+
+Packs everything under assets/images, assets/sounds and assets/fonts into
+a single file that the game memory-maps at startup:
+
+    python -m utils.asset_archive            # writes assets/assets.pak
+
+Layout: a fixed header (magic, index offset, index size), then one
+16-byte-aligned blob per asset, then a JSON index. Images are stored as
+raw BGRA pixels, the layout convert_alpha() produces for the usual
+ARGB8888 display, and become surfaces through pygame.image.frombuffer
+directly on the mapped memory, so they need neither a decode nor a
+convert. The mapping is copy-on-write: drawing into such a surface copies
+only the touched pages, and the file on disk never changes. Sounds are stored as PCM in the mixer
+format they were decoded with. Fonts are stored as the original file
+bytes, since pygame can only build fonts from a file. Every entry records
+the SHA-256 of its blob, which verify() checks.
+"""
+import io
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import argparse
+from typing import Dict, Optional
+import pygame
+import config
+
+MAGIC = b'DOTZPAK1'
+HEADER = struct.Struct('<8sQQ')  # magic, index offset, index size
+ALIGNMENT = 16
+PIXEL_FORMAT = 'BGRA'
+FOLDERS = ('images', 'sounds', 'fonts')
+
+class AssetArchive:
+    """Copy-on-write view of a packed asset archive through mmap"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, index_offset, index_size = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'{path} is not an asset archive')
+        self.index: Dict[str, Dict[str, dict]] = json.loads(
+            self.map[index_offset:index_offset + index_size])
+        self.view = memoryview(self.map)
+
+    def __contains__(self, key) -> bool:
+        folder, filename = key
+        return filename in self.index.get(folder, {})
+
+    def _blob(self, entry: dict) -> memoryview:
+        return self.view[entry['offset']:entry['offset'] + entry['size']]
+
+    def image(self, filename: str) -> Optional[pygame.Surface]:
+        """Return a surface that shares the archive's memory, or None if it is not packed.
+
+        The surface can be drawn into like any other; writes stay private to
+        this process, and show up in every surface made from the same entry.
+        """
+        entry = self.index.get('images', {}).get(filename)
+        if entry is None:
+            return None
+        return pygame.image.frombuffer(self._blob(entry), (entry['width'], entry['height']),
+                                       entry['format'])
+
+    def sound(self, filename: str) -> Optional[pygame.mixer.Sound]:
+        """Return a sound built from the packed PCM, or None if it is missing or the mixer format differs"""
+        entry = self.index.get('sounds', {}).get(filename)
+        if entry is None or list(pygame.mixer.get_init() or ()) != entry['mixer']:
+            return None
+        return pygame.mixer.Sound(buffer=self._blob(entry))
+
+    def font(self, filename: str, size: int) -> Optional[pygame.font.Font]:
+        """Return a font read from the packed file bytes, or None if it is not packed"""
+        entry = self.index.get('fonts', {}).get(filename)
+        if entry is None:
+            return None
+        return pygame.font.Font(io.BytesIO(self._blob(entry)), size)
+
+    def verify(self) -> Dict[str, str]:
+        """Return {folder/filename: problem} for every entry whose hash does not match.
+
+        Checks the mapped memory, so run it before drawing into any image.
+        """
+        problems = {}
+        for folder, entries in self.index.items():
+            for filename, entry in entries.items():
+                if hashlib.sha256(self._blob(entry)).hexdigest() != entry['sha256']:
+                    problems[f'{folder}/{filename}'] = 'hash mismatch'
+        return problems
+
+    def close(self):
+        """Unmap the archive. Surfaces created by image() must not be used afterwards"""
+        self.view = None
+        try:
+            self.map.close()
+        except BufferError:
+            # Surfaces still reference the mapping; it goes away with them
+            pass
+        self.file.close()
+
+def _pack_image(path: str) -> tuple:
+    surface = pygame.image.load(path)
+    return pygame.image.tobytes(surface, PIXEL_FORMAT), {'width': surface.get_width(),
+                                                        'height': surface.get_height(),
+                                                        'format': PIXEL_FORMAT}
+
+def _pack_sound(path: str) -> tuple:
+    return pygame.mixer.Sound(path).get_raw(), {'mixer': list(pygame.mixer.get_init())}
+
+def _pack_font(path: str) -> tuple:
+    with open(path, 'rb') as f:
+        return f.read(), {}
+
+PACKERS = {'images': _pack_image, 'sounds': _pack_sound, 'fonts': _pack_font}
+
+def build_archive(assets_dir: str, output: str) -> Dict[str, Dict[str, dict]]:
+    """Pack every asset under assets_dir into output and return the index.
+
+    Files the packer cannot read (READMEs, unsupported formats) are
+    skipped with a message. Needs pygame and its mixer initialized, so
+    sounds are decoded to the mixer's format.
+    """
+    index: Dict[str, Dict[str, dict]] = {folder: {} for folder in FOLDERS}
+    with open(output, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, 0, 0))
+        for folder in FOLDERS:
+            directory = os.path.join(assets_dir, folder)
+            if not os.path.isdir(directory):
+                continue
+            for filename in sorted(os.listdir(directory)):
+                path = os.path.join(directory, filename)
+                if filename.endswith('.md') or not os.path.isfile(path):
+                    continue
+                try:
+                    blob, meta = PACKERS[folder](path)
+                except (pygame.error, OSError) as e:
+                    print(f'Skipping {folder}/{filename}: {e}')
+                    continue
+                f.write(b'\0' * (-f.tell() % ALIGNMENT))
+                meta.update(offset=f.tell(), size=len(blob), sha256=hashlib.sha256(blob).hexdigest())
+                f.write(blob)
+                index[folder][filename] = meta
+
+        index_data = json.dumps(index, sort_keys=True).encode()
+        index_offset = f.tell()
+        f.write(index_data)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, index_offset, len(index_data)))
+    return index
+
+def main(argv=None):
+    base = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets')
+    parser = argparse.ArgumentParser(description='Pack the asset folders into one archive.')
+    parser.add_argument('--assets', default=base, help='assets directory to pack')
+    parser.add_argument('--output', default=os.path.join(base, config.ASSET_ARCHIVE),
+                        help='archive to write')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    pygame.init()
+    pygame.mixer.init()
+    index = build_archive(args.assets, args.output)
+    pygame.quit()
+    print(f"Packed {sum(len(entries) for entries in index.values())} assets into {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,45 +1,275 @@
+import io
 import os
+import json
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
 import pygame
+import config
+from utils.asset_archive import AssetArchive
+from utils.sprite_utils import slice_spritesheet
 
 class AssetLoader:
-    def __init__(self):
+    def __init__(self, archive=config.ASSET_ARCHIVE):
         self.base_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets')
         self.images = {}
         self.sounds = {}
         self.fonts = {}
+        self.spritesheets = {}
+        self.archive = self.open_archive(archive) if archive else None
+    
+    def open_archive(self, filename):
+        """Memory-map a packed asset archive, or return None if there is none"""
+        try:
+            return AssetArchive(os.path.join(self.base_path, filename))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f'Could not open asset archive {filename}: {e}')
+            return None
+    
+    def packed(self, folder, filename):
+        """Return True if an asset can be read from the archive"""
+        return self.archive is not None and (folder, filename) in self.archive
+    
+    def path_for(self, folder, filename):
+        """Return the full path of an asset file"""
+        return os.path.join(self.base_path, folder, filename)
     
     def load_image(self, name, filename):
-        """Load an image asset."""
-        path = os.path.join(self.base_path, 'images', filename)
+        """Load an image asset, or return it if it is already loaded."""
+        if name in self.images:
+            return self.images[name]
+        if self.packed('images', filename):
+            # Already in the display's pixel format, so no convert
+            self.images[name] = self.archive.image(filename)
+            return self.images[name]
         try:
-            if os.path.exists(path):
-                self.images[name] = pygame.image.load(path).convert_alpha()
-                return self.images[name]
+            image = pygame.image.load(self.path_for('images', filename))
+        except FileNotFoundError:
             return None
-        except (pygame.error, FileNotFoundError) as e:
+        except pygame.error as e:
             print(f'Could not load image {filename}: {e}')
             return None
+        self.images[name] = image.convert_alpha() if pygame.display.get_surface() else image
+        return self.images[name]
+    
+    def load_spritesheet(self, name, filename, sprite_size, colorkey=None, trim=False):
+        """Load a spritesheet and slice it into frames, or return the cached frames.
+
+        The sheet is loaded and converted once through load_image, and the
+        frames are subsurfaces of it, so every sprite animating from the same
+        sheet shares the same pixels.
+        """
+        key = (name, tuple(sprite_size), tuple(pygame.Color(colorkey)) if colorkey is not None else None, trim)
+        sheet = self.spritesheets.get(key)
+        if sheet is None:
+            image = self.load_image(name, filename)
+            if image is None:
+                return None
+            sheet = self.spritesheets[key] = slice_spritesheet(image, sprite_size, colorkey, trim)
+        return sheet
     
     def load_sound(self, name, filename):
-        """Load a sound asset."""
-        path = os.path.join(self.base_path, 'sounds', filename)
+        """Load a sound asset, or return it if it is already loaded."""
+        if name in self.sounds:
+            return self.sounds[name]
+        if self.packed('sounds', filename):
+            sound = self.archive.sound(filename)
+            if sound is not None:
+                self.sounds[name] = sound
+                return sound
         try:
-            if os.path.exists(path):
-                self.sounds[name] = pygame.mixer.Sound(path)
-                return self.sounds[name]
+            self.sounds[name] = pygame.mixer.Sound(self.path_for('sounds', filename))
+            return self.sounds[name]
+        except FileNotFoundError:
             return None
-        except (pygame.error, FileNotFoundError) as e:
+        except pygame.error as e:
             print(f'Could not load sound {filename}: {e}')
             return None
     
     def load_font(self, name, filename, size):
-        """Load a font asset."""
-        path = os.path.join(self.base_path, 'fonts', filename)
+        """Load a font asset, or return it if it is already loaded."""
+        if name in self.fonts:
+            return self.fonts[name]
+        if self.packed('fonts', filename):
+            self.fonts[name] = self.archive.font(filename, size)
+            return self.fonts[name]
+        path = self.path_for('fonts', filename)
         try:
-            if os.path.exists(path):
-                self.fonts[name] = pygame.font.Font(path, size)
-                return self.fonts[name]
+            self.fonts[name] = pygame.font.Font(path, size)
+            return self.fonts[name]
+        except FileNotFoundError:
             return pygame.font.Font(None, size)  # Fallback to default font
-        except (pygame.error, FileNotFoundError) as e:
+        except pygame.error as e:
             print(f'Could not load font {filename}: {e}')
             return pygame.font.Font(None, size)  # Fallback to default font
+    
+    def get_font(self, filename, size):
+        """Return a font for (filename, size), creating it only once. None means the default font.
+
+        The font is cached in self.fonts under the name 'filename:size'.
+        """
+        name = f'{filename or "<default>"}:{size}'
+        font = self.fonts.get(name)
+        if font is None:
+            if filename is None:
+                font = pygame.font.Font(None, size)
+            else:
+                font = self.load_font(name, filename, size)
+            self.fonts[name] = font
+        return font
+    
+    def load_manifest(self, filename=config.ASSET_MANIFEST):
+        """Return the per-state asset lists from the manifest, or {} if there is none"""
+        try:
+            with open(os.path.join(self.base_path, filename)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+    
+    def close(self):
+        """Unmap the asset archive, if one is open"""
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+
+class PreloadJob:
+    """Progress of preloading one game state's assets"""
+    def __init__(self, state_name: str):
+        self.state_name = state_name
+        self.futures: List[Future] = []
+        self.finished = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.futures)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of assets decoded and handed to the AssetLoader, from 0 to 1"""
+        return self.finished / self.total if self.futures else 1.0
+
+    @property
+    def done(self) -> bool:
+        return self.finished == self.total
+
+class AssetPreloader:
+    """Loads the assets a game state declares in the manifest in the background.
+
+    The manifest maps state names to the images, sounds and fonts that
+    state uses:
+
+        {"play": {"images": {"zombie": "zombie.png"},
+                  "sounds": {"hit": "hit.wav"},
+                  "fonts": {"hud": ["hud.ttf", 24]}}}
+
+    preload() reads and decodes the files on a thread pool and returns a
+    PreloadJob with the futures and progress. Anything that has to happen
+    on the main thread (convert_alpha needs the display, fonts are built
+    from the bytes read in the background) is done by pump(), a bounded
+    batch per call, which the game runs once a frame. Finished assets land
+    in the AssetLoader's caches, so load_image() and friends then return
+    without touching the disk.
+    """
+
+    def __init__(self, assets: AssetLoader, manifest: Dict = None,
+                 workers: int = config.PRELOAD_WORKERS, batch: int = config.PRELOAD_BATCH):
+        self.assets = assets
+        self.manifest = assets.load_manifest() if manifest is None else manifest
+        self.batch = batch
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='preload')
+        self.ready = queue.SimpleQueue()
+        self.jobs: Dict[str, PreloadJob] = {}
+
+    def preload(self, state_name: str) -> PreloadJob:
+        """Start loading a state's assets, if that has not been started already"""
+        job = self.jobs.get(state_name)
+        if job is not None:
+            return job
+        job = self.jobs[state_name] = PreloadJob(state_name)
+        entries = self.manifest.get(state_name, {})
+        assets = self.assets
+        # Packed assets are only a view of the mapped archive, so they are
+        # loaded right away; the thread pool is for loose files
+        for name, filename in entries.get('images', {}).items():
+            if name in assets.images:
+                continue
+            if assets.packed('images', filename):
+                assets.load_image(name, filename)
+            else:
+                job.futures.append(self.executor.submit(self._decode_image, job, name, filename))
+        for name, filename in entries.get('sounds', {}).items():
+            if name in assets.sounds:
+                continue
+            if not (assets.packed('sounds', filename) and assets.load_sound(name, filename)):
+                job.futures.append(self.executor.submit(self._decode_sound, job, name, filename))
+        for name, (filename, size) in entries.get('fonts', {}).items():
+            if name in assets.fonts:
+                continue
+            if assets.packed('fonts', filename):
+                assets.load_font(name, filename, size)
+            else:
+                job.futures.append(self.executor.submit(self._read_font, job, name, filename, size))
+        return job
+
+    def _decode_image(self, job, name, filename):
+        try:
+            image = pygame.image.load(self.assets.path_for('images', filename))
+        except (pygame.error, FileNotFoundError) as e:
+            print(f'Could not load image {filename}: {e}')
+            image = None
+        self.ready.put((job, 'images', name, image))
+        return image
+
+    def _decode_sound(self, job, name, filename):
+        try:
+            sound = pygame.mixer.Sound(self.assets.path_for('sounds', filename))
+        except (pygame.error, FileNotFoundError) as e:
+            print(f'Could not load sound {filename}: {e}')
+            sound = None
+        self.ready.put((job, 'sounds', name, sound))
+        return sound
+
+    def _read_font(self, job, name, filename, size):
+        try:
+            with open(self.assets.path_for('fonts', filename), 'rb') as f:
+                data = (f.read(), size)
+        except OSError as e:
+            print(f'Could not load font {filename}: {e}')
+            data = None
+        self.ready.put((job, 'fonts', name, data))
+        return data
+
+    def pump(self, batch: int = None) -> int:
+        """Hand up to batch decoded assets to the AssetLoader. Returns how many were handled"""
+        if batch is None:
+            batch = self.batch
+        handled = 0
+        while handled < batch:
+            try:
+                job, kind, name, value = self.ready.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'images' and value is not None and pygame.display.get_surface():
+                value = value.convert_alpha()
+            elif kind == 'fonts' and value is not None:
+                data, size = value
+                value = pygame.font.Font(io.BytesIO(data), size)
+            if value is not None:
+                getattr(self.assets, kind)[name] = value
+            job.finished += 1
+            handled += 1
+        return handled
+
+    def wait(self, state_name: str):
+        """Block until a state's assets are loaded (for loading screens and tests)"""
+        job = self.preload(state_name)
+        for future in job.futures:
+            future.result()
+        while not job.done:
+            self.pump(len(job.futures))
+
+    def shutdown(self):
+        """Stop the worker threads, dropping anything not started yet"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
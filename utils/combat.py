@@ -0,0 +1,39 @@
+import numpy as np
+from typing import List, Optional
+
+def resolve_shockwaves(shockwaves: List, targets: List, dt: float,
+                       centers: Optional[np.ndarray] = None) -> int:
+    """Damage and knock back every target inside any live shockwave.
+
+    Distances and knockback vectors for all shockwave/target pairs are
+    computed in one NumPy pass; take_damage is only called for the hits,
+    in shockwave order. Target centers can be passed in as an (N, 2)
+    array (e.g. straight from an EntityStore) to skip reading the rects.
+    Returns the number of hits applied.
+    """
+    if not shockwaves or not targets:
+        return 0
+    
+    # (T, 2) target centers and (S, 4) shockwave center, radius and knockback step
+    if centers is None:
+        centers = np.array([target.rect.center for target in targets], dtype=np.float64)
+    waves = np.array([(wave.center_x, wave.center_y, wave.radius, wave.knockback * dt)
+                      for wave in shockwaves], dtype=np.float64)
+    
+    # (S, T, 2) offsets from each shockwave to each target
+    offsets = centers[np.newaxis, :, :] - waves[:, np.newaxis, :2]
+    distances = np.hypot(offsets[..., 0], offsets[..., 1])
+    
+    # Targets exactly on a shockwave center have no knockback direction and are skipped
+    hits = (distances <= waves[:, 2:3]) & (distances > 0)
+    wave_idx, target_idx = np.nonzero(hits)
+    if len(wave_idx) == 0:
+        return 0
+    
+    scale = waves[wave_idx, 3] / distances[wave_idx, target_idx]
+    knockback = offsets[wave_idx, target_idx] * scale[:, np.newaxis]
+    
+    for w, t, (knockback_x, knockback_y) in zip(wave_idx.tolist(), target_idx.tolist(),
+                                                knockback.tolist()):
+        targets[t].take_damage(shockwaves[w].damage, knockback_x, knockback_y)
+    return len(wave_idx)
@@ -1,8 +1,13 @@
 import pygame
 import math
 import random
+from functools import lru_cache
 from typing import Tuple, Optional, List
 import config
+from utils.spatial import SpatialGrid, SpatialHash
+from utils.pathfinding import FlowField
+from utils.entity_store import StoreField
+from utils.render_cache import health_bars, shockwave_frames, entity_images, EntityImages
 
 class Camera:
     def __init__(self, width: int, height: int):
@@ -16,6 +21,10 @@ class Camera:
         self.offset_x = target.rect.centerx - self.width // 2
         self.offset_y = target.rect.centery - self.height // 2
     
+    def viewport(self) -> pygame.Rect:
+        """Return the visible area in world coordinates"""
+        return pygame.Rect(self.offset_x, self.offset_y, self.width, self.height)
+    
     def apply(self, entity) -> pygame.Rect:
         """Return the entity's position relative to the camera"""
         return pygame.Rect(
@@ -25,8 +34,13 @@ class Camera:
             entity.rect.height
         )
 
+@lru_cache(maxsize=None)
+def solid_mask(size: Tuple[int, int]) -> pygame.mask.Mask:
+    """Return a fully set mask of a size, shared by every entity with that rect size"""
+    return pygame.mask.Mask(size, fill=True)
+
 class Building(pygame.sprite.Sprite):
-    def __init__(self, x, y, width, height):
+    def __init__(self, x, y, width, height, rng: Optional[random.Random] = None):
         super().__init__()
         self.image = pygame.Surface((width, height), pygame.SRCALPHA)
         self.rect = self.image.get_rect()
@@ -35,21 +49,25 @@ class Building(pygame.sprite.Sprite):
         # Door properties
         self.door_width = 30
         self.door_height = 30
-        self.door_pos = self._calculate_door_position(width, height)
+        self.door_pos = self._calculate_door_position(width, height, rng or random)
         
         self.draw_building()
+        
+        # Solid walls with the door cut out, for entity collisions
+        self.mask = pygame.mask.Mask((width, height), fill=True)
+        self.mask.erase(solid_mask((self.door_width, self.door_height)), self.door_pos)
     
-    def _calculate_door_position(self, width, height):
-        """Calculate door position - randomly on one of the walls"""
-        side = random.choice(['top', 'right', 'bottom', 'left'])
+    def _calculate_door_position(self, width, height, rng):
+        """Calculate door position - randomly on one of the walls, drawn from rng"""
+        side = rng.choice(['top', 'right', 'bottom', 'left'])
         if side == 'top':
-            return (random.randint(self.door_width, width - self.door_width), 0)
+            return (rng.randint(self.door_width, width - self.door_width), 0)
         elif side == 'right':
-            return (width - self.door_width, random.randint(self.door_height, height - self.door_height))
+            return (width - self.door_width, rng.randint(self.door_height, height - self.door_height))
         elif side == 'bottom':
-            return (random.randint(self.door_width, width - self.door_width), height - self.door_height)
+            return (rng.randint(self.door_width, width - self.door_width), height - self.door_height)
         else:  # left
-            return (0, random.randint(self.door_height, height - self.door_height))
+            return (0, rng.randint(self.door_height, height - self.door_height))
     
     def draw_building(self):
         # Draw main building
@@ -84,39 +102,46 @@ class Shockwave(pygame.sprite.Sprite):
         self.damage = config.SHOCKWAVE_DAMAGE
         self.knockback = config.SHOCKWAVE_KNOCKBACK
         
-        # Create surface
-        self.image = pygame.Surface((self.max_radius * 2, self.max_radius * 2), pygame.SRCALPHA)
-        self.rect = self.image.get_rect(center=(x, y))
+        # Frames are shared between all shockwaves; just pick the one for our radius
         self.center_x = x
         self.center_y = y
+        self.image = shockwave_frames.get(self.radius)
+        self.rect = self.image.get_rect(center=(x, y))
         
     def update(self, dt: float) -> bool:
         """Update shockwave size. Returns True if shockwave should be removed."""
         self.radius += self.growth_rate * dt
         
-        # Clear previous frame
-        self.image.fill((0, 0, 0, 0))
-        
-        # Draw new circle
-        pygame.draw.circle(self.image, (*config.BLUE, 128), 
-                         (self.max_radius, self.max_radius), 
-                         int(self.radius))
+        # Swap to the cached frame for the new radius, keeping the rect centered
+        self.image = shockwave_frames.get(self.radius)
+        self.rect.size = self.image.get_size()
+        self.rect.center = (self.center_x, self.center_y)
         
         # Remove if too large
         return self.radius >= self.max_radius
 
 class Entity(pygame.sprite.Sprite):
+    # State that moves into an EntityStore's arrays when the entity is attached
+    store = None
+    store_index = None
+    # SpatialHash kept up to date as the entity moves (see PlayState.add_entity)
+    spatial_index = None
+    # Whether the entity steers along the shared flow field when chasing the player
+    uses_flow_field = False
+    health = StoreField('health')
+    attack_cooldown = StoreField('cooldown')
+    knockback_dx = StoreField('knockback', 0)
+    knockback_dy = StoreField('knockback', 1)
+    
     def __init__(self, x: int, y: int, radius: int, color: Tuple[int, int, int], max_health: int):
         super().__init__()
         
-        # Create circular surface
+        # Circular look; the surface itself is shared (see draw_entity)
         self.radius = radius
         self.color = color
-        self.image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (radius, radius), radius)
         
         # Set up rect and position
-        self.rect = self.image.get_rect()
+        self.rect = pygame.Rect(0, 0, radius * 2, radius * 2)
         self.rect.centerx = x
         self.rect.centery = y
         
@@ -132,55 +157,55 @@ class Entity(pygame.sprite.Sprite):
         self.attack_cooldown = 0
         self.is_dead = False
         self.draw_entity()
+        self.refresh_health_bar()
         
     def draw_entity(self):
-        self.image.fill((0, 0, 0, 0))  # Clear with transparency
-        pygame.draw.circle(self.image, self.color, (self.radius, self.radius), self.radius)
-        if self.is_dead:
-            # Draw X mark when dead
-            pygame.draw.line(self.image, (0, 0, 0), (5, 5), 
-                           (self.radius * 2 - 5, self.radius * 2 - 5), 3)
-            pygame.draw.line(self.image, (0, 0, 0), (5, self.radius * 2 - 5),
-                           (self.radius * 2 - 5, 5), 3)
+        """Point image at the shared surface for this entity's look"""
+        state = EntityImages.DEAD if self.is_dead else EntityImages.ALIVE
+        self.image = entity_images.get(self.radius, self.color, state)
 
-    def move(self, dx, dy, all_sprites):
+    def move(self, dx, dy, all_sprites, building_grid: Optional[SpatialGrid] = None):
         if self.is_dead:
             return False
 
         # Store original position
-        original_x = self.rect.x
-        original_y = self.rect.y
+        rect = self.rect
+        original_x = rect.x
+        original_y = rect.y
         
         # Apply movement
-        self.rect.x += dx
-        self.rect.y += dy
-        
-        # Check collisions with buildings
-        collision = False
-        for sprite in all_sprites:
-            if isinstance(sprite, Building) and sprite != self:
-                # Check each corner of the entity
-                corners = [
-                    (self.rect.left, self.rect.top),
-                    (self.rect.right, self.rect.top),
-                    (self.rect.left, self.rect.bottom),
-                    (self.rect.right, self.rect.bottom)
-                ]
-                
-                for corner_x, corner_y in corners:
-                    if sprite.collides_with_point(corner_x, corner_y):
-                        collision = True
-                        break
-                
-                if collision:
-                    break
+        rect.x += dx
+        rect.y += dy
         
-        # If collision occurred, revert movement
-        if collision:
-            self.rect.x = original_x
-            self.rect.y = original_y
-            return True
+        # Only test buildings in the grid cells we touch, if a grid is available
+        if building_grid is not None:
+            buildings = building_grid.query(rect.union((original_x, original_y, rect.width, rect.height)))
+        else:
+            buildings = [sprite for sprite in all_sprites if isinstance(sprite, Building)]
         
+        collision = self.overlaps_buildings(buildings)
+        if collision:
+            # Slide along the wall on whichever axis is still free, else stay put
+            rect.y = original_y
+            if not dx or self.overlaps_buildings(buildings):
+                rect.x = original_x
+                rect.y += dy
+                if not dy or self.overlaps_buildings(buildings):
+                    rect.y = original_y
+                    return True
+        
+        if self.spatial_index is not None:
+            self.spatial_index.move(self)
+        return collision
+    
+    def overlaps_buildings(self, buildings) -> bool:
+        """Check the entity's rect against the buildings' masks, so doors are open"""
+        mask = solid_mask(self.rect.size)
+        x, y = self.rect.topleft
+        for building in buildings:
+            bx, by = building.rect.topleft
+            if building.mask.overlap(mask, (x - bx, y - by)):
+                return True
         return False
 
     def take_damage(self, amount: int, knockback_x: float = 0, knockback_y: float = 0):
@@ -192,13 +217,22 @@ class Entity(pygame.sprite.Sprite):
             if self.health <= 0:
                 self.is_dead = True
                 self.draw_entity()
+            self.refresh_health_bar()
             return self.health <= 0
+    
+    def refresh_health_bar(self):
+        """Point health_bar at the cached bar surface for the current health"""
+        self.health_bar = health_bars.bar_for(self.rect.width, self.health, self.max_health)
 
     def get_distance_to(self, other: 'Entity') -> float:
         """Get distance to another entity"""
         dx = other.rect.centerx - self.rect.centerx
         dy = other.rect.centery - self.rect.centery
         return math.sqrt(dx * dx + dy * dy)
+    
+    def seek_profile(self) -> Tuple[float, float, float, float]:
+        """Return (min distance, max distance, contact damage, contact cooldown) for seeking the player"""
+        return 0, -1, 0, 0  # Never seek
 
 class Player(Entity):
     def __init__(self, x: int, y: int):
@@ -208,7 +242,8 @@ class Player(Entity):
         self.shockwave_cooldown = 0
         self.followers: List[NPC] = []
     
-    def update(self, dt: float, sprites: pygame.sprite.Group) -> Optional[Shockwave]:
+    def update(self, dt: float, sprites: pygame.sprite.Group,
+               building_grid: Optional[SpatialGrid] = None, keys=None) -> Optional[Shockwave]:
         if self.is_dead:
             return None
         
@@ -216,13 +251,14 @@ class Player(Entity):
         self.attack_cooldown = max(0, self.attack_cooldown - dt)
         self.shockwave_cooldown = max(0, self.shockwave_cooldown - dt)
         
-        # Get keyboard input
-        keys = pygame.key.get_pressed()
+        # Get keyboard input, unless a key state was supplied (e.g. scripted input)
+        if keys is None:
+            keys = pygame.key.get_pressed()
         dx = (keys[pygame.K_d] - keys[pygame.K_a]) * self.speed * dt
         dy = (keys[pygame.K_s] - keys[pygame.K_w]) * self.speed * dt
         
         # Move with collision detection
-        self.move(dx, dy, sprites)
+        self.move(dx, dy, sprites, building_grid)
         
         # Create shockwave on space press if cooldown is ready
         if keys[pygame.K_SPACE] and self.shockwave_cooldown <= 0:
@@ -232,13 +268,20 @@ class Player(Entity):
         return None
 
 class Zombie(Entity):
+    uses_flow_field = True
+    
     def __init__(self, x: int, y: int):
         super().__init__(x, y, radius=config.ZOMBIE_SIZE, color=config.RED, max_health=config.ZOMBIE_MAX_HEALTH)
         self.speed = config.ZOMBIE_SPEED
         self.attack_cooldown = 0
         self.is_hostile = True
     
-    def update(self, dt: float, player: Player, sprites: pygame.sprite.Group):
+    def seek_profile(self) -> Tuple[float, float, float, float]:
+        """Chase the player inside the detection radius and bite on contact"""
+        return 0, config.ZOMBIE_DETECTION_RADIUS, config.ZOMBIE_DAMAGE, config.ZOMBIE_ATTACK_COOLDOWN
+    
+    def update(self, dt: float, player: Player, sprites: pygame.sprite.Group,
+               building_grid: Optional[SpatialGrid] = None, flow_field: Optional[FlowField] = None):
         if self.is_dead:
             return
         
@@ -250,12 +293,15 @@ class Zombie(Entity):
         dy = player.rect.centery - self.rect.centery
         distance = math.sqrt(dx * dx + dy * dy)
         
-        # Move towards player if in detection range
+        # Move towards player if in detection range, around buildings if a flow field is available
         if distance <= config.ZOMBIE_DETECTION_RADIUS:
             if distance > 0:
-                dx = dx / distance * self.speed * dt
-                dy = dy / distance * self.speed * dt
-                collision = self.move(dx, dy, sprites)
+                direction = flow_field.direction(*self.rect.center) if flow_field is not None else None
+                if direction is None:
+                    direction = (dx / distance, dy / distance)
+                dx = direction[0] * self.speed * dt
+                dy = direction[1] * self.speed * dt
+                collision = self.move(dx, dy, sprites, building_grid)
                 
                 # Deal damage on collision if attack is ready
                 if collision and self.attack_cooldown <= 0:
@@ -263,16 +309,59 @@ class Zombie(Entity):
                     self.attack_cooldown = config.ZOMBIE_ATTACK_COOLDOWN
 
 class NPC(Entity):
-    def __init__(self, x: int, y: int):
+    def __init__(self, x: int, y: int, hostile: Optional[bool] = None):
         super().__init__(x, y, radius=config.NPC_SIZE, color=config.WHITE, max_health=config.NPC_MAX_HEALTH)
         self.speed = config.NPC_SPEED
         self.attack_cooldown = 0
         self.revealed = False
-        self.is_hostile = random.random() < config.HOSTILE_NPC_CHANCE
+        self.is_hostile = random.random() < config.HOSTILE_NPC_CHANCE if hostile is None else hostile
         self.following_player = False
         self.attack_range = config.NPC_ATTACK_RANGE
     
-    def update(self, dt: float, player: Player, sprites: pygame.sprite.Group):
+    def seek_profile(self) -> Tuple[float, float, float, float]:
+        """Stay put until revealed, then chase (hostile) or trail (friendly) the player"""
+        if not self.revealed:
+            return super().seek_profile()
+        if self.is_hostile:
+            return 0, math.inf, config.NPC_DAMAGE, config.NPC_ATTACK_COOLDOWN
+        if self.following_player:
+            return config.NPC_FOLLOW_DISTANCE, math.inf, 0, 0
+        return super().seek_profile()
+    
+    def reveal(self, player: Player):
+        """Show the NPC's true nature, recruiting it if friendly"""
+        self.revealed = True
+        if self.is_hostile:
+            self.image = entity_images.get(self.radius, self.color, EntityImages.REVEALED_HOSTILE)
+        else:
+            # Start following player if friendly
+            self.following_player = True
+            if self not in player.followers:
+                player.followers.append(self)
+    
+    def find_target(self, sprites: pygame.sprite.Group,
+                    hostile_index: Optional[SpatialHash] = None) -> Optional[Entity]:
+        """Return the nearest living hostile within attack range, if any"""
+        x, y = self.rect.center
+        if hostile_index is not None:
+            return hostile_index.nearest(x, y, self.attack_range, exclude=self)
+        
+        # Fall back to scanning every sprite
+        target = None
+        best_sq = self.attack_range * self.attack_range
+        for sprite in sprites:
+            if isinstance(sprite, (Zombie, NPC)) and sprite.is_hostile and not sprite.is_dead:
+                dx = sprite.rect.centerx - x
+                dy = sprite.rect.centery - y
+                distance_sq = dx * dx + dy * dy
+                if distance_sq <= best_sq:
+                    target = sprite
+                    best_sq = distance_sq
+        return target
+    
+    def update(self, dt: float, player: Player, sprites: pygame.sprite.Group,
+               building_grid: Optional[SpatialGrid] = None,
+               hostile_index: Optional[SpatialHash] = None):
         if self.is_dead:
             return
         
@@ -284,15 +373,7 @@ class NPC(Entity):
         
         # Reveal true nature when player gets close
         if not self.revealed and distance <= config.NPC_DETECTION_RADIUS:
-            self.revealed = True
-            if self.is_hostile:
-                self.image.fill((0, 0, 0, 0))
-                pygame.draw.circle(self.image, config.YELLOW, (self.radius, self.radius), self.radius)
-            else:
-                # Start following player if friendly
-                self.following_player = True
-                if self not in player.followers:
-                    player.followers.append(self)
+            self.reveal(player)
         
         if self.revealed:
             if self.is_hostile:
@@ -302,7 +383,7 @@ class NPC(Entity):
                     dy = player.rect.centery - self.rect.centery
                     dx = dx / distance * self.speed * dt
                     dy = dy / distance * self.speed * dt
-                    collision = self.move(dx, dy, sprites)
+                    collision = self.move(dx, dy, sprites, building_grid)
                     
                     # Deal damage on collision if attack is ready
                     if collision and self.attack_cooldown <= 0:
@@ -316,14 +397,18 @@ class NPC(Entity):
                     dy = player.rect.centery - self.rect.centery
                     dx = dx / distance * self.speed * dt
                     dy = dy / distance * self.speed * dt
-                    self.move(dx, dy, sprites)
+                    self.move(dx, dy, sprites, building_grid)
                 
-                # Attack nearby enemies
-                for sprite in sprites:
-                    if isinstance(sprite, (Zombie, NPC)) and sprite.is_hostile:
-                        enemy_distance = self.get_distance_to(sprite)
-                        if enemy_distance <= self.attack_range and self.attack_cooldown <= 0:
-                            dx = sprite.rect.centerx - self.rect.centerx
-                            dy = sprite.rect.centery - self.rect.centery
-                            sprite.take_damage(config.NPC_FRIENDLY_DAMAGE, dx, dy)
-                            self.attack_cooldown = config.NPC_ATTACK_COOLDOWN 
\ No newline at end of file
+                # Attack the nearest enemy in range
+                self.attack_nearest(sprites, hostile_index)
+    
+    def attack_nearest(self, sprites: pygame.sprite.Group,
+                       hostile_index: Optional[SpatialHash] = None):
+        """Hit the nearest hostile in range if the attack is off cooldown"""
+        if self.attack_cooldown <= 0:
+            target = self.find_target(sprites, hostile_index)
+            if target is not None:
+                dx = target.rect.centerx - self.rect.centerx
+                dy = target.rect.centery - self.rect.centery
+                target.take_damage(config.NPC_FRIENDLY_DAMAGE, dx, dy)
+                self.attack_cooldown = config.NPC_ATTACK_COOLDOWN 
\ No newline at end of file
@@ -0,0 +1,241 @@
+import numpy as np
+from typing import List, Optional, Tuple, Any
+import config
+from utils.steering import separation
+
+class StoreField:
+    """Entity attribute that lives in an EntityStore array while attached.
+
+    Detached entities keep the value in their own __dict__, so sprites work
+    the same with or without a store.
+    """
+
+    def __init__(self, array: str, column: Optional[int] = None):
+        self.array = array
+        self.column = column
+
+    def __set_name__(self, owner, name: str):
+        self.slot = '_' + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        store = obj.store
+        if store is None:
+            return obj.__dict__[self.slot]
+        if self.column is None:
+            return getattr(store, self.array)[obj.store_index].item()
+        return getattr(store, self.array)[obj.store_index, self.column].item()
+
+    def __set__(self, obj, value):
+        store = obj.__dict__.get('store')
+        if store is None:
+            obj.__dict__[self.slot] = value
+        elif self.column is None:
+            getattr(store, self.array)[obj.store_index] = value
+        else:
+            getattr(store, self.array)[obj.store_index, self.column] = value
+
+class EntityStore:
+    """Struct-of-arrays storage for mob state with a batched update kernel.
+
+    Positions, velocities, health, cooldowns and knockback for every
+    attached mob live in NumPy arrays. step() runs seek-the-player,
+    cooldown decay and knockback integration for the whole population at
+    once; integrate() then resolves building collisions for the mobs that
+    actually moved and writes positions back to the sprite rects, which
+    are only kept for rendering.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.size = 0
+        self.sprites: List[Any] = []
+        self.free: List[int] = []
+        self.last_dt = 0.0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        """Create (or grow) the backing arrays, keeping existing rows"""
+        def grow(name, shape, dtype, fill=0):
+            array = np.full(shape, fill, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:len(old)] = old
+            setattr(self, name, array)
+
+        self.capacity = capacity
+        grow('pos', (capacity, 2), np.float64)
+        grow('vel', (capacity, 2), np.float64)
+        grow('delta', (capacity, 2), np.float64)
+        grow('knockback', (capacity, 2), np.float64)
+        grow('health', capacity, np.float64)
+        grow('cooldown', capacity, np.float64)
+        grow('speed', capacity, np.float64)
+        grow('distance', capacity, np.float64)
+        grow('seek_min', capacity, np.float64)
+        grow('seek_max', capacity, np.float64, -1.0)
+        grow('contact_damage', capacity, np.float64)
+        grow('contact_cooldown', capacity, np.float64)
+        grow('active', capacity, bool, False)
+        grow('hostile', capacity, bool, False)
+        grow('seeking', capacity, bool, False)
+        grow('pathing', capacity, bool, False)
+
+    def add(self, entity) -> int:
+        """Move an entity's state into the store and return its slot"""
+        if self.free:
+            index = self.free.pop()
+        else:
+            if self.size == self.capacity:
+                self._allocate(self.capacity * 2)
+            index = self.size
+            self.size += 1
+            self.sprites.append(None)
+
+        # Copy the detached values across before switching the entity over
+        self.pos[index] = entity.rect.center
+        self.vel[index] = 0
+        self.delta[index] = 0
+        self.knockback[index] = (entity.knockback_dx, entity.knockback_dy)
+        self.health[index] = entity.health
+        self.cooldown[index] = entity.attack_cooldown
+        self.speed[index] = entity.speed
+        self.distance[index] = 0
+        self.hostile[index] = entity.is_hostile
+        self.pathing[index] = entity.uses_flow_field
+        self.active[index] = True
+        self.sprites[index] = entity
+        entity.store_index = index
+        entity.store = self
+        self.refresh(entity)
+        return index
+
+    def remove(self, entity):
+        """Detach an entity, handing its current state back to the sprite"""
+        index = entity.store_index
+        health = self.health[index].item()
+        cooldown = self.cooldown[index].item()
+        knockback_dx, knockback_dy = self.knockback[index].tolist()
+
+        entity.store = None
+        entity.store_index = None
+        entity.health = health
+        entity.attack_cooldown = cooldown
+        entity.knockback_dx = knockback_dx
+        entity.knockback_dy = knockback_dy
+
+        self.active[index] = False
+        self.seeking[index] = False
+        self.sprites[index] = None
+        self.free.append(index)
+
+    def refresh(self, entity):
+        """Re-read an entity's seek behavior, e.g. after an NPC reveals itself"""
+        index = entity.store_index
+        seek_min, seek_max, damage, cooldown = entity.seek_profile()
+        self.seek_min[index] = seek_min
+        self.seek_max[index] = seek_max
+        self.contact_damage[index] = damage
+        self.contact_cooldown[index] = cooldown
+        self.hostile[index] = entity.is_hostile
+
+    def alive(self) -> np.ndarray:
+        """Boolean mask of attached slots that still have health"""
+        n = self.size
+        return self.active[:n] & (self.health[:n] > 0)
+
+    def step(self, dt: float, target_x: float, target_y: float, flow_field=None):
+        """Run seek, cooldown decay and knockback for every mob in one pass.
+
+        Mobs that use the flow field steer along it where it has a direction
+        and straight at the target elsewhere. Hostile mobs also steer apart
+        from each other when USE_SEPARATION is set.
+        """
+        n = self.size
+        self.last_dt = dt
+        if n == 0:
+            return
+        alive = self.alive()
+
+        # Cooldown decay
+        cooldown = self.cooldown[:n]
+        np.maximum(cooldown - dt, 0, out=cooldown, where=alive)
+
+        # Seek the target
+        offset = np.array((target_x, target_y), dtype=np.float64) - self.pos[:n]
+        distance = np.hypot(offset[:, 0], offset[:, 1])
+        seeking = (alive & (distance > 0) & (distance > self.seek_min[:n]) &
+                   (distance <= self.seek_max[:n]))
+        heading = np.divide(offset, distance[:, np.newaxis], out=np.zeros((n, 2)),
+                            where=seeking[:, np.newaxis])
+        if flow_field is not None:
+            pathing = np.nonzero(seeking & self.pathing[:n])[0]
+            directions, valid = flow_field.lookup(self.pos[pathing])
+            heading[pathing[valid]] = directions[valid]
+        vel = heading * self.speed[:n, np.newaxis]
+
+        # Hostile mobs push apart, never moving faster than their own speed
+        if config.USE_SEPARATION:
+            crowd = np.nonzero(alive & self.hostile[:n])[0]
+            if len(crowd) > 1:
+                speed = self.speed[crowd]
+                push = separation(self.pos[crowd]) * (speed * config.SEPARATION_WEIGHT)[:, np.newaxis]
+                crowd_vel = vel[crowd] + push
+                length = np.hypot(crowd_vel[:, 0], crowd_vel[:, 1])
+                scale = np.minimum(1, speed / np.maximum(length, 1e-9))
+                vel[crowd] = crowd_vel * scale[:, np.newaxis]
+
+        # Knockback is a pending displacement that is paid out exponentially
+        knockback = self.knockback[:n]
+        knock_step = knockback * min(1.0, config.KNOCKBACK_DAMPING * dt)
+        knock_step[~alive] = 0
+        knockback -= knock_step
+
+        self.distance[:n] = distance
+        self.seeking[:n] = seeking
+        self.vel[:n] = vel
+        self.delta[:n] = vel * dt + knock_step
+
+    def integrate(self, sprites, building_grid, player) -> List[int]:
+        """Apply the last step's displacement with building collisions.
+
+        Mobs that bump into a building while chasing deal contact damage to
+        the player, matching Zombie.update/NPC.update. Returns the slots
+        that collided.
+        """
+        n = self.size
+        moving = np.nonzero(self.alive() & (self.delta[:n] != 0).any(axis=1))[0]
+        collided = []
+        for index in moving.tolist():
+            sprite = self.sprites[index]
+            x, y = (self.pos[index] + self.delta[index]).tolist()
+            rect = sprite.rect
+            step_x = int(round(x)) - rect.centerx
+            step_y = int(round(y)) - rect.centery
+
+            # Sub-pixel moves cannot hit anything new, so skip the collision test
+            if (step_x or step_y) and sprite.move(step_x, step_y, sprites, building_grid):
+                collided.append(index)
+                # The sprite may still have slid along the wall
+                self.pos[index] = rect.center
+                if (self.seeking[index] and self.contact_damage[index] > 0 and
+                        self.cooldown[index] <= 0):
+                    push_x, push_y = (self.vel[index] * self.last_dt * 2).tolist()
+                    player.take_damage(self.contact_damage[index].item(), push_x, push_y)
+                    self.cooldown[index] = self.contact_cooldown[index]
+            else:
+                self.pos[index] = (x, y)
+        return collided
+
+    def update(self, dt: float, sprites, building_grid, player, flow_field=None) -> List[int]:
+        """Run the kernel against the player and integrate the result"""
+        self.step(dt, player.rect.centerx, player.rect.centery, flow_field)
+        return self.integrate(sprites, building_grid, player)
+
+    def hostile_targets(self) -> Tuple[List[Any], np.ndarray]:
+        """Return the living hostile sprites and their centers as an (N, 2) array"""
+        indices = np.nonzero(self.alive() & self.hostile[:self.size])[0]
+        return [self.sprites[i] for i in indices.tolist()], self.pos[indices]
+
+    def __len__(self) -> int:
+        return self.size - len(self.free)
@@ -1,3 +1,4 @@
+import random
 import pygame
 
 class InputHandler:
@@ -14,6 +15,10 @@ class InputHandler:
         self._prev_mouse_buttons = self.mouse_buttons
         self.mouse_buttons = pygame.mouse.get_pressed()
     
+    def get_pressed(self):
+        """Return the live keyboard state, as pygame.key.get_pressed() does"""
+        return pygame.key.get_pressed()
+    
     def is_key_pressed(self, key):
         """Check if a key is currently pressed"""
         return self.pressed_keys[key]
@@ -33,3 +38,50 @@ class InputHandler:
         y = self.pressed_keys[pygame.K_s] - self.pressed_keys[pygame.K_w] or \
             self.pressed_keys[pygame.K_DOWN] - self.pressed_keys[pygame.K_UP]
         return (x, y)
+
+
+class ScriptedKeys:
+    """Stand-in for pygame.key.get_pressed() backed by a set of held keys"""
+    def __init__(self, held=()):
+        self.held = frozenset(held)
+    
+    def __getitem__(self, key):
+        return int(key in self.held)
+
+class ScriptedInputHandler(InputHandler):
+    """Input handler that replays scripted key presses instead of reading the keyboard"""
+    def __init__(self, script):
+        # script(frame) returns the keys held on that frame
+        self.script = script
+        self.frame = 0
+        self.pressed_keys = ScriptedKeys()
+        self.mouse_pos = (0, 0)
+        self.mouse_buttons = (False, False, False)
+        self._prev_mouse_buttons = self.mouse_buttons
+    
+    def update(self):
+        """Advance the script by one frame"""
+        self.pressed_keys = ScriptedKeys(self.script(self.frame))
+        self.frame += 1
+    
+    def get_pressed(self):
+        """Return the scripted key state for the current frame"""
+        return self.pressed_keys
+
+def wander_script(seed=None, turn_frames=60, shockwave_frames=90):
+    """Build a script that walks in a new random direction every turn_frames and fires shockwaves"""
+    rng = random.Random(seed)
+    directions = [(), (pygame.K_w,), (pygame.K_s,), (pygame.K_a,), (pygame.K_d,),
+                  (pygame.K_w, pygame.K_a), (pygame.K_w, pygame.K_d),
+                  (pygame.K_s, pygame.K_a), (pygame.K_s, pygame.K_d)]
+    legs = []
+    
+    def script(frame):
+        while len(legs) <= frame // turn_frames:
+            legs.append(rng.choice(directions))
+        held = legs[frame // turn_frames]
+        if frame % shockwave_frames == 0:
+            held += (pygame.K_SPACE,)
+        return held
+    
+    return script
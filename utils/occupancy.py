@@ -0,0 +1,117 @@
+import math
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pygame
+import config
+
+class OccupancyMap:
+    """Boolean free-space map of the world for spawn checks.
+
+    The world is rasterized into cells of cell_size pixels, stored in
+    square NumPy tiles that only exist where something has been added, so
+    the map works for an unbounded world. Each cell counts the buildings
+    (inflated by clearance) that touch it; a cell is free when its count
+    is zero. Cells that are only partly covered count as blocked, so any
+    point in a free cell is at least clearance away from every building.
+    Rects are stamped in and out as buildings are added and removed, and
+    any number of points can then be checked in one vectorized call.
+    """
+
+    def __init__(self, cell_size: int = config.OCCUPANCY_CELL_SIZE,
+                 tile_cells: int = config.OCCUPANCY_TILE_CELLS,
+                 clearance: int = config.SPAWN_CLEARANCE):
+        self.cell_size = cell_size
+        self.tile_cells = tile_cells
+        self.clearance = clearance
+        self.tiles: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def _stamp(self, rect: pygame.Rect, delta: int):
+        """Add delta to the count of every cell the inflated rect touches"""
+        size = self.cell_size
+        n = self.tile_cells
+        area = rect.inflate(2 * self.clearance, 2 * self.clearance)
+        col0 = area.left // size
+        row0 = area.top // size
+        col1 = (area.right - 1) // size + 1
+        row1 = (area.bottom - 1) // size + 1
+        for ty in range(row0 // n, (row1 - 1) // n + 1):
+            for tx in range(col0 // n, (col1 - 1) // n + 1):
+                tile = self.tiles.get((tx, ty))
+                if tile is None:
+                    if delta < 0:
+                        continue
+                    tile = self.tiles[(tx, ty)] = np.zeros((n, n), dtype=np.int16)
+                rows = slice(max(row0 - ty * n, 0), min(row1 - ty * n, n))
+                cols = slice(max(col0 - tx * n, 0), min(col1 - tx * n, n))
+                tile[rows, cols] += delta
+                if delta < 0 and not tile.any():
+                    del self.tiles[(tx, ty)]
+
+    def add(self, rect: pygame.Rect):
+        """Mark the area around a rect as occupied"""
+        self._stamp(rect, 1)
+
+    def remove(self, rect: pygame.Rect):
+        """Undo add() for a rect"""
+        self._stamp(rect, -1)
+
+    def free(self, points: np.ndarray) -> np.ndarray:
+        """Return a mask of which of an (N, 2) array of points are free"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        free = np.ones(len(points), dtype=bool)
+        if not self.tiles or len(points) == 0:
+            return free
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        tiles = cells // self.tile_cells
+        keys, inverse = np.unique(tiles, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        for i, (tx, ty) in enumerate(keys.tolist()):
+            tile = self.tiles.get((tx, ty))
+            if tile is None:
+                continue
+            mask = inverse == i
+            local = cells[mask] - tiles[mask] * self.tile_cells
+            free[mask] = tile[local[:, 1], local[:, 0]] == 0
+        return free
+
+    def is_free(self, x: float, y: float) -> bool:
+        """Return True if a single point is free"""
+        return bool(self.free(np.array([[x, y]]))[0])
+
+    def sample_annulus(self, center: Tuple[float, float], min_radius: float, max_radius: float,
+                       count: int, rng: Optional[np.random.Generator] = None,
+                       rounds: int = 8) -> np.ndarray:
+        """Return up to count free points between min_radius and max_radius of center.
+
+        Candidates are drawn uniformly over the annulus's area in batches
+        and filtered with free(); fewer than count come back only if the
+        annulus is so full that rounds batches did not find enough.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        found = []
+        total = 0
+        drawn = 0
+        inner = min_radius * min_radius
+        outer = max_radius * max_radius
+        for _ in range(rounds):
+            if total >= count:
+                break
+            # Size the batch by the share of candidates found free so far
+            rate = max(total / drawn, 0.05) if drawn else 0.5
+            batch = max(int((count - total) / rate * 1.25), 16)
+            drawn += batch
+            radius = np.sqrt(rng.uniform(inner, outer, batch))
+            angle = rng.uniform(0, 2 * math.pi, batch)
+            candidates = np.column_stack((center[0] + radius * np.cos(angle),
+                                          center[1] + radius * np.sin(angle)))
+            candidates = candidates[self.free(candidates)][:count - total]
+            found.append(candidates)
+            total += len(candidates)
+        if not found:
+            return np.zeros((0, 2))
+        return np.concatenate(found)
+
+    def clear(self):
+        """Forget every rect"""
+        self.tiles.clear()
@@ -0,0 +1,173 @@
+from collections import deque
+from typing import Optional, Tuple
+import numpy as np
+import pygame
+import config
+from utils.spatial import SpatialGrid
+
+# 8-connected neighbor offsets as (dx, dy)
+NEIGHBORS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+class FlowField:
+    """Shared grid of directions that lead every cell toward the player.
+
+    The field covers a square window of cells around the player's cell. It
+    is rebuilt with one breadth-first search from the player's cell, only
+    when the player moves into a different cell. Cells within `clearance`
+    of a building wall are blocked, except for the building's door, so the
+    search routes around buildings (and into doors) instead of through
+    them. Afterwards every mob gets its direction with a single lookup.
+    """
+
+    def __init__(self, cell_size: int = config.FLOW_CELL_SIZE, radius: int = config.FLOW_FIELD_RADIUS,
+                 clearance: int = config.ZOMBIE_SIZE):
+        self.cell_size = cell_size
+        self.cells = int(radius // cell_size)
+        self.clearance = clearance
+        side = 2 * self.cells + 1
+        self.blocked = np.zeros((side, side), dtype=bool)
+        self.distance = np.full((side, side), -1, dtype=np.int32)
+        self.directions = np.zeros((side, side, 2), dtype=np.float64)
+        # Cells with a usable direction; the target cell and its neighbors have none
+        self.has_direction = np.zeros((side, side), dtype=bool)
+        self.center: Optional[Tuple[int, int]] = None
+        self.origin = (0, 0)
+        self.rebuilds = 0
+
+    def cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        """Return the world cell containing a point"""
+        size = self.cell_size
+        return (int(x // size), int(y // size))
+
+    def invalidate(self):
+        """Force a rebuild on the next update, e.g. after buildings change"""
+        self.center = None
+
+    def update(self, target, building_grid: SpatialGrid) -> bool:
+        """Rebuild the field if the target changed cell. Returns True if it was rebuilt"""
+        cell = self.cell_of(*target.rect.center)
+        if cell == self.center:
+            return False
+        self.rebuild(cell, building_grid)
+        return True
+
+    def _rasterize(self, building_grid: SpatialGrid):
+        """Mark the cells whose centers a mob cannot occupy"""
+        size = self.cell_size
+        side = self.blocked.shape[0]
+        ox, oy = self.origin
+        self.blocked[:] = False
+        area = pygame.Rect(ox * size, oy * size, side * size, side * size)
+
+        # Cell centers in world space along each axis
+        centers = (np.arange(side) + 0.5) * size
+        xs = centers + ox * size
+        ys = centers + oy * size
+        for building in building_grid.query(area.inflate(2 * self.clearance, 2 * self.clearance)):
+            wall = building.rect.inflate(2 * self.clearance, 2 * self.clearance)
+            columns = np.nonzero((xs >= wall.left) & (xs < wall.right))[0]
+            rows = np.nonzero((ys >= wall.top) & (ys < wall.bottom))[0]
+            if len(columns) == 0 or len(rows) == 0:
+                continue
+            self.blocked[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1] = True
+
+            # The doorway itself is open floor
+            door_x = building.rect.x + building.door_pos[0]
+            door_y = building.rect.y + building.door_pos[1]
+            columns = np.nonzero((xs >= door_x) & (xs < door_x + building.door_width))[0]
+            rows = np.nonzero((ys >= door_y) & (ys < door_y + building.door_height))[0]
+            if len(columns) and len(rows):
+                self.blocked[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1] = False
+
+    def rebuild(self, cell: Tuple[int, int], building_grid: SpatialGrid):
+        """Run the BFS outward from a world cell"""
+        n = self.cells
+        side = 2 * n + 1
+        self.center = cell
+        self.origin = (cell[0] - n, cell[1] - n)
+        self._rasterize(building_grid)
+        self.rebuilds += 1
+
+        blocked = self.blocked.tolist()
+        distance = [[-1] * side for _ in range(side)]
+        distance[n][n] = 0
+        frontier = deque([(n, n)])
+        while frontier:
+            x, y = frontier.popleft()
+            step = distance[y][x] + 1
+            for dx, dy in NEIGHBORS:
+                nx = x + dx
+                ny = y + dy
+                if not (0 <= nx < side and 0 <= ny < side):
+                    continue
+                if blocked[ny][nx] or distance[ny][nx] >= 0:
+                    continue
+                # No cutting corners past a wall on a diagonal step
+                if dx and dy and (blocked[y][nx] or blocked[ny][x]):
+                    continue
+                distance[ny][nx] = step
+                frontier.append((nx, ny))
+        self.distance[:] = distance
+        self._point_downhill()
+
+    def _point_downhill(self):
+        """Aim every reached cell at its neighbor closest to the target"""
+        distance = self.distance
+        side = distance.shape[0]
+        unreached = np.iinfo(np.int32).max
+        current = np.where(distance >= 0, distance, unreached)
+        padded = np.full((side + 2, side + 2), unreached, dtype=np.int64)
+        padded[1:-1, 1:-1] = current
+
+        open_cells = np.zeros((side + 2, side + 2), dtype=bool)
+        open_cells[1:-1, 1:-1] = ~self.blocked
+
+        best = np.full((side, side), unreached, dtype=np.int64)
+        directions = np.zeros((side, side, 2), dtype=np.float64)
+        for dx, dy in NEIGHBORS:
+            neighbor = padded[1 + dy:side + 1 + dy, 1 + dx:side + 1 + dx]
+            better = neighbor < best
+            if dx and dy:
+                # Same corner rule as the search
+                better &= open_cells[1:side + 1, 1 + dx:side + 1 + dx]
+                better &= open_cells[1 + dy:side + 1 + dy, 1:side + 1]
+            best[better] = neighbor[better]
+            length = (dx * dx + dy * dy) ** 0.5
+            directions[better] = (dx / length, dy / length)
+
+        # Blocked cells along a wall also point back out toward open floor. Cells
+        # next to the target are left out so mobs steer straight at it instead.
+        self.has_direction = (distance != 0) & (best < current) & (best > 0)
+        directions[~self.has_direction] = 0
+        self.directions = directions
+
+    def direction(self, x: float, y: float) -> Optional[Tuple[float, float]]:
+        """Return the unit direction toward the target from a point, or None"""
+        if self.center is None:
+            return None
+        cx, cy = self.cell_of(x, y)
+        col = cx - self.origin[0]
+        row = cy - self.origin[1]
+        side = self.distance.shape[0]
+        if not (0 <= col < side and 0 <= row < side) or not self.has_direction[row, col]:
+            return None
+        fx, fy = self.directions[row, col]
+        return fx.item(), fy.item()
+
+    def lookup(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return directions for an (N, 2) array of points and a mask of which are valid"""
+        count = len(points)
+        directions = np.zeros((count, 2), dtype=np.float64)
+        valid = np.zeros(count, dtype=bool)
+        if self.center is None or count == 0:
+            return directions, valid
+        side = self.distance.shape[0]
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        cols = cells[:, 0] - self.origin[0]
+        rows = cells[:, 1] - self.origin[1]
+        inside = (cols >= 0) & (cols < side) & (rows >= 0) & (rows < side)
+        cols = cols[inside]
+        rows = rows[inside]
+        valid[inside] = self.has_direction[rows, cols]
+        directions[inside] = self.directions[rows, cols]
+        return directions, valid
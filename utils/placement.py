@@ -0,0 +1,59 @@
+import math
+import random
+from typing import List, Optional, Tuple
+import pygame
+import config
+from utils.spatial import SpatialGrid
+
+# Sizes tried in each slot before moving on to the next one
+SIZE_ATTEMPTS = 3
+
+def place_buildings(rng: random.Random, area: pygame.Rect, count: int,
+                    min_size: int = config.BUILDING_MIN_SIZE, max_size: int = config.BUILDING_MAX_SIZE,
+                    padding: int = 50, keep_out: Optional[Tuple[Tuple[float, float], float]] = None
+                    ) -> List[pygame.Rect]:
+    """Return up to count non-overlapping building rects inside an area.
+
+    The area is divided into slots the size of the smallest building plus
+    padding, visited in random order. Each slot gets one candidate building
+    of random size anchored at a random point in the slot, so buildings
+    spread over the whole area however few are asked for. A candidate is
+    kept padding away from the area's edges and (inflated by padding) off
+    every other building, and its center stays outside the keep_out
+    (point, radius) circle; a slot that cannot fit one after a few sizes is
+    skipped. Overlap checks go through a SpatialGrid, so each candidate
+    costs the same however many buildings are already placed. The result
+    depends only on the rng's state; once the area is full, fewer than
+    count rects come back.
+    """
+    inner = area.inflate(-2 * padding, -2 * padding)
+    if count <= 0 or inner.width < min_size or inner.height < min_size:
+        return []
+    slot = min_size + padding
+    cols = max(1, inner.width // slot)
+    rows = max(1, inner.height // slot)
+    slots = list(range(cols * rows))
+    rng.shuffle(slots)
+
+    placed: List[pygame.Rect] = []
+    grid = SpatialGrid(max_size + padding)
+    for index in slots:
+        if len(placed) == count:
+            break
+        row, col = divmod(index, cols)
+        x = inner.left + col * slot
+        y = inner.top + row * slot
+        for _ in range(SIZE_ATTEMPTS):
+            width = min(rng.randint(min_size, max_size), inner.width)
+            height = min(rng.randint(min_size, max_size), inner.height)
+            rect = pygame.Rect(rng.randint(x, x + slot - 1), rng.randint(y, y + slot - 1), width, height)
+            rect.clamp_ip(inner)
+            if keep_out is not None:
+                (kx, ky), radius = keep_out
+                if math.hypot(rect.centerx - kx, rect.centery - ky) < radius:
+                    continue
+            if all(not rect.colliderect(placed[i].inflate(padding, padding)) for i in grid.query(rect)):
+                grid.insert(len(placed), rect.inflate(padding, padding))
+                placed.append(rect)
+                break
+    return placed
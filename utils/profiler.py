@@ -0,0 +1,159 @@
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Tuple
+import pygame
+import config
+
+# Shared no-op context handed out while profiling is disabled
+_DISABLED = nullcontext()
+
+class _Section:
+    """Context manager that records one timed span into the current frame"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._depth += 1
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        profiler = self.profiler
+        profiler._depth -= 1
+        profiler._events.append((self.name, self.start, end - self.start, profiler._depth))
+        return False
+
+class FrameProfiler:
+    """Opt-in per-phase frame timer.
+
+    Wrap phases in `with profiler.section(name):`. The last `capacity`
+    frames are kept in a ring buffer and can be drawn as an on-screen
+    frame-time graph or written out in Chrome's trace event format
+    (load it in chrome://tracing or https://ui.perfetto.dev). While
+    disabled, section() returns a shared no-op context and begin/end_frame
+    return immediately.
+    """
+
+    def __init__(self, enabled: bool = False, capacity: int = config.PROFILER_FRAMES):
+        self.enabled = enabled
+        self.show_graph = False
+        self.frames = deque(maxlen=capacity)
+        self.origin = time.perf_counter_ns()
+        self._events: List[Tuple[str, int, int, int]] = []
+        self._frame_start = 0
+        self._depth = 0
+        # Startup is timed even while disabled; it only happens once
+        self.startup_span: Optional[Tuple[int, int]] = None
+
+    def section(self, name: str):
+        """Return a context manager that times the enclosed block"""
+        if not self.enabled:
+            return _DISABLED
+        return _Section(self, name)
+
+    def begin_frame(self):
+        """Start recording a new frame"""
+        if not self.enabled:
+            return
+        self._events = []
+        self._depth = 0
+        self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Finish the current frame and push it into the ring buffer"""
+        if not self.enabled:
+            return
+        end = time.perf_counter_ns()
+        self.frames.append((self._frame_start, end - self._frame_start, self._events))
+
+    def record_startup(self, start: int, end: Optional[int] = None):
+        """Record the time from start (perf_counter_ns) to the first finished frame"""
+        if end is None:
+            end = time.perf_counter_ns()
+        self.startup_span = (start, end)
+        self.origin = min(self.origin, start)
+
+    @property
+    def startup_ms(self) -> Optional[float]:
+        """Time to first frame in milliseconds, or None before the first frame"""
+        if self.startup_span is None:
+            return None
+        start, end = self.startup_span
+        return (end - start) / 1e6
+
+    def startup_report(self, budget: float = config.STARTUP_BUDGET_MS) -> str:
+        """Return a one-line summary of the time to first frame against its budget"""
+        millis = self.startup_ms
+        if millis is None:
+            return 'Startup: no frame finished yet'
+        verdict = 'within' if millis <= budget else 'OVER'
+        return f'Startup: first frame after {millis:.1f}ms ({verdict} the {budget:g}ms budget)'
+
+    def frame_times(self) -> List[float]:
+        """Return the buffered frame durations in milliseconds, oldest first"""
+        return [duration / 1e6 for _, duration, _ in self.frames]
+
+    def phase_averages(self) -> Dict[str, float]:
+        """Return the mean time per section name in milliseconds over the buffer"""
+        totals: Dict[str, float] = {}
+        for _, _, events in self.frames:
+            for name, _, duration, _ in events:
+                totals[name] = totals.get(name, 0) + duration / 1e6
+        count = max(1, len(self.frames))
+        return {name: total / count for name, total in totals.items()}
+
+    def to_chrome_trace(self) -> Dict:
+        """Return the buffered frames as a Chrome trace event document"""
+        events = []
+        if self.startup_span is not None:
+            start, end = self.startup_span
+            events.append({
+                'name': 'startup', 'cat': 'startup', 'ph': 'X', 'pid': 0, 'tid': 0,
+                'ts': (start - self.origin) / 1000, 'dur': (end - start) / 1000,
+                'args': {'budget_ms': config.STARTUP_BUDGET_MS}
+            })
+        for index, (start, duration, sections) in enumerate(self.frames):
+            events.append({
+                'name': 'frame', 'cat': 'frame', 'ph': 'X', 'pid': 0, 'tid': 0,
+                'ts': (start - self.origin) / 1000, 'dur': duration / 1000,
+                'args': {'index': index}
+            })
+            for name, section_start, section_duration, depth in sections:
+                events.append({
+                    'name': name, 'cat': 'phase', 'ph': 'X', 'pid': 0, 'tid': 0,
+                    'ts': (section_start - self.origin) / 1000, 'dur': section_duration / 1000,
+                    'args': {'depth': depth}
+                })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def dump_chrome_trace(self, path: str):
+        """Write the buffered frames to a Chrome trace JSON file"""
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def draw_graph(self, screen: pygame.Surface, rect: Optional[pygame.Rect] = None):
+        """Draw recent frame times as bars, with a line at the frame budget"""
+        if not self.enabled or not self.frames:
+            return
+        if rect is None:
+            rect = pygame.Rect(screen.get_width() - 310, 10, 300, 80)
+        pygame.draw.rect(screen, config.BLACK, rect)
+
+        scale = rect.height / config.PROFILER_GRAPH_MS
+        times = self.frame_times()[-rect.width:]
+        budget = 1000 / config.FPS
+        for x, millis in enumerate(times):
+            height = min(rect.height, int(millis * scale))
+            color = config.GREEN if millis <= budget else config.RED
+            pygame.draw.line(screen, color, (rect.left + x, rect.bottom),
+                             (rect.left + x, rect.bottom - height))
+
+        budget_y = rect.bottom - int(budget * scale)
+        pygame.draw.line(screen, config.YELLOW, (rect.left, budget_y), (rect.right, budget_y))
+        pygame.draw.rect(screen, config.WHITE, rect, 1)
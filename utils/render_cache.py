@@ -0,0 +1,121 @@
+import math
+from typing import Dict, List
+import pygame
+import config
+
+class HealthBarAtlas:
+    """Pre-rendered health bars quantized to a fixed number of levels.
+
+    Each bar width gets one atlas surface holding every level stacked
+    vertically; get() hands out subsurface views into it, so entities can
+    share bars and the draw loop can blit them in the same batch as sprites.
+    """
+
+    def __init__(self, levels: int = config.HEALTH_BAR_LEVELS, height: int = config.HEALTH_BAR_HEIGHT):
+        self.levels = levels
+        self.height = height
+        self.atlases: Dict[int, pygame.Surface] = {}
+        self.bars: Dict[int, List[pygame.Surface]] = {}
+
+    def level_for(self, health: float, max_health: float) -> int:
+        """Quantize health to a bar level, keeping any living entity above empty"""
+        if health <= 0 or max_health <= 0:
+            return 0
+        return max(1, min(self.levels, math.ceil(self.levels * health / max_health - 1e-9)))
+
+    def get(self, width: int, level: int) -> pygame.Surface:
+        """Return the bar surface for a width and level, building the atlas on first use"""
+        bars = self.bars.get(width)
+        if bars is None:
+            bars = self._build(width)
+        return bars[level]
+
+    def bar_for(self, width: int, health: float, max_health: float) -> pygame.Surface:
+        """Return the bar surface for an entity's current health"""
+        return self.get(width, self.level_for(health, max_health))
+
+    def _build(self, width: int) -> List[pygame.Surface]:
+        height = self.height
+        atlas = pygame.Surface((width, height * (self.levels + 1)))
+        bars = []
+        for level in range(self.levels + 1):
+            area = pygame.Rect(0, level * height, width, height)
+            pygame.draw.rect(atlas, config.RED, area)
+            filled = round(width * level / self.levels)
+            if filled:
+                pygame.draw.rect(atlas, config.GREEN, (0, area.y, filled, height))
+            bars.append(atlas.subsurface(area))
+        self.atlases[width] = atlas
+        self.bars[width] = bars
+        return bars
+
+class ShockwaveFrames:
+    """Lazily built animation frames for the expanding shockwave.
+
+    Radii are quantized to `step` pixels between min_radius and max_radius
+    and each frame is rendered once, sized to its own circle, the first time
+    any shockwave needs it.
+    """
+
+    def __init__(self, min_radius: int = 10, max_radius: int = 100,
+                 step: int = config.SHOCKWAVE_FRAME_STEP, color=(*config.BLUE, 128)):
+        self.min_radius = min_radius
+        self.max_radius = max_radius
+        self.step = step
+        self.color = color
+        self.frames: Dict[int, pygame.Surface] = {}
+
+    def quantize(self, radius: float) -> int:
+        """Snap a radius to the nearest cached frame radius"""
+        radius = min(max(radius, self.min_radius), self.max_radius)
+        return self.min_radius + int(round((radius - self.min_radius) / self.step)) * self.step
+
+    def get(self, radius: float) -> pygame.Surface:
+        """Return the frame for a radius, rendering it on first use"""
+        key = self.quantize(radius)
+        frame = self.frames.get(key)
+        if frame is None:
+            frame = pygame.Surface((key * 2, key * 2), pygame.SRCALPHA)
+            pygame.draw.circle(frame, self.color, (key, key), key)
+            self.frames[key] = frame
+        return frame
+
+class EntityImages:
+    """Flyweight registry of entity surfaces keyed by (radius, color, state).
+
+    All entities that look the same share one surface; a state change
+    (death, an NPC revealing itself as hostile) just swaps the reference.
+    Surfaces handed out here are shared and must not be drawn into.
+    """
+
+    ALIVE = 'alive'
+    DEAD = 'dead'
+    REVEALED_HOSTILE = 'revealed_hostile'
+
+    def __init__(self):
+        self.images: Dict[tuple, pygame.Surface] = {}
+
+    def get(self, radius: int, color, state: str = ALIVE) -> pygame.Surface:
+        """Return the shared surface for an entity look, rendering it on first use"""
+        key = (radius, tuple(color), state)
+        image = self.images.get(key)
+        if image is None:
+            image = self._render(radius, color, state)
+            self.images[key] = image
+        return image
+
+    def _render(self, radius: int, color, state: str) -> pygame.Surface:
+        image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        if state == self.REVEALED_HOSTILE:
+            color = config.YELLOW
+        pygame.draw.circle(image, color, (radius, radius), radius)
+        if state == self.DEAD:
+            # Draw X mark when dead
+            pygame.draw.line(image, (0, 0, 0), (5, 5), (radius * 2 - 5, radius * 2 - 5), 3)
+            pygame.draw.line(image, (0, 0, 0), (5, radius * 2 - 5), (radius * 2 - 5, 5), 3)
+        return image
+
+# Shared by every entity and shockwave
+health_bars = HealthBarAtlas()
+entity_images = EntityImages()
+shockwave_frames = ShockwaveFrames()
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+import pygame
+import config
+from utils.spatial import SpatialGrid
+
+class BackgroundLayer:
+    """Static geometry pre-composited into world-space tiles.
+
+    Sprites that never move (buildings) are added once. Each tile is
+    rendered the first time it becomes visible and then reused until a
+    static sprite touching it is added or removed. Tiles with no static
+    geometry are never allocated and are drawn with a plain fill. Only the
+    most recently used max_tiles surfaces are kept.
+    """
+
+    def __init__(self, tile_size: int = config.BACKGROUND_TILE_SIZE, color=config.BLACK,
+                 max_tiles: int = config.BACKGROUND_MAX_TILES):
+        self.tile_size = tile_size
+        self.color = color
+        self.max_tiles = max_tiles
+        self.statics = SpatialGrid(tile_size)
+        self.tiles: 'OrderedDict[Tuple[int, int], Optional[pygame.Surface]]' = OrderedDict()
+        self.tiles_built = 0
+
+    def add(self, sprite):
+        """Add a static sprite and invalidate the tiles it covers"""
+        self.statics.insert(sprite)
+        self._invalidate(sprite.rect)
+
+    def remove(self, sprite):
+        """Remove a static sprite and invalidate the tiles it covered"""
+        self.statics.remove(sprite)
+        self._invalidate(sprite.rect)
+
+    def clear(self):
+        """Drop every static sprite and tile"""
+        self.statics.clear()
+        self.tiles.clear()
+
+    def _tile_range(self, rect: pygame.Rect) -> Tuple[range, range]:
+        size = self.tile_size
+        return (range(rect.left // size, (rect.right - 1) // size + 1),
+                range(rect.top // size, (rect.bottom - 1) // size + 1))
+
+    def _invalidate(self, rect: pygame.Rect):
+        columns, rows = self._tile_range(rect)
+        for tx in columns:
+            for ty in rows:
+                self.tiles.pop((tx, ty), None)
+
+    def _tile(self, key: Tuple[int, int]) -> Optional[pygame.Surface]:
+        """Return the tile surface for a key (None if empty), building it if needed"""
+        if key in self.tiles:
+            self.tiles.move_to_end(key)
+            return self.tiles[key]
+
+        size = self.tile_size
+        area = pygame.Rect(key[0] * size, key[1] * size, size, size)
+        statics = [sprite for sprite in self.statics.query(area) if area.colliderect(sprite.rect)]
+        tile = None
+        if statics:
+            tile = pygame.Surface((size, size))
+            if pygame.display.get_surface() is not None:
+                tile = tile.convert()
+            tile.fill(self.color)
+            for sprite in statics:
+                tile.blit(sprite.image, (sprite.rect.x - area.x, sprite.rect.y - area.y))
+            self.tiles_built += 1
+
+        self.tiles[key] = tile
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def draw(self, screen: pygame.Surface, offset_x: int, offset_y: int,
+             area: Optional[pygame.Rect] = None):
+        """Draw the background for a screen-space area (default: the whole screen)"""
+        if area is None:
+            area = screen.get_rect()
+        world = area.move(offset_x, offset_y)
+        size = self.tile_size
+        batch = []
+        columns, rows = self._tile_range(world)
+        for tx in columns:
+            for ty in rows:
+                # Tile position on screen and the part of it inside the area
+                x = tx * size - offset_x
+                y = ty * size - offset_y
+                visible = area.clip((x, y, size, size))
+                tile = self._tile((tx, ty))
+                if tile is None:
+                    screen.fill(self.color, visible)
+                else:
+                    batch.append((tile, visible.topleft, visible.move(-x, -y)))
+        if batch:
+            # Area blits need blits(); fblits only takes (source, dest) pairs
+            screen.blits(batch, doreturn=False)
+
+class DirtyRectTracker:
+    """Tracks which screen regions changed between frames.
+
+    While the camera holds still only the regions that were drawn last
+    frame and this frame need restoring and pushing to the display. Any
+    camera move, or an explicit invalidate(), forces a full redraw.
+    """
+
+    def __init__(self):
+        self.last_offset = None
+        self.last_rects: Optional[List[pygame.Rect]] = None
+
+    def invalidate(self):
+        """Force the next frame to be a full redraw"""
+        self.last_rects = None
+
+    def regions_to_restore(self, offset: Tuple[int, int]) -> Optional[List[pygame.Rect]]:
+        """Return last frame's regions, or None if the whole screen must be redrawn"""
+        if self.last_rects is None or offset != self.last_offset:
+            return None
+        return self.last_rects
+
+    def finish_frame(self, offset: Tuple[int, int], rects: List[pygame.Rect],
+                     restored: Optional[List[pygame.Rect]]) -> Optional[List[pygame.Rect]]:
+        """Record this frame's regions and return the rects to push, or None for a full flip"""
+        self.last_offset = offset
+        self.last_rects = rects
+        if restored is None:
+            return None
+        return restored + rects
@@ -0,0 +1,87 @@
+from typing import Any, Dict, Iterable, List, Tuple
+import config
+from utils.spatial import SpatialHash
+
+class UpdateScheduler:
+    """Level-of-detail scheduler for per-sprite mob updates.
+
+    Mobs are bucketed by distance to the player using the entity index:
+
+    - active: within active_radius, updated every frame
+    - low: within low_radius, updated every low_interval frames in
+      staggered slices, with the time since their last update as dt
+    - idle: everything else, including the dead; not updated at all
+
+    The active bucket is re-queried every frame, so a mob that comes within
+    active_radius wakes up immediately. Mobs whose behavior depends on the
+    player wherever they are, such as followers and revealed chasers, are
+    passed to schedule() as pinned and are always active. The low bucket is re-queried once
+    per low_interval frames. A waking mob's accumulated dt is capped at
+    max_dt so it cannot jump. `counts` holds the size of each bucket after
+    the last schedule() call.
+    """
+
+    ACTIVE = 'active'
+    LOW = 'low'
+    IDLE = 'idle'
+
+    def __init__(self, index: SpatialHash, active_radius: float = config.LOD_ACTIVE_RADIUS,
+                 low_radius: float = config.LOD_LOW_RADIUS, low_interval: int = config.LOD_LOW_INTERVAL,
+                 max_dt: float = config.LOD_MAX_DT):
+        self.index = index
+        self.active_radius = active_radius
+        self.low_radius = max(low_radius, active_radius)
+        self.low_interval = max(1, low_interval)
+        self.max_dt = max_dt
+        self.frame = 0
+        self.time = 0.0
+        self.low: List[Any] = []
+        self.last_update: Dict[Any, float] = {}
+        self.counts = {self.ACTIVE: 0, self.LOW: 0, self.IDLE: 0}
+
+    def schedule(self, dt: float, x: float, y: float, pinned: Iterable[Any] = ()) -> List[Tuple[Any, float]]:
+        """Advance one frame and return the (entity, dt) pairs due this frame"""
+        self.time += dt
+        index = self.index
+        active = [entity for entity in index.query_radius(x, y, self.active_radius)
+                  if not entity.is_dead]
+        active_set = set(active)
+        for entity in pinned:
+            if entity not in active_set and not entity.is_dead:
+                active.append(entity)
+                active_set.add(entity)
+
+        phase = self.frame % self.low_interval
+        if phase == 0:
+            self.low = [entity for entity in index.query_radius(x, y, self.low_radius)
+                        if entity not in active_set and not entity.is_dead]
+            # Forget mobs that dropped out of both buckets
+            self.last_update = {entity: self.last_update[entity]
+                                for entity in active + self.low if entity in self.last_update}
+        self.frame += 1
+
+        due = []
+        for entity in active:
+            due.append((entity, self._elapsed(entity, dt)))
+        for entity in self.low[phase::self.low_interval]:
+            # Skip mobs that died or were removed from the world since the last re-query
+            if entity not in active_set and not entity.is_dead and entity in index.keys:
+                due.append((entity, self._elapsed(entity, dt * self.low_interval)))
+
+        self.counts[self.ACTIVE] = len(active)
+        self.counts[self.LOW] = len(self.low)
+        self.counts[self.IDLE] = max(0, len(index) - len(active) - len(self.low))
+        return due
+
+    def _elapsed(self, entity, default: float) -> float:
+        """Return the time since an entity was last updated, capped at max_dt"""
+        last = self.last_update.get(entity)
+        self.last_update[entity] = self.time
+        if last is None:
+            return min(default, self.max_dt)
+        return min(self.time - last, self.max_dt)
+
+    def clear(self):
+        """Forget every bucket assignment"""
+        self.low = []
+        self.last_update.clear()
@@ -0,0 +1,250 @@
+import os
+import random
+import multiprocessing
+from multiprocessing import shared_memory
+from queue import Empty
+from typing import Optional, Tuple
+import numpy as np
+import pygame
+import config
+from utils.entities import NPC, Zombie
+from utils.input_handler import ScriptedInputHandler
+from utils.profiler import FrameProfiler
+from utils.render_cache import EntityImages
+
+# Keys forwarded from the main process to the simulation
+SIMULATION_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_SPACE)
+
+# Record kinds
+KIND_PLAYER, KIND_ZOMBIE, KIND_NPC, KIND_SHOCKWAVE, KIND_BUILDING = range(5)
+
+# Header slots of each snapshot
+(SEQUENCE, COUNT, BUILDINGS, FRAME, OFFSET_X, OFFSET_Y, HEALTH, MAX_HEALTH,
+ SHOCKWAVE_COOLDOWN, FOLLOWERS, GENERATION, GAME_OVER) = range(12)
+HEADER_FIELDS = 16
+
+# Control slots shared by both snapshots
+PUBLISHED, PAUSED, STOP = range(3)
+CONTROL_FIELDS = 4
+
+# Image states by the index stored in entity records
+IMAGE_STATES = (EntityImages.ALIVE, EntityImages.DEAD, EntityImages.REVEALED_HOSTILE)
+
+# Record layout: kind, x, y, then per kind
+#   entities:   radius, health, max_health, image state, unused (x, y are the rect topleft)
+#   shockwaves: radius, unused... (x, y are the center)
+#   buildings:  width, height, door x, door y, unused
+RECORD_FIELDS = 8
+
+class SnapshotBuffer:
+    """Double-buffered entity snapshots in shared memory.
+
+    The simulation process writes each frame into the snapshot that is not
+    currently published, then publishes it. Every snapshot carries a
+    sequence number that is odd while it is being written, so a reader that
+    raced with the writer can tell and retry instead of drawing a torn
+    frame.
+    """
+
+    def __init__(self, capacity: int = config.WORKER_SNAPSHOT_CAPACITY, name: Optional[str] = None):
+        self.capacity = capacity
+        snapshot_size = HEADER_FIELDS + capacity * RECORD_FIELDS
+        size = (CONTROL_FIELDS + 2 * snapshot_size) * 8
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.name = self.shm.name
+
+        array = np.ndarray((CONTROL_FIELDS + 2 * snapshot_size,), dtype=np.float64, buffer=self.shm.buf)
+        if self.owner:
+            array[:] = 0
+        self.control = array[:CONTROL_FIELDS]
+        self.headers = []
+        self.records = []
+        for i in range(2):
+            start = CONTROL_FIELDS + i * snapshot_size
+            self.headers.append(array[start:start + HEADER_FIELDS])
+            self.records.append(array[start + HEADER_FIELDS:start + snapshot_size].reshape(capacity, RECORD_FIELDS))
+
+    def publish(self, header: np.ndarray, records: np.ndarray):
+        """Write a snapshot into the back buffer and make it the published one"""
+        index = 1 - int(self.control[PUBLISHED])
+        target = self.headers[index]
+        count = min(len(records), self.capacity)
+        target[SEQUENCE] += 1
+        target[1:] = header[1:]
+        target[COUNT] = count
+        self.records[index][:count] = records[:count]
+        target[SEQUENCE] += 1
+        self.control[PUBLISHED] = index
+
+    def read(self, attempts: int = 4) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Return a copy of the latest complete snapshot as (header, records), or None"""
+        for _ in range(attempts):
+            index = int(self.control[PUBLISHED])
+            source = self.headers[index]
+            sequence = source[SEQUENCE]
+            if sequence == 0 or sequence % 2:
+                continue
+            header = source.copy()
+            records = self.records[index][:int(header[COUNT])].copy()
+            if source[SEQUENCE] == sequence:
+                return header, records
+        return None
+
+    def close(self):
+        """Detach from the block, removing it if this process created it"""
+        self.control = self.headers = self.records = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def take_snapshot(state, frame: int, generation: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Flatten what the camera can see of a PlayState into a header and records"""
+    player = state.player
+    header = np.zeros(HEADER_FIELDS)
+    header[FRAME] = frame
+    header[OFFSET_X] = state.camera.offset_x
+    header[OFFSET_Y] = state.camera.offset_y
+    header[HEALTH] = player.health
+    header[MAX_HEALTH] = player.max_health
+    header[SHOCKWAVE_COOLDOWN] = player.shockwave_cooldown
+    header[FOLLOWERS] = len(player.followers)
+    header[GENERATION] = generation
+
+    records = []
+    # Buildings go first so the reader can tell them apart by count
+    for building in state.buildings:
+        rect = building.rect
+        records.append((KIND_BUILDING, rect.x, rect.y, rect.width, rect.height,
+                        building.door_pos[0], building.door_pos[1], 0))
+    header[BUILDINGS] = len(records)
+
+    viewport = state.camera.viewport()
+    for entity in [player] + state.visible_entities(viewport):
+        if isinstance(entity, NPC):
+            kind = KIND_NPC
+        elif isinstance(entity, Zombie):
+            kind = KIND_ZOMBIE
+        else:
+            kind = KIND_PLAYER
+        if entity.is_dead:
+            look = EntityImages.DEAD
+        elif kind == KIND_NPC and entity.revealed and entity.is_hostile:
+            look = EntityImages.REVEALED_HOSTILE
+        else:
+            look = EntityImages.ALIVE
+        records.append((kind, entity.rect.x, entity.rect.y, entity.radius, entity.health,
+                        entity.max_health, IMAGE_STATES.index(look), 0))
+    for shockwave in state.shockwaves:
+        if viewport.colliderect(shockwave.rect):
+            records.append((KIND_SHOCKWAVE, shockwave.center_x, shockwave.center_y,
+                            shockwave.radius, 0, 0, 0, 0))
+    return header, np.array(records, dtype=np.float64).reshape(-1, RECORD_FIELDS)
+
+class _WorkerHost:
+    """Minimal stand-in for Game that a PlayState can run inside the worker"""
+
+    def __init__(self):
+        self.held = ()
+        self.profiler = FrameProfiler()
+        self.input_handler = ScriptedInputHandler(lambda frame: self.held)
+        self.game_over = False
+
+    def change_state(self, state_name):
+        # The only transition PlayState makes on its own is to the menu when the player dies
+        if state_name == 'menu':
+            self.game_over = True
+
+def run_worker(name: str, capacity: int, commands, seed: Optional[int] = None):
+    """Simulation process entry point: step a PlayState and publish snapshots until stopped"""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    # Imported here: states.game_state itself imports this module
+    from states.game_state import PlayState
+
+    pygame.init()
+    if seed is not None:
+        random.seed(seed)
+    buffer = SnapshotBuffer(capacity, name)
+    host = _WorkerHost()
+    state = PlayState(host, seed)
+    state.camera.follow(state.player)
+    clock = pygame.time.Clock()
+    frame = 0
+    generation = 0
+    layout = None
+
+    while not buffer.control[STOP]:
+        dt = clock.tick(config.FPS) / 1000.0
+
+        # Only the most recent key state matters
+        try:
+            while True:
+                host.held = commands.get_nowait()
+        except Empty:
+            pass
+
+        if frame and (buffer.control[PAUSED] or host.game_over):
+            continue
+        if frame:
+            host.input_handler.update()
+            state.update(dt)
+
+        # Streaming changes the building set only when the player changes chunk
+        world = state.world
+        current = (world.center if world is not None else None, len(state.buildings))
+        if current != layout:
+            layout = current
+            generation += 1
+
+        header, records = take_snapshot(state, frame, generation)
+        header[GAME_OVER] = host.game_over
+        buffer.publish(header, records)
+        frame += 1
+
+    buffer.close()
+    pygame.quit()
+
+class SimulationClient:
+    """Main-process handle on a simulation worker.
+
+    Starts run_worker in a separate process (spawned, so the worker gets
+    its own pygame), forwards held keys over a queue and reads the latest
+    snapshot from shared memory. The worker starts paused.
+    """
+
+    def __init__(self, seed: Optional[int] = None, capacity: int = config.WORKER_SNAPSHOT_CAPACITY):
+        self.buffer = SnapshotBuffer(capacity)
+        self.buffer.control[PAUSED] = 1
+        context = multiprocessing.get_context('spawn')
+        self.commands = context.Queue()
+        self.process = context.Process(target=run_worker, daemon=True,
+                                       args=(self.buffer.name, capacity, self.commands, seed))
+        self.process.start()
+        self.held = None
+
+    def send_keys(self, held: Tuple[int, ...]):
+        """Forward the held keys, if they changed since the last call"""
+        if held != self.held:
+            self.held = held
+            self.commands.put(held)
+
+    def set_paused(self, paused: bool):
+        """Pause or resume the simulation"""
+        self.buffer.control[PAUSED] = paused
+
+    def latest(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Return the latest published snapshot, or None if there is none yet"""
+        return self.buffer.read()
+
+    def close(self, timeout: float = 2.0):
+        """Stop the worker and free the shared memory"""
+        if self.buffer.control is None:
+            return
+        self.buffer.control[STOP] = 1
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.commands.close()
+        self.buffer.close()
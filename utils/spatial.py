@@ -0,0 +1,190 @@
+import pygame
+from typing import Dict, List, Tuple, Any, Optional
+
+class SpatialGrid:
+    """Uniform grid that buckets rects by the cells they overlap.
+
+    Intended for static geometry such as buildings: fill it once, then
+    query it with a rect to get only the items whose cells it touches.
+    """
+
+    def __init__(self, cell_size: int = 128):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[Any]] = {}
+        self.count = 0
+
+    def _cell_range(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        """Return the inclusive cell bounds covered by a rect"""
+        size = self.cell_size
+        # right/bottom are included so corner points on the far edge are covered
+        return (int(rect.left // size), int(rect.top // size),
+                int(rect.right // size), int(rect.bottom // size))
+
+    def insert(self, item: Any, rect: pygame.Rect = None):
+        """Add an item to every cell its rect overlaps"""
+        if rect is None:
+            rect = item.rect
+        x0, y0, x1, y1 = self._cell_range(rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(item)
+        self.count += 1
+
+    def remove(self, item: Any, rect: pygame.Rect = None):
+        """Remove an item from every cell its rect overlaps"""
+        if rect is None:
+            rect = item.rect
+        x0, y0, x1, y1 = self._cell_range(rect)
+        removed = False
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell and item in cell:
+                    cell.remove(item)
+                    removed = True
+                    if not cell:
+                        del self.cells[(cx, cy)]
+        if removed:
+            self.count -= 1
+
+    def query(self, rect: pygame.Rect) -> List[Any]:
+        """Return the unique items stored in the cells a rect overlaps"""
+        x0, y0, x1, y1 = self._cell_range(rect)
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            return list(cells.get((x0, y0), ()))
+
+        found = []
+        seen = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for item in cells.get((cx, cy), ()):
+                    if item not in seen:
+                        seen.add(item)
+                        found.append(item)
+        return found
+
+    def clear(self):
+        """Remove all items from the grid"""
+        self.cells.clear()
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+class SpatialHash:
+    """Grid of point-like items for radius, rect and nearest-neighbor queries.
+
+    Items can be bulk rebuilt every frame or kept up to date incrementally
+    with move(), which only touches the grid when an item changes cell.
+    Positions are snapshotted at insert/move time and all distance checks
+    use squared distances.
+    """
+
+    def __init__(self, cell_size: int = 100):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], Dict[Any, Tuple[float, float]]] = {}
+        self.keys: Dict[Any, Tuple[int, int]] = {}
+
+    def _key(self, x: float, y: float) -> Tuple[int, int]:
+        size = self.cell_size
+        return (int(x // size), int(y // size))
+
+    def insert(self, item: Any, x: float = None, y: float = None):
+        """Add an item at a point, defaulting to the center of its rect"""
+        if x is None:
+            x, y = item.rect.center
+        key = self._key(x, y)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = {}
+        cell[item] = (x, y)
+        self.keys[item] = key
+
+    def remove(self, item: Any):
+        """Remove an item if it is in the hash"""
+        key = self.keys.pop(item, None)
+        if key is None:
+            return
+        cell = self.cells[key]
+        del cell[item]
+        if not cell:
+            del self.cells[key]
+
+    def move(self, item: Any, x: float = None, y: float = None):
+        """Update an item's position, re-bucketing it only if it changed cell"""
+        if x is None:
+            x, y = item.rect.center
+        key = self._key(x, y)
+        old_key = self.keys.get(item)
+        if old_key == key:
+            self.cells[key][item] = (x, y)
+        else:
+            self.remove(item)
+            self.insert(item, x, y)
+
+    def rebuild(self, items):
+        """Clear the hash and insert every item at its rect center"""
+        self.clear()
+        for item in items:
+            self.insert(item)
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[Any]:
+        """Return all items within radius of a point"""
+        found = []
+        radius_sq = radius * radius
+        for cell in self._cells_in(x - radius, y - radius, x + radius, y + radius):
+            for item, (ix, iy) in cell.items():
+                dx = ix - x
+                dy = iy - y
+                if dx * dx + dy * dy <= radius_sq:
+                    found.append(item)
+        return found
+
+    def query_rect(self, rect: pygame.Rect, margin: float = 0) -> List[Any]:
+        """Return all items whose point lies inside rect grown by margin on every side"""
+        left = rect.left - margin
+        top = rect.top - margin
+        right = rect.right + margin
+        bottom = rect.bottom + margin
+        found = []
+        for cell in self._cells_in(left, top, right, bottom):
+            for item, (ix, iy) in cell.items():
+                if left <= ix <= right and top <= iy <= bottom:
+                    found.append(item)
+        return found
+
+    def nearest(self, x: float, y: float, max_distance: float, exclude: Any = None) -> Optional[Any]:
+        """Return the closest item within max_distance of a point, or None"""
+        best = None
+        best_sq = max_distance * max_distance
+        for cell in self._cells_in(x - max_distance, y - max_distance,
+                                   x + max_distance, y + max_distance):
+            for item, (ix, iy) in cell.items():
+                if item is exclude:
+                    continue
+                dx = ix - x
+                dy = iy - y
+                distance_sq = dx * dx + dy * dy
+                if distance_sq <= best_sq:
+                    best = item
+                    best_sq = distance_sq
+        return best
+
+    def _cells_in(self, left: float, top: float, right: float, bottom: float):
+        """Yield the non-empty cells overlapping a world-space box"""
+        size = self.cell_size
+        cells = self.cells
+        for cx in range(int(left // size), int(right // size) + 1):
+            for cy in range(int(top // size), int(bottom // size) + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    yield cell
+
+    def clear(self):
+        """Remove all items from the hash"""
+        self.cells.clear()
+        self.keys.clear()
+
+    def __len__(self) -> int:
+        return len(self.keys)
@@ -1,10 +1,62 @@
+import os
 import pygame
-from typing import Union, Tuple
+from typing import List, NamedTuple, Optional, Union, Tuple
+
+_shared_assets = None
+
+def set_shared_assets(assets):
+    """Make an AssetLoader (the Game's) the one that path-only loads go through"""
+    global _shared_assets
+    _shared_assets = assets
+
+def release_shared_assets(assets):
+    """Stop sharing an AssetLoader that is being closed, if it is the shared one"""
+    global _shared_assets
+    if _shared_assets is assets:
+        _shared_assets = None
+
+def shared_assets():
+    """Return the shared AssetLoader, creating one without an archive if no Game has set it"""
+    global _shared_assets
+    if _shared_assets is None:
+        # Imported here: asset_loader imports this module
+        from utils.asset_loader import AssetLoader
+        _shared_assets = AssetLoader(archive=None)
+    return _shared_assets
+
+def _image_name(path: str, assets) -> Optional[str]:
+    """Return a file path's name under the loader's images folder, or None if it lies outside it"""
+    images = os.path.join(assets.base_path, 'images')
+    name = os.path.relpath(os.path.abspath(path), images)
+    if name.startswith(os.pardir) or os.path.isabs(name):
+        return None
+    return name.replace(os.sep, '/')
 
 class GameSprite(pygame.sprite.Sprite):
-    def __init__(self, image: Union[pygame.Surface, str], pos: Tuple[float, float], *groups):
+    """Sprite with a position and velocity.
+
+    A string image is a file path. Files under assets/images are loaded,
+    converted and cached once by the shared AssetLoader (the Game's), so
+    every sprite of a kind shares one surface; other files are loaded as
+    they are. With an explicit AssetLoader, the string is instead a
+    filename under that loader's images folder.
+    """
+    
+    def __init__(self, image: Union[pygame.Surface, str], pos: Tuple[float, float], *groups, assets=None):
         super().__init__(*groups)
-        self.image = image if isinstance(image, pygame.Surface) else pygame.image.load(image)
+        if not isinstance(image, pygame.Surface):
+            name = image
+            if assets is None:
+                assets = shared_assets()
+                name = _image_name(image, assets)
+            if name is None:
+                image = pygame.image.load(image)
+            else:
+                loaded = assets.load_image(name, name)
+                if loaded is None:
+                    raise FileNotFoundError(f'No image {name!r} in {assets.base_path}')
+                image = loaded
+        self.image = image
         self.rect = self.image.get_rect(center=pos)
         self.pos = pygame.math.Vector2(pos)
         self.velocity = pygame.math.Vector2(0, 0)
@@ -18,20 +70,56 @@ class GameSprite(pygame.sprite.Sprite):
         """Check collision with another sprite"""
         return self.rect.colliderect(other.rect)
 
-def load_spritesheet(filename: str, sprite_size: Tuple[int, int], colorkey=None) -> list:
-    """Load a spritesheet and split it into surfaces"""
-    sheet = pygame.image.load(filename)
-    sprites = []
-    
-    sheet_width = sheet.get_width()
-    sheet_height = sheet.get_height()
-    
-    for y in range(0, sheet_height, sprite_size[1]):
-        for x in range(0, sheet_width, sprite_size[0]):
-            sprite = pygame.Surface(sprite_size)
-            sprite.blit(sheet, (0, 0), (x, y, sprite_size[0], sprite_size[1]))
+class Spritesheet(NamedTuple):
+    """Frames sliced out of one sheet surface"""
+    frames: List[pygame.Surface]  # Subsurface views that share the sheet's pixels
+    rects: List[pygame.Rect]  # Each frame's area within its cell; smaller than the cell when trimmed
+
+def slice_spritesheet(sheet: pygame.Surface, sprite_size: Tuple[int, int], colorkey=None,
+                      trim: bool = False) -> Spritesheet:
+    """Cut a sheet into frames without copying any pixels.
+
+    With trim, each frame is cut down to the bounding box of its visible
+    pixels, and its rect records where that box sits inside the cell so
+    the frame can still be drawn at the cell's position.
+    """
+    width, height = sprite_size
+    frames = []
+    rects = []
+    for y in range(0, sheet.get_height() - height + 1, height):
+        for x in range(0, sheet.get_width() - width + 1, width):
+            frame = sheet.subsurface((x, y, width, height))
             if colorkey is not None:
-                sprite.set_colorkey(colorkey)
-            sprites.append(sprite)
-    
-    return sprites
+                frame.set_colorkey(colorkey)
+            rect = frame.get_bounding_rect() if trim else frame.get_rect()
+            if trim:
+                frame = frame.subsurface(rect)
+                if colorkey is not None:
+                    frame.set_colorkey(colorkey)
+            frames.append(frame)
+            rects.append(rect)
+    return Spritesheet(frames, rects)
+
+def load_spritesheet(filename: str, sprite_size: Tuple[int, int], colorkey=None, assets=None) -> list:
+    """Load a spritesheet and split it into subsurface frames.
+
+    filename is a file path, resolved like GameSprite's image: sheets under
+    assets/images are loaded once and their frames cached by the shared
+    AssetLoader, or by the given one, where filename is a name under its
+    images folder.
+    """
+    name = filename
+    if assets is None:
+        assets = shared_assets()
+        name = _image_name(filename, assets)
+    if name is None:
+        return slice_spritesheet(pygame.image.load(filename), sprite_size, colorkey).frames
+    sheet = assets.load_spritesheet(name, name, sprite_size, colorkey)
+    return sheet.frames if sheet is not None else []
+
+def blit_batch(surface: pygame.Surface, batch: list):
+    """Blit a list of (source, dest) pairs in one call, using fblits when pygame provides it"""
+    if hasattr(surface, 'fblits'):
+        surface.fblits(batch)
+    else:
+        surface.blits(batch, doreturn=False)
@@ -0,0 +1,95 @@
+from typing import Optional
+import numpy as np
+import config
+
+# Neighbor cell offsets, own cell first
+CELL_OFFSETS = [(0, 0)] + [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+def _cell_keys(cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+    """Pack cell coordinates into one sortable int64 key"""
+    return (cx << 32) + cy
+
+def separation(positions: np.ndarray, radius: float = config.SEPARATION_RADIUS,
+               max_neighbors: int = config.SEPARATION_MAX_NEIGHBORS,
+               candidates: Optional[np.ndarray] = None) -> np.ndarray:
+    """Return a separation steering vector for each of an (N, 2) array of positions.
+
+    Positions are bucketed into a cell list with cells of `radius`, sorted
+    by cell, so every agent's neighbors sit in contiguous runs of the
+    sorted array that searchsorted finds for all agents at once. Each agent
+    then looks at no more than max_neighbors candidates, its own cell
+    first, so the cost stays linear in N even when a horde piles onto one
+    spot. Each neighbor closer than radius pushes the agent directly away
+    with weight (1 - distance / radius); coincident agents are split apart
+    along a direction derived from their indices. Vectors are clipped to
+    length 1. If given, `candidates` restricts which rows are steered;
+    every row still pushes.
+    """
+    count = len(positions)
+    steering = np.zeros((count, 2), dtype=np.float64)
+    if count < 2 or max_neighbors <= 0:
+        return steering
+    cells = np.floor(positions / radius).astype(np.int64)
+    keys = _cell_keys(cells[:, 0], cells[:, 1])
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    if candidates is None:
+        agents = order
+    else:
+        agents = np.asarray(candidates, dtype=np.int64)
+        agents = agents[np.argsort(keys[agents], kind='stable')]
+    if len(agents) == 0:
+        return steering
+
+    # Where each agent's neighbors sit in the sorted array, per neighbor cell.
+    # Agents are in cell order, so the lookups are sorted too.
+    agent_cells = cells[agents]
+    starts = np.empty((len(agents), len(CELL_OFFSETS)), dtype=np.int64)
+    runs = np.empty_like(starts)
+    for column, (dx, dy) in enumerate(CELL_OFFSETS):
+        neighbor_keys = _cell_keys(agent_cells[:, 0] + dx, agent_cells[:, 1] + dy)
+        starts[:, column] = np.searchsorted(sorted_keys, neighbor_keys, side='left')
+        runs[:, column] = np.searchsorted(sorted_keys, neighbor_keys, side='right') - starts[:, column]
+
+    # Cap the candidates per agent, taking cells in order until the cap is reached
+    before = np.cumsum(runs, axis=1) - runs
+    takes = np.minimum(runs, np.maximum(max_neighbors - before, 0)).ravel()
+    total = int(takes.sum())
+    if total == 0:
+        return steering
+
+    # Expand every (agent, candidate) pair in one go
+    group = np.repeat(np.arange(len(takes)), takes)
+    slot = np.arange(total) - np.repeat(np.cumsum(takes) - takes, takes)
+    rows = group // len(CELL_OFFSETS)
+    run = runs.ravel()[group]
+    # Each agent starts at its own point in a run, so agents in a packed cell
+    # sample different neighbors instead of all seeing the same few
+    others = order[starts.ravel()[group] + (agents[rows] % run + slot) % run]
+    keep = others != agents[rows]
+    rows = rows[keep]
+    others = others[keep]
+
+    away = positions[agents[rows]] - positions[others]
+    distance = np.hypot(away[:, 0], away[:, 1])
+    close = distance < radius
+    rows, others, away, distance = rows[close], others[close], away[close], distance[close]
+
+    # Split exact overlaps along a direction picked from the pair's indices,
+    # pointing opposite ways for the two agents of a pair
+    stacked = np.nonzero(distance == 0)[0]
+    if len(stacked):
+        mine = agents[rows[stacked]]
+        low = np.minimum(mine, others[stacked])
+        high = np.maximum(mine, others[stacked])
+        angle = ((low * 0.6180339887 + high * 0.4142135624) % 1) * 2 * np.pi
+        sign = np.where(mine > others[stacked], 1.0, -1.0)
+        away[stacked] = np.column_stack((np.cos(angle), np.sin(angle))) * sign[:, np.newaxis]
+        distance[stacked] = 1.0
+
+    weight = (1 - distance / radius) / distance
+    push = np.column_stack((np.bincount(rows, away[:, 0] * weight, len(agents)),
+                            np.bincount(rows, away[:, 1] * weight, len(agents))))
+    length = np.hypot(push[:, 0], push[:, 1])
+    steering[agents] = push / np.maximum(length, 1)[:, np.newaxis]
+    return steering
@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+import pygame
+import config
+
+class TextCache:
+    """LRU cache of rendered text surfaces.
+
+    Entries are keyed by (font file, size, text, color, antialias), so a
+    string is only rendered again when one of those changes. The cache
+    evicts least recently used surfaces once their pixel memory exceeds
+    max_bytes. Fonts come from the AssetLoader, which creates each one once.
+    """
+
+    def __init__(self, assets, max_bytes: int = config.TEXT_CACHE_BYTES):
+        self.assets = assets
+        self.max_bytes = max_bytes
+        self.entries: 'OrderedDict[tuple, pygame.Surface]' = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: Optional[str], size: int, text: str,
+               color: Tuple[int, int, int], antialias: bool = True) -> pygame.Surface:
+        """Return the rendered surface for text, rendering it only on a cache miss"""
+        key = (font, size, text, color, antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.assets.get_font(font, size).render(text, antialias, color)
+        self.entries[key] = surface
+        self.bytes += self._size_of(surface)
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= self._size_of(evicted)
+        return surface
+
+    @staticmethod
+    def _size_of(surface: pygame.Surface) -> int:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def clear(self):
+        """Drop every cached surface"""
+        self.entries.clear()
+        self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
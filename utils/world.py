@@ -0,0 +1,182 @@
+import math
+import random
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import pygame
+import config
+from utils.entities import Building, Zombie, NPC
+from utils.placement import place_buildings
+
+# Frozen entity record: (kind, x, y, health, is_hostile, revealed)
+FrozenEntity = Tuple[str, int, int, float, bool, bool]
+
+class ChunkedWorld:
+    """Infinite world split into square chunks that stream in around the player.
+
+    Every chunk's buildings and starting mobs are generated from the world
+    seed and the chunk coordinates, so the same seed always produces the
+    same world. Chunks within load_radius of the player's chunk are live
+    sprites in the PlayState; chunks beyond unload_radius are unloaded.
+    Their buildings are simply dropped (they are regenerated on demand) and
+    their living mobs are frozen into plain tuples; a chunk whose mobs were
+    all killed is remembered with no records, so it does not restock. Mobs
+    that wander into a chunk that has never been loaded are kept as strays
+    and join that chunk's generated mobs when it first loads. Only the most
+    recently frozen frozen_limit chunks (and as many stray chunks) are
+    remembered, after which a chunk comes back freshly generated, so memory
+    stays bounded however far the player travels.
+    """
+
+    def __init__(self, state, seed: Optional[int] = None, chunk_size: int = config.CHUNK_SIZE,
+                 load_radius: int = config.CHUNK_LOAD_RADIUS,
+                 unload_radius: int = config.CHUNK_UNLOAD_RADIUS,
+                 frozen_limit: int = config.FROZEN_CHUNK_LIMIT):
+        self.state = state
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.chunk_size = chunk_size
+        self.load_radius = load_radius
+        self.unload_radius = max(unload_radius, load_radius)
+        self.frozen_limit = frozen_limit
+        self.spawn = (config.WINDOW_WIDTH // 2, config.WINDOW_HEIGHT // 2)
+        self.loaded: Dict[Tuple[int, int], List[Building]] = {}
+        self.frozen: 'OrderedDict[Tuple[int, int], List[FrozenEntity]]' = OrderedDict()
+        self.strays: 'OrderedDict[Tuple[int, int], List[FrozenEntity]]' = OrderedDict()
+        self.center: Optional[Tuple[int, int]] = None
+
+    def chunk_key(self, x: float, y: float) -> Tuple[int, int]:
+        """Return the chunk containing a world position"""
+        size = self.chunk_size
+        return (int(x // size), int(y // size))
+
+    def chunk_rect(self, key: Tuple[int, int]) -> pygame.Rect:
+        """Return a chunk's area in world coordinates"""
+        size = self.chunk_size
+        return pygame.Rect(key[0] * size, key[1] * size, size, size)
+
+    def rng(self, key: Tuple[int, int], stream: str = '') -> random.Random:
+        """Return the generator for a chunk, seeded only by the world seed, the chunk and the stream"""
+        return random.Random(f"{self.seed}:{key[0]}:{key[1]}{stream}")
+
+    def _spawn_distance(self, x: float, y: float) -> float:
+        return math.hypot(x - self.spawn[0], y - self.spawn[1])
+
+    def generate(self, key: Tuple[int, int]) -> Tuple[List[pygame.Rect], List[FrozenEntity]]:
+        """Return a chunk's building rects and starting mobs"""
+        rng = self.rng(key)
+        area = self.chunk_rect(key)
+        padding = 50  # Space between buildings and from the chunk edge
+
+        # Keep buildings away from the player spawn and from each other
+        buildings = place_buildings(rng, area, config.NUM_BUILDINGS, padding=padding,
+                                    keep_out=(self.spawn, 200))
+
+        entities: List[FrozenEntity] = []
+        mobs = ['zombie'] * config.ZOMBIES_PER_CHUNK + ['npc'] * config.NPCS_PER_CHUNK
+        for kind in mobs:
+            for _ in range(50):
+                x = rng.randint(area.left, area.right - 1)
+                y = rng.randint(area.top, area.bottom - 1)
+                spot = pygame.Rect(x - 25, y - 25, 50, 50)
+                if self._spawn_distance(x, y) >= 300 and spot.collidelist(buildings) == -1:
+                    hostile = kind == 'zombie' or rng.random() < config.HOSTILE_NPC_CHANCE
+                    entities.append((kind, x, y, None, hostile, False))
+                    break
+        return buildings, entities
+
+    def update(self, player):
+        """Stream chunks if the player has moved into a different chunk"""
+        key = self.chunk_key(*player.rect.center)
+        if key != self.center:
+            self.center = key
+            self.stream()
+
+    def stream(self):
+        """Load chunks near the center chunk and unload distant ones"""
+        cx, cy = self.center
+        for key in list(self.loaded):
+            if max(abs(key[0] - cx), abs(key[1] - cy)) > self.unload_radius:
+                self.unload(key)
+
+        radius = self.load_radius
+        for x in range(cx - radius, cx + radius + 1):
+            for y in range(cy - radius, cy + radius + 1):
+                if (x, y) not in self.loaded:
+                    self.load((x, y))
+
+        self.freeze_strays()
+
+    def load(self, key: Tuple[int, int]):
+        """Create a chunk's sprites from its frozen mobs, or from the seed plus any strays"""
+        state = self.state
+        rects, generated = self.generate(key)
+        # Doors get their own stream so they come out the same on every load
+        doors = self.rng(key, ':doors')
+        buildings = [Building(rect.x, rect.y, rect.width, rect.height, doors) for rect in rects]
+        for building in buildings:
+            state.add_building(building)
+        self.loaded[key] = buildings
+
+        records = self.frozen.pop(key, None)
+        if records is None:
+            records = generated
+        for record in records + self.strays.pop(key, []):
+            state.add_entity(self.thaw(record))
+
+    def unload(self, key: Tuple[int, int]):
+        """Drop a chunk's buildings and freeze the mobs standing in it"""
+        state = self.state
+        for building in self.loaded.pop(key):
+            state.remove_building(building)
+
+        # Remembered even with no survivors, so the chunk does not restock
+        self.frozen[key] = []
+        self._remember(self.frozen, key)
+
+        for entity in list(state.entity_index.keys):
+            if self.chunk_key(*entity.rect.center) == key:
+                self._freeze(key, entity)
+
+    def freeze_strays(self):
+        """Freeze mobs that have wandered (or been knocked) out of the loaded chunks"""
+        for entity in list(self.state.entity_index.keys):
+            key = self.chunk_key(*entity.rect.center)
+            if key not in self.loaded:
+                self._freeze(key, entity)
+
+    def _freeze(self, key: Tuple[int, int], entity):
+        """Remove a mob from the PlayState, keeping it as a record if it is alive"""
+        if entity in self.state.player.followers:
+            return
+        if not entity.is_dead:
+            # Chunks that have never been loaded still have their own mobs to generate
+            store = self.frozen if key in self.frozen else self.strays
+            store.setdefault(key, []).append(self.freeze(entity))
+            self._remember(store, key)
+        self.state.remove_entity(entity)
+
+    def _remember(self, store: 'OrderedDict', key: Tuple[int, int]):
+        """Mark a chunk's records as the most recent, forgetting the oldest beyond frozen_limit"""
+        store.move_to_end(key)
+        while len(store) > self.frozen_limit:
+            store.popitem(last=False)
+
+    @staticmethod
+    def freeze(entity) -> FrozenEntity:
+        """Return the compact record for a mob"""
+        kind = 'npc' if isinstance(entity, NPC) else 'zombie'
+        x, y = entity.rect.center
+        return (kind, x, y, entity.health, entity.is_hostile, getattr(entity, 'revealed', False))
+
+    def thaw(self, record: FrozenEntity):
+        """Create a mob sprite from its record"""
+        kind, x, y, health, hostile, revealed = record
+        if kind == 'zombie':
+            entity = Zombie(x, y)
+        else:
+            entity = NPC(x, y, hostile)
+        if health is not None:
+            entity.health = health
+            entity.refresh_health_bar()
+        if revealed:
+            entity.reveal(self.state.player)
+        return entity